@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark del decodificador: ``parse_payload`` original (str + dict +
+print) contra ``FrameDecoder.decode`` (checksum + tabla + NamedTuple).
+
+Uso:
+    python bench/bench_decoder.py [--frames N]
+"""
+
+import argparse
+import contextlib
+import functools
+import os
+import sys
+import time
+from pathlib import Path
+
+# Agregar el directorio src al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from protocol.decoder import FrameDecoder
+from protocol.framing import FRAME_LENGTH, PAYLOAD_LENGTH
+from simulator.simulator import read_log_file
+
+DEFAULT_LOG = Path(__file__).parent.parent / "data" / "conteo_real_desbordamiento.txt"
+
+
+def legacy_parse_payload(payload, emit=print):
+    """
+    Réplica de ``main.parse_payload`` antes del decodificador.
+    """
+    payload_str = payload.decode("ascii")
+    emit(payload_str)
+
+    return {
+        "monto": int(payload_str[7:20]),
+        "piezas": int(payload_str[23:27]),
+        "status": True if payload_str[2] != "0" else False,
+        "rechazo_sensor": True if payload_str[5] == "1" else False,
+    }
+
+
+def time_per_frame(func, items):
+    start = time.perf_counter()
+    for item in items:
+        func(item)
+    return (time.perf_counter() - start) / len(items)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--frames", type=int, default=200_000)
+    args = parser.parse_args()
+
+    packets = [p for p in read_log_file(DEFAULT_LOG) if len(p) == FRAME_LENGTH]
+    frames = [packets[i % len(packets)] for i in range(args.frames)]
+    payloads = [f[1 : 1 + PAYLOAD_LENGTH] for f in frames]
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        legacy_print = time_per_frame(legacy_parse_payload, payloads)
+
+    # Sin el print, para aislar el costo de str + slicing + dict
+    legacy_no_print = time_per_frame(
+        functools.partial(legacy_parse_payload, emit=len), payloads
+    )
+
+    decoder = FrameDecoder()
+    decoded = time_per_frame(decoder.decode, frames)
+    decoded_no_checksum = time_per_frame(
+        FrameDecoder(verify_checksum=False).decode, frames
+    )
+
+    print(f"📊 {args.frames} paquetes\n")
+    print(f"parse_payload (con print a /dev/null) {legacy_print * 1e9:8.0f} ns/paquete")
+    print(f"parse_payload (sin print)             {legacy_no_print * 1e9:8.0f} ns/paquete")
+    print(f"FrameDecoder.decode (con checksum)    {decoded * 1e9:8.0f} ns/paquete")
+    print(f"FrameDecoder.decode (sin checksum)    {decoded_no_checksum * 1e9:8.0f} ns/paquete")
+    print(
+        f"\n✅ Decodificados: {decoder.decoded}  "
+        f"Checksum inválido: {decoder.checksum_errors}  Malformados: {decoder.malformed}"
+    )
+
+
+if __name__ == "__main__":
+    main()
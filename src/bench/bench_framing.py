@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark del framing: máquina de estados byte a byte (``ser.read(1)``)
+contra ``FrameScanner`` con lecturas en bloque.
+
+Uso:
+    python bench/bench_framing.py [--frames N] [--chunk BYTES] [--noise RATIO]
+"""
+
+import argparse
+import io
+import random
+import sys
+import time
+from pathlib import Path
+
+# Agregar el directorio src al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from protocol.framing import ETX, PAYLOAD_LENGTH, STX, FrameScanner
+from simulator.simulator import read_log_file
+
+DEFAULT_LOG = Path(__file__).parent.parent / "data" / "conteo_real_desbordamiento.txt"
+
+
+def build_stream(frames, noise_ratio, seed=0):
+    """
+    Construye un flujo de bytes con ``frames`` paquetes tomados de un log real,
+    intercalando ruido (bytes aleatorios sin STX) con probabilidad ``noise_ratio``.
+    """
+    rng = random.Random(seed)
+    packets = read_log_file(DEFAULT_LOG)
+    noise_alphabet = bytes(b for b in range(256) if b != STX[0])
+    out = bytearray()
+    for i in range(frames):
+        out += packets[i % len(packets)]
+        if rng.random() < noise_ratio:
+            out += bytes(rng.choice(noise_alphabet) for _ in range(rng.randint(1, 8)))
+    return bytes(out)
+
+
+def legacy_loop(stream):
+    """
+    Réplica del bucle original de ``serial_reader``: un ``read(1)`` por byte
+    y una máquina de estados con claves ``str``.
+    """
+    state = "WAITING_FOR_STX"
+    payload_buffer = bytearray()
+    frames = 0
+    while True:
+        byte = stream.read(1)
+        if not byte:
+            break
+        if state == "WAITING_FOR_STX":
+            if byte == STX:
+                payload_buffer.clear()
+                state = "READING_PAYLOAD"
+        elif state == "READING_PAYLOAD":
+            if byte == ETX:
+                if len(payload_buffer) == PAYLOAD_LENGTH:
+                    frames += 1
+                state = "WAITING_FOR_STX"
+            else:
+                payload_buffer.append(ord(byte))
+    return frames
+
+
+def scanner_loop(stream, chunk_size):
+    """
+    Lectura en bloques de ``chunk_size`` bytes a través de ``FrameScanner``.
+    """
+    scanner = FrameScanner()
+    frames = 0
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        frames += len(scanner.feed(chunk))
+    return frames
+
+
+def run(name, func, data, *args):
+    start = time.perf_counter()
+    frames = func(io.BytesIO(data), *args)
+    elapsed = time.perf_counter() - start
+    print(
+        f"{name:<22} {elapsed * 1000:9.1f} ms  "
+        f"{len(data) / elapsed / 1e6:8.2f} MB/s  "
+        f"{frames / elapsed:12,.0f} frames/s  ({frames} paquetes)"
+    )
+    return elapsed, frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--frames", type=int, default=100_000)
+    parser.add_argument("--chunk", type=int, default=4096)
+    parser.add_argument("--noise", type=float, default=0.05)
+    args = parser.parse_args()
+
+    data = build_stream(args.frames, args.noise)
+    print(f"📊 Flujo: {args.frames} paquetes, {len(data):,} bytes, ruido {args.noise:.0%}\n")
+
+    legacy_time, legacy_frames = run("Byte a byte (legacy)", legacy_loop, data)
+    scanner_time, scanner_frames = run(
+        f"FrameScanner ({args.chunk} B)", scanner_loop, data, args.chunk
+    )
+
+    print(f"\n⚡ Aceleración: {legacy_time / scanner_time:.1f}x")
+    if legacy_frames != scanner_frames:
+        print(f"⚠️  Paquetes distintos: legacy={legacy_frames} scanner={scanner_frames}")
+
+
+if __name__ == "__main__":
+    main()
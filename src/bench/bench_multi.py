@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Escalado de ``MultiPortReader``: N contadoras simuladas (pares pty) leídas
+por un solo hilo con un único selector.
+
+Un hilo escritor envía a cada puerto ``--rate`` paquetes por segundo (con
+``--rate 0``, lo más rápido posible) con piezas distintas por máquina. Se
+mide la memoria que agrega cada puerto (tracemalloc al registrarlos), el
+CPU del proceso, los despertares del selector, los paquetes por segundo
+leídos y se verifica que el total de cada máquina y el combinado son los
+esperados.
+
+Uso:
+    python bench/bench_multi.py [--ports 1 4 16] [--rate 60] [--seconds 3]
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+
+# Agregar el directorio src al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.multiport import MultiPortReader
+from protocol.encoder import encode_frame
+from tools.pty_harness import open_pty
+
+FRAMES_PER_PORT = 9000  # Piezas 1..N sin desbordar: total esperado = último paquete
+
+
+def _frames(port_index, count):
+    # Cada máquina avanza de a (índice + 1) piezas para distinguir totales
+    step = port_index + 1
+    count = min(count, 9999 // step)
+    return [encode_frame(1000 * i, i * step, True) for i in range(1, count + 1)]
+
+
+def _write_ports(masters, frames, rate, stop):
+    """
+    Escribe el paquete i de todas las máquinas en la vuelta i (``rate`` vueltas
+    por segundo; 0 = sin pausa).
+    """
+    start = time.monotonic()
+    for i in range(max(len(f) for f in frames)):
+        if rate and stop.wait(max(start + i / rate - time.monotonic(), 0)):
+            return
+        if stop.is_set():
+            return
+        for master, port_frames in zip(masters, frames):
+            if i < len(port_frames):
+                os.write(master, port_frames[i])
+
+
+def run(ports, rate, seconds):
+    """
+    Corre ``ports`` contadoras durante ``seconds`` (o hasta leer todo con
+    ``rate`` 0) y devuelve sus métricas.
+    """
+    count = int(rate * seconds) if rate else FRAMES_PER_PORT
+    frames = [_frames(i, count) for i in range(ports)]
+    pairs = [open_pty() for _ in range(ports)]
+    expected = [int(f[-1][24:28]) for f in frames]
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    reader = MultiPortReader()
+    for i, (_, slave) in enumerate(pairs):
+        reader.add_port(f"M{i + 1}", os.ttyname(slave))
+    per_port = (tracemalloc.get_traced_memory()[0] - before) / ports
+    tracemalloc.stop()
+
+    stop = threading.Event()
+    writer = threading.Thread(
+        target=_write_ports, args=([m for m, _ in pairs], frames, rate, stop), daemon=True
+    )
+    threads = threading.active_count()
+    cpu = time.process_time()
+    wall = time.monotonic()
+    deadline = wall + (seconds if rate else 60)
+    writer.start()
+    while time.monotonic() < deadline:
+        reader.poll(min(deadline - time.monotonic(), 0.2))
+        if not writer.is_alive() and [m.total for m in reader.monitors] == expected:
+            break
+    wall = time.monotonic() - wall
+    cpu = time.process_time() - cpu
+    stop.set()
+    writer.join()
+
+    totals = [m.total for m in reader.monitors]
+    decoded = sum(m.pipeline.stats()["decoded"] for m in reader.monitors)
+    result = {
+        "ports": ports,
+        "rate": rate,
+        "threads": threads,  # Principal + escritor: ninguno por puerto
+        "bytes_per_port": per_port,
+        "frames_per_s": decoded / wall,
+        "cpu_pct": 100 * cpu / wall,
+        "wakeups_per_s": reader.wakeups / wall,
+        "ok": totals == expected and reader.total == sum(expected),
+    }
+    reader.close()
+    for master, slave in pairs:
+        os.close(master)
+        os.close(slave)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--ports", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--rate", type=float, default=60, help="Paquetes/s por puerto (0 = máximo)")
+    parser.add_argument("--seconds", type=float, default=3.0)
+    args = parser.parse_args()
+
+    print(
+        f"{'puertos':>7} {'hilos':>5} {'KB/puerto':>9} {'paq/s':>9} {'CPU %':>7} "
+        f"{'desp./s':>8} {'totales':>7}"
+    )
+    for ports in args.ports:
+        r = run(ports, args.rate, args.seconds)
+        print(
+            f"{r['ports']:>7} {r['threads']:>5} {r['bytes_per_port'] / 1024:>9.1f} "
+            f"{r['frames_per_s']:>9.0f} {r['cpu_pct']:>7.2f} {r['wakeups_per_s']:>8.1f} "
+            f"{'ok' if r['ok'] else 'ERROR':>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
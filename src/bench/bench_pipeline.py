@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Benchmark del pipeline completo por etapas, sobre flujos sintéticos:
+
+1. framing  — ``FrameScanner.feed`` por bloques (como ``serial_reader``)
+2. decode   — ``FrameDecoder.decode`` (sustituto de ``parse_payload``)
+3. counter  — ``CumulativeCounter.update`` (eventos a logging sin configurar)
+4. render   — formateo de ``RootWindow.update_labels`` sin Tk: cada lectura,
+              sin coalescer, sobre variables falsas (peor caso)
+
+Los resultados se escriben en JSON para comparar corridas; con
+``--compare`` se marca como regresión toda etapa más lenta que la
+referencia por encima de ``--tolerance`` y el proceso sale con código 1.
+
+Uso:
+    python bench/bench_pipeline.py [--sizes 10000 100000 1000000]
+        [--scenarios conteo reinicios ruido] [--output resultados.json]
+        [--compare referencia.json]
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Agregar el directorio src al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bench.synthetic import SCENARIOS, synthetic_stream
+from core.counter import CumulativeCounter
+from gui.root_windows import RootWindow
+from protocol.decoder import FrameDecoder
+from protocol.framing import READ_CHUNK_SIZE, FrameScanner
+
+RESULTS_SCHEMA = 1
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+DEFAULT_RESULTS_DIR = Path(__file__).parent / "results"
+STAGES = ("framing", "decode", "counter", "render")
+
+
+class _FakeVar:
+    """
+    Sustituto de ``tk.StringVar``: solo guarda el texto.
+    """
+
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = ""
+
+    def set(self, value):
+        self.value = value
+
+
+class _HeadlessLabels:
+    """
+    Ejecuta el mismo código de ``RootWindow.update_labels`` sin crear la
+    ventana (en CI no hay display).
+    """
+
+    update_labels = RootWindow.update_labels
+    _set_if_changed = RootWindow._set_if_changed
+
+    def __init__(self):
+        self.gui_vars = {k: _FakeVar() for k in ("monto", "piezas", "status", "rechazo_sensor")}
+        self._shown = {}
+        self.renders = 0
+        self.label_sets = 0
+
+
+def _chunks(stream, size):
+    return [stream[i : i + size] for i in range(0, len(stream), size)]
+
+
+def run_pipeline(stream, chunk_size=READ_CHUNK_SIZE, timer=time.perf_counter):
+    """
+    Pasa ``stream`` por las cuatro etapas, cronometrando cada una por
+    separado. Devuelve ``(tiempos, conteos)``.
+    """
+    chunks = _chunks(stream, chunk_size)
+    times = {}
+
+    scanner = FrameScanner()
+    feed = scanner.feed
+    frames = []
+    start = timer()
+    for chunk in chunks:
+        frames += feed(chunk)
+    times["framing"] = timer() - start
+
+    decoder = FrameDecoder()
+    decode = decoder.decode
+    start = timer()
+    readings = [decode(frame) for frame in frames]
+    times["decode"] = timer() - start
+    readings = [r for r in readings if r is not None]
+
+    counter = CumulativeCounter()
+    update = counter.update
+    start = timer()
+    totals = [update(r) for r in readings]
+    times["counter"] = timer() - start
+
+    view = _HeadlessLabels()
+    render = view.update_labels
+    start = timer()
+    for reading, total in zip(readings, totals):
+        render(reading, total)
+    times["render"] = timer() - start
+
+    counts = {
+        "bytes": len(stream),
+        "chunks": len(chunks),
+        "frames": len(frames),
+        "discarded_bytes": scanner.discarded_bytes,
+        "readings": len(readings),
+        "checksum_errors": decoder.checksum_errors,
+        "malformed": decoder.malformed,
+        "label_sets": view.label_sets,
+        "final_total": counter.total_pieces,
+    }
+    return times, counts
+
+
+def run_benchmarks(sizes, scenarios, repeat=3, chunk_size=READ_CHUNK_SIZE, seed=0):
+    """
+    Ejecuta cada (escenario, tamaño) ``repeat`` veces y conserva el mejor
+    tiempo por etapa. Devuelve la lista de resultados.
+    """
+    results = []
+    for name in scenarios:
+        for size in sizes:
+            stream, injected = synthetic_stream(size, name, seed=seed)
+            best = None
+            for _ in range(repeat):
+                times, counts = run_pipeline(stream, chunk_size)
+                best = times if best is None else {s: min(best[s], times[s]) for s in STAGES}
+            for stage in STAGES:
+                # Normalizado por paquete generado, para comparar etapas entre sí
+                results.append(
+                    {
+                        "scenario": name,
+                        "frames": size,
+                        "stage": stage,
+                        "seconds": best[stage],
+                        "ns_per_frame": best[stage] / size * 1e9,
+                        "frames_per_s": size / best[stage] if best[stage] else None,
+                    }
+                )
+            results.append(
+                {"scenario": name, "frames": size, "stage": "total", **_total(best, size)}
+            )
+            results[-1]["counts"] = {**counts, **injected}
+    return results
+
+
+def _total(times, size):
+    seconds = sum(times.values())
+    return {
+        "seconds": seconds,
+        "ns_per_frame": seconds / size * 1e9,
+        "frames_per_s": size / seconds if seconds else None,
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def build_report(results, args):
+    return {
+        "schema": RESULTS_SCHEMA,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": {
+            "sizes": list(args.sizes),
+            "scenarios": list(args.scenarios),
+            "repeat": args.repeat,
+            "chunk_size": args.chunk_size,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+
+
+def compare(current, reference, tolerance=0.15):
+    """
+    Compara ``ns_per_frame`` por (escenario, tamaño, etapa) contra un
+    reporte anterior. Devuelve una lista de ``(clave, antes, ahora, ratio,
+    es_regresion)`` solo para las claves presentes en ambos.
+    """
+    previous = {
+        (r["scenario"], r["frames"], r["stage"]): r["ns_per_frame"]
+        for r in reference["results"]
+    }
+    rows = []
+    for r in current["results"]:
+        key = (r["scenario"], r["frames"], r["stage"])
+        if key not in previous or not previous[key]:
+            continue
+        ratio = r["ns_per_frame"] / previous[key]
+        rows.append((key, previous[key], r["ns_per_frame"], ratio, ratio > 1 + tolerance))
+    return rows
+
+
+def _print_results(results):
+    print(f"{'escenario':<10} {'paquetes':>9} {'etapa':<8} {'ns/paq':>9} {'paq/s':>12}")
+    for r in results:
+        fps = f"{r['frames_per_s']:,.0f}" if r["frames_per_s"] else "-"
+        print(
+            f"{r['scenario']:<10} {r['frames']:>9} {r['stage']:<8} "
+            f"{r['ns_per_frame']:>9.0f} {fps:>12}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument(
+        "--scenarios", nargs="+", choices=sorted(SCENARIOS), default=list(SCENARIOS)
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Corridas por caso (mejor tiempo)")
+    parser.add_argument("--chunk-size", type=int, default=READ_CHUNK_SIZE)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, default=None, help="Archivo JSON de resultados")
+    parser.add_argument("--compare", type=Path, default=None, help="JSON de referencia")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Ej. 0.15 = 15%% más lento")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.sizes, args.scenarios, args.repeat, args.chunk_size, args.seed)
+    report = build_report(results, args)
+    _print_results(results)
+
+    output = args.output
+    if output is None:
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        output = DEFAULT_RESULTS_DIR / f"pipeline-{stamp}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"\n💾 Resultados en {output}")
+
+    if args.compare is not None:
+        rows = compare(report, json.loads(args.compare.read_text()), args.tolerance)
+        regressions = [row for row in rows if row[4]]
+        print(f"\n📊 Comparación con {args.compare.name} (tolerancia {args.tolerance:.0%})")
+        for (scenario, frames, stage), before, now, ratio, bad in rows:
+            mark = "❌ REGRESIÓN" if bad else "✅"
+            print(
+                f"{scenario:<10} {frames:>9} {stage:<8} "
+                f"{before:>9.0f} → {now:>9.0f} ns/paq ({ratio:.2f}x) {mark}"
+            )
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
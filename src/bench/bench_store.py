@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark del histórico SQLite (``core/store.py``): lecturas por segundo
+que el escritor en lotes sostiene, comparadas con la capacidad de la línea
+de la contadora (19200 baud ≈ 64 paquetes/s), y costo de ``publish`` en el
+hilo lector.
+
+Uso:
+    python bench/bench_store.py [--readings 200000] [--batch 500] [--db ruta]
+"""
+
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Agregar el directorio src al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.pacing import line_capacity_fps
+from core.store import ReadingStore
+from protocol.decoder import Reading
+
+LINE_FPS = line_capacity_fps(19200)
+
+
+def run_store(path, readings, batch_size=500, seconds_per_reading=1 / LINE_FPS):
+    """
+    Publica ``readings`` lecturas crecientes lo más rápido posible y espera a
+    que estén en disco. Las marcas de tiempo simulan el ritmo de la línea,
+    así que los agregados cubren ``readings / 64`` segundos de producción.
+    Devuelve un dict con los resultados.
+    """
+    t0 = 1_700_000_000.0
+    times = iter(t0 + i * seconds_per_reading for i in range(readings))
+    store = ReadingStore(path, batch_size=batch_size, queue_size=readings + 1, clock=lambda: next(times))
+    store.start()
+
+    start = time.perf_counter()
+    for n in range(readings):
+        store.publish((Reading(n * 1000, n % 10000, True, False), n))
+    publish_elapsed = time.perf_counter() - start
+    store.close()
+    elapsed = time.perf_counter() - start
+
+    store = ReadingStore(path)
+    query_start = time.perf_counter()
+    pieces = store.pieces_between(t0, t0 + readings * seconds_per_reading + 60)
+    query_ms = (time.perf_counter() - query_start) * 1e3
+    store.close()
+
+    return {
+        "readings": readings,
+        "batch_size": batch_size,
+        "publish_us": publish_elapsed / readings * 1e6,
+        "rate": readings / elapsed,
+        "line_multiple": readings / elapsed / LINE_FPS,
+        "pieces": pieces,
+        "query_ms": query_ms,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--readings", type=int, default=200_000)
+    parser.add_argument("--batch", type=int, default=500)
+    parser.add_argument("--db", type=Path, default=None, help="Base a usar (por defecto temporal)")
+    args = parser.parse_args()
+
+    tmpdir = None
+    path = args.db
+    if path is None:
+        tmpdir = tempfile.mkdtemp(prefix="uwf-store-")
+        path = Path(tmpdir) / "bench.sqlite3"
+    try:
+        result = run_store(path, args.readings, args.batch)
+    finally:
+        if tmpdir is not None:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+
+    print(f"🗄️  {result['readings']:,} lecturas, lotes de {result['batch_size']}")
+    print(f"   publish(): {result['publish_us']:.2f} µs por lectura")
+    print(
+        f"   Escritura: {result['rate']:,.0f} lecturas/s "
+        f"({result['line_multiple']:.0f}x la línea de 19200 baud)"
+    )
+    print(f"   Consulta por agregados: {result['pieces']:,} piezas en {result['query_ms']:.2f} ms")
+    print("✅ Sostiene 10x la línea" if result["line_multiple"] >= 10 else "❌ Por debajo de 10x")
+
+
+if __name__ == "__main__":
+    main()
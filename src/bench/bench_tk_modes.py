@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Comparación de los dos modos de lectura de la GUI sobre un pty:
+
+- ``thread``: hilo con ``run_reader`` (timeout 1 s) + ``LatestValueMailbox``
+  + refresco de la GUI cada 33 ms (``main.serial_reader``)
+- ``event``: ``TkSerialReader``, sin hilo, despertado por el descriptor
+
+Un hilo escribe paquetes al ritmo pedido (con ``--rate 0`` la línea queda en
+silencio: consumo en reposo). Se mide el CPU del proceso, los despertares
+del bucle de eventos y la latencia desde la escritura del paquete hasta que
+su lectura llega a ``render``.
+
+Sin ``--tk`` se usa ``HeadlessRoot``, un bucle de eventos mínimo con la
+interfaz de ``RootWindow`` que usan los lectores (no requiere display): la
+comparación es la de los lectores, sin el costo de dibujar de Tk.
+
+Uso:
+    python bench/bench_tk_modes.py [--rates 0 30 1000] [--seconds 3] [--tk]
+"""
+
+import argparse
+import heapq
+import itertools
+import os
+import selectors
+import sys
+import threading
+import time
+from pathlib import Path
+
+import serial
+
+# Agregar el directorio src al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.counter import CumulativeCounter
+from core.mailbox import LatestValueMailbox
+from core.reader import run_reader
+from gui.tk_reader import TkSerialReader
+from protocol.encoder import encode_frame
+from tools.pty_harness import open_pty
+
+MODES = ("thread", "event")
+RENDER_INTERVAL_MS = 33
+
+
+class HeadlessRoot:
+    """
+    Bucle de eventos mínimo (``selectors`` + temporizadores) con la parte de
+    la interfaz de ``RootWindow`` que usan los lectores: ``after``,
+    ``after_cancel``, ``tk.createfilehandler``, ``attach_mailbox``,
+    ``render`` y ``show_connection_lost``.
+    """
+
+    def __init__(self):
+        self.tk = self
+        self._selector = selectors.DefaultSelector()
+        self._timers = []
+        self._cancelled = set()
+        self._ids = itertools.count()
+        self._quit = False
+        self.on_render = None
+        self.rendered = []
+        self.connection_lost = 0
+        self.wakeups = 0  # Vueltas del bucle con algo que atender
+
+    # --- tk ---
+    def createfilehandler(self, fd, _mask, callback):
+        self._selector.register(fd, selectors.EVENT_READ, callback)
+
+    def deletefilehandler(self, fd):
+        self._selector.unregister(fd)
+
+    def after(self, ms, callback, *args):
+        timer_id = next(self._ids)
+        heapq.heappush(self._timers, (time.monotonic() + ms / 1000, timer_id, callback, args))
+        return timer_id
+
+    def after_cancel(self, timer_id):
+        self._cancelled.add(timer_id)
+
+    def quit(self):
+        self._quit = True
+
+    def mainloop(self, seconds=None):
+        deadline = None if seconds is None else time.monotonic() + seconds
+        self._quit = False
+        while not self._quit:
+            now = time.monotonic()
+            if deadline is not None and now >= deadline:
+                break
+            timeout = deadline - now if deadline is not None else None
+            if self._timers:
+                wait = max(self._timers[0][0] - now, 0)
+                timeout = wait if timeout is None else min(timeout, wait)
+            events = self._selector.select(timeout)
+            did_work = bool(events)
+            for key, mask in events:
+                key.data(key.fd, mask)
+            now = time.monotonic()
+            while self._timers and self._timers[0][0] <= now:
+                _, timer_id, callback, args = heapq.heappop(self._timers)
+                if timer_id in self._cancelled:
+                    self._cancelled.discard(timer_id)
+                    continue
+                did_work = True
+                callback(*args)
+            self.wakeups += did_work
+
+    # --- RootWindow ---
+    def attach_mailbox(self, mailbox, interval_ms=RENDER_INTERVAL_MS):
+        def tick():
+            value = mailbox.take()
+            if value is not None:
+                self.render(value)
+            self.after(interval_ms, tick)
+
+        self.after(interval_ms, tick)
+
+    def render(self, value):
+        self.rendered.append(value)
+        if self.on_render is not None:
+            self.on_render(value)
+
+    def show_connection_lost(self):
+        self.connection_lost += 1
+
+
+def _write_frames(master, frames, rate, sent, stop):
+    """Escribe ``frames`` a ``rate`` por segundo y anota cuándo salió cada uno."""
+    start = time.monotonic()
+    for i, frame in enumerate(frames):
+        target = start + i / rate
+        if stop.wait(max(target - time.monotonic(), 0)):
+            return
+        sent[i] = time.monotonic()
+        os.write(master, frame)
+
+
+def run_mode(mode, rate, seconds, use_tk=False):
+    """
+    Corre un modo durante ``seconds`` y devuelve sus métricas.
+    """
+    if use_tk:
+        from gui.root_windows import RootWindow
+
+        root = RootWindow()
+        root_render = root.render
+
+        def render(value):
+            root_render(value)
+            on_render(value)
+
+        root.render = render
+    else:
+        root = HeadlessRoot()
+
+    master, slave = open_pty()
+    ser = serial.Serial(os.ttyname(slave), baudrate=19200, timeout=1)
+    counter = CumulativeCounter()
+    # Piezas = número de paquete: cada lectura identifica su paquete
+    count = int(rate * seconds)
+    frames = [encode_frame(1000 * i, i, True) for i in range(min(count, 9999))]
+    sent = {}
+    latencies = []
+
+    def on_render(value):
+        latencies.append(time.monotonic() - sent[value[0].piezas])
+
+    if not use_tk:
+        root.on_render = on_render
+
+    stop = threading.Event()
+    reader = thread = None
+    if mode == "thread":
+        mailbox = LatestValueMailbox()
+        root.attach_mailbox(mailbox)
+        thread = threading.Thread(
+            target=run_reader,
+            args=(ser, counter, mailbox.publish),
+            kwargs={"stop_event": stop},
+            daemon=True,
+        )
+        thread.start()
+    else:
+        reader = TkSerialReader(root, ser, counter).start()
+
+    writer = None
+    if frames:
+        writer = threading.Thread(
+            target=_write_frames, args=(master, frames, rate, sent, stop), daemon=True
+        )
+    cpu = time.process_time()
+    wall = time.monotonic()
+    if writer is not None:
+        writer.start()
+    if use_tk:
+        root.after(int(seconds * 1000), root.quit)
+        root.mainloop()
+    else:
+        root.mainloop(seconds)
+    wall = time.monotonic() - wall
+    cpu = time.process_time() - cpu
+
+    stop.set()
+    if thread is not None:
+        thread.join(timeout=2)  # Termina al vencer su timeout de lectura
+    if reader is not None:
+        reader.stop()
+    if writer is not None:
+        writer.join()
+    ser.close()
+    os.close(master)
+    os.close(slave)
+    wakeups = getattr(root, "wakeups", None)
+    if use_tk:
+        root.destroy()
+
+    latencies.sort()
+
+    def pct(p):
+        return latencies[min(int(p * len(latencies)), len(latencies) - 1)] * 1000 if latencies else None
+
+    return {
+        "mode": mode,
+        "rate": rate,
+        "frames_sent": len(sent),
+        "total": counter.total_pieces,
+        "renders": len(latencies),
+        "cpu_pct": 100 * cpu / wall,
+        "wakeups_per_s": wakeups / wall if wakeups is not None else None,
+        "latency_p50_ms": pct(0.5),
+        "latency_p99_ms": pct(0.99),
+        "latency_max_ms": latencies[-1] * 1000 if latencies else None,
+    }
+
+
+def _fmt(value, spec):
+    return "-" if value is None else format(value, spec)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rates", type=float, nargs="+", default=[0, 30, 1000])
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--tk", action="store_true", help="Usar RootWindow real (requiere display)")
+    args = parser.parse_args()
+
+    print(
+        f"{'modo':<7} {'paq/s':>7} {'CPU %':>7} {'desp./s':>8} {'render':>7} "
+        f"{'p50 ms':>8} {'p99 ms':>8} {'máx ms':>8}"
+    )
+    for rate in args.rates:
+        for mode in MODES:
+            r = run_mode(mode, rate, args.seconds, args.tk)
+            print(
+                f"{r['mode']:<7} {r['rate']:>7.0f} {r['cpu_pct']:>7.2f} "
+                f"{_fmt(r['wakeups_per_s'], '>8.1f')} {r['renders']:>7} "
+                f"{_fmt(r['latency_p50_ms'], '>8.2f')} {_fmt(r['latency_p99_ms'], '>8.2f')} "
+                f"{_fmt(r['latency_max_ms'], '>8.2f')}"
+            )
+
+
+if __name__ == "__main__":
+    main()
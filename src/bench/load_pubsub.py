@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Prueba de carga de la difusión de lecturas (``core/pubsub.py``).
+
+Conecta ``--clients`` suscriptores locales (más ``--stalled`` que nunca
+leen) y publica ``--messages`` lecturas a ``--rate`` por segundo desde un
+hilo que hace de lector serie. Informa el costo de ``publish`` en ese
+hilo, entregas por cliente, descartes y latencia de entrega.
+
+Uso:
+    python bench/load_pubsub.py [--clients 100] [--messages 5000] [--rate 640]
+        [--format json|binary] [--tcp]
+"""
+
+import argparse
+import os
+import selectors
+import shutil
+import socket
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Agregar el directorio src al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.pacing import DeadlineScheduler, line_capacity_fps
+from core.pubsub import FORMAT_BINARY, FORMAT_JSON, RECORD, ReadingPublisher
+from protocol.decoder import Reading
+
+DEFAULT_RATE = 10 * line_capacity_fps(19200)  # 10x la línea de la contadora
+
+
+def _connect(address):
+    family = socket.AF_UNIX if isinstance(address, str) else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.connect(address)
+    return sock
+
+
+class _Receivers:
+    """
+    Todos los clientes activos leídos desde un único hilo con ``selectors``.
+    Cuenta mensajes por cliente y guarda el último total recibido.
+    """
+
+    def __init__(self, socks, fmt):
+        self.fmt = fmt
+        self.selector = selectors.DefaultSelector()
+        self.received = [0] * len(socks)
+        self.last_total = [None] * len(socks)
+        self.latencies = []
+        self._tails = [b""] * len(socks)
+        for i, sock in enumerate(socks):
+            sock.setblocking(False)
+            self.selector.register(sock, selectors.EVENT_READ, i)
+        self._stop = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            for key, _ in self.selector.select(timeout=0.1):
+                try:
+                    data = key.fileobj.recv(262144)
+                except BlockingIOError:
+                    continue
+                if data:
+                    self._consume(key.data, data)
+
+    def _consume(self, i, data):
+        data = self._tails[i] + data
+        now = time.time()
+        if self.fmt == FORMAT_BINARY:
+            n, rest = divmod(len(data), RECORD.size)
+            if n:
+                t, total = RECORD.unpack_from(data, (n - 1) * RECORD.size)[:2]
+            self._tails[i] = data[len(data) - rest :]
+        else:
+            lines = data.split(b"\n")
+            self._tails[i] = lines.pop()
+            n = len(lines)
+            if n:
+                # Solo se decodifica el último mensaje del bloque (t y total)
+                last = lines[-1]
+                t = float(last[last.index(b":") + 1 : last.index(b",")])
+                start = last.index(b'"total": ') + 9
+                total = int(last[start : last.index(b",", start)])
+        if n:
+            self.received[i] += n
+            self.last_total[i] = total
+            self.latencies.append(now - t)
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self.thread.join(timeout=2)
+        self.selector.close()
+
+
+def run_load(
+    clients=100,
+    messages=5000,
+    rate=DEFAULT_RATE,
+    fmt=FORMAT_JSON,
+    stalled=1,
+    queue_size=256,
+    tcp=False,
+    drain_timeout=10.0,
+):
+    """
+    Ejecuta la prueba y devuelve un dict con los resultados.
+    """
+    tmpdir = tempfile.mkdtemp(prefix="uwf-pubsub-")
+    address = ("127.0.0.1", 0) if tcp else os.path.join(tmpdir, "pubsub.sock")
+    publisher = ReadingPublisher(address, fmt=fmt, queue_size=queue_size).start()
+    active = [_connect(publisher.address) for _ in range(clients)]
+    idle = [_connect(publisher.address) for _ in range(stalled)]
+    deadline = time.monotonic() + 5
+    while publisher.subscribers < clients + stalled and time.monotonic() < deadline:
+        time.sleep(0.01)
+    connected = publisher.subscribers
+
+    receivers = _Receivers(active, fmt)
+    receivers.start()
+
+    publish_times = []
+    scheduler = DeadlineScheduler(rate or 0)
+    start = time.perf_counter()
+    for n in range(messages):
+        scheduler.wait(n)
+        reading = Reading(n * 1000, n % 10000, True, False)
+        t0 = time.perf_counter()
+        publisher.publish((reading, n))
+        publish_times.append(time.perf_counter() - t0)
+    publish_elapsed = time.perf_counter() - start
+
+    # Esperar a que cada cliente activo reciba la última lectura
+    final = messages - 1
+    deadline = time.monotonic() + drain_timeout
+    while time.monotonic() < deadline and any(t != final for t in receivers.last_total):
+        time.sleep(0.01)
+    elapsed = time.perf_counter() - start
+    receivers.stop()
+
+    stats = publisher.stats()
+    publisher.close()
+    for sock in active + idle:
+        sock.close()
+    shutil.rmtree(tmpdir, ignore_errors=True)
+
+    delivered = sum(receivers.received)
+    latencies = sorted(receivers.latencies) or [0.0]
+    return {
+        "clients": clients,
+        "stalled": stalled,
+        "connected": connected,
+        "format": fmt,
+        "messages": messages,
+        "publish_rate": messages / publish_elapsed if publish_elapsed else None,
+        "publish_us_mean": statistics.fmean(publish_times) * 1e6 if publish_times else 0.0,
+        "publish_us_max": max(publish_times, default=0.0) * 1e6,
+        "delivered": delivered,
+        "delivered_per_s": delivered / elapsed if elapsed else None,
+        "min_received": min(receivers.received, default=0),
+        "all_got_last": all(t == final for t in receivers.last_total),
+        "dropped": stats["dropped"],
+        "latency_ms_p50": latencies[len(latencies) // 2] * 1e3,
+        "latency_ms_p99": latencies[int(len(latencies) * 0.99)] * 1e3,
+        "latency_ms_max": latencies[-1] * 1e3,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clients", type=int, default=100)
+    parser.add_argument("--stalled", type=int, default=1, help="Clientes que nunca leen")
+    parser.add_argument("--messages", type=int, default=5000)
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE, help="0 = sin límite")
+    parser.add_argument("--format", choices=(FORMAT_JSON, FORMAT_BINARY), default=FORMAT_JSON)
+    parser.add_argument("--queue-size", type=int, default=256)
+    parser.add_argument("--tcp", action="store_true", help="TCP local en vez de socket Unix")
+    args = parser.parse_args()
+
+    result = run_load(
+        args.clients,
+        args.messages,
+        args.rate,
+        args.format,
+        args.stalled,
+        args.queue_size,
+        args.tcp,
+    )
+    print(f"📡 {result['connected']} suscriptores ({result['stalled']} sin leer), {result['format']}")
+    print(
+        f"   Publicadas: {result['messages']} a {result['publish_rate']:,.0f}/s  "
+        f"publish(): {result['publish_us_mean']:.1f} µs media, {result['publish_us_max']:.0f} µs máx"
+    )
+    print(
+        f"   Entregadas: {result['delivered']:,} ({result['delivered_per_s']:,.0f}/s)  "
+        f"Mínimo por cliente: {result['min_received']}  Descartadas: {result['dropped']}"
+    )
+    print(
+        f"   Latencia: p50 {result['latency_ms_p50']:.1f} ms  p99 {result['latency_ms_p99']:.1f} ms  "
+        f"máx {result['latency_ms_max']:.1f} ms"
+    )
+    print("✅ Todos recibieron la última lectura" if result["all_got_last"] else "❌ Faltan lecturas")
+
+
+if __name__ == "__main__":
+    main()
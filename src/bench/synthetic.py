@@ -0,0 +1,99 @@
+"""
+Flujos sintéticos de paquetes para los benchmarks.
+
+Cada escenario simula la contadora contando billetes: piezas y monto
+crecen, las piezas desbordan en 9999 -> 0, hay periodos en reposo (el
+mismo paquete repetido) y, según el escenario, reinicios manuales/suaves o
+ruido en la línea (bytes basura y paquetes con checksum corrupto).
+"""
+
+import itertools
+import random
+from dataclasses import dataclass
+
+from protocol.encoder import encode_frame
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    idle_prob: float = 0.3  # Probabilidad de repetir el paquete anterior
+    max_step: int = 20  # Piezas contadas como máximo entre dos paquetes
+    reset_prob: float = 0.0  # Reinicio manual (piezas y monto a 0)
+    soft_reset_prob: float = 0.0  # Piezas vuelven a un valor bajo, monto sigue
+    noise_prob: float = 0.0  # Bytes basura antes del paquete
+    corrupt_prob: float = 0.0  # Un byte alterado (checksum inválido)
+
+
+SCENARIOS = {
+    s.name: s
+    for s in (
+        Scenario("conteo"),
+        Scenario("reinicios", reset_prob=1 / 1500, soft_reset_prob=1 / 1500),
+        Scenario("ruido", noise_prob=1 / 100, corrupt_prob=1 / 200),
+    )
+}
+
+_DENOMINATIONS = (1000, 2000, 5000, 10000, 20000)
+
+
+def synthetic_frames(scenario, seed=0, stats=None):
+    """
+    Genera los paquetes del escenario sin fin, uno por iteración (con el
+    ruido que le precede, si lo hay). ``stats`` (dict) acumula lo inyectado.
+    """
+    if isinstance(scenario, str):
+        scenario = SCENARIOS[scenario]
+    rng = random.Random(seed)
+    if stats is None:
+        stats = {}
+    for key in ("overflows", "resets", "noise_bytes", "corrupted"):
+        stats.setdefault(key, 0)
+
+    piezas = monto = 0
+    status = False
+    denomination = _DENOMINATIONS[0]
+    frame = encode_frame(monto, piezas, status)
+    while True:
+        if rng.random() >= scenario.idle_prob:
+            r = rng.random()
+            if r < scenario.reset_prob:
+                piezas = monto = 0
+                stats["resets"] += 1
+            elif r < scenario.reset_prob + scenario.soft_reset_prob and piezas > 100:
+                piezas = rng.randrange(100)
+                stats["resets"] += 1
+            else:
+                if rng.random() < 0.01:
+                    denomination = rng.choice(_DENOMINATIONS)
+                step = rng.randint(1, scenario.max_step)
+                piezas += step
+                monto += step * denomination
+                if piezas >= 10000:
+                    piezas -= 10000
+                    stats["overflows"] += 1
+            status = piezas % 7 != 0
+            frame = encode_frame(monto, piezas, status)
+
+        noise = b""
+        if scenario.noise_prob and rng.random() < scenario.noise_prob:
+            noise = rng.randbytes(rng.randint(1, 64))
+            stats["noise_bytes"] += len(noise)
+        if scenario.corrupt_prob and rng.random() < scenario.corrupt_prob:
+            corrupted = bytearray(frame)
+            corrupted[rng.randrange(8, 28)] ^= 0x01  # Dígito -> otro dígito
+            stats["corrupted"] += 1
+            yield noise + bytes(corrupted)
+        else:
+            yield noise + frame
+
+
+def synthetic_stream(frames, scenario, seed=0):
+    """
+    Genera ``frames`` paquetes del escenario. Devuelve ``(stream, stats)``:
+    los bytes tal como llegarían por el puerto serie y un dict con lo
+    inyectado (desbordamientos, reinicios, bytes de ruido, corruptos).
+    """
+    stats = {}
+    stream = b"".join(itertools.islice(synthetic_frames(scenario, seed, stats), frames))
+    return stream, stats
@@ -2,6 +2,7 @@
 Configuración centralizada para la aplicación y simulador.
 """
 
+import os
 import sys
 from pathlib import Path
 
@@ -9,6 +10,7 @@ from pathlib import Path
 PROJECT_ROOT = Path(__file__).parent.parent
 SRC_DIR = Path(__file__).parent
 LOGS_DIR = PROJECT_ROOT / "logs_uwf_protocol"
+STATE_DIR = PROJECT_ROOT / "state"  # Estado persistente del contador
 
 # Archivos de log - Originales
 LOG_FILE_ORIGINAL_1 = LOGS_DIR / "contadora en 0 enviando datos.txt"
@@ -35,6 +37,31 @@ SERIAL_CONFIG = {
     "timeout": 1,
 }
 
+# Reconexión tras perder el puerto (ver core/reconnect.py)
+RECONNECT_CONFIG = {
+    "initial_delay": 0.05,  # segundos; se duplica en cada intento fallido
+    "max_delay": 1.0,
+    "probe_timeout": 0.3,  # espera de un paquete válido en los candidatos
+    # Si el puerto propio no abre, buscar el adaptador con otro nombre entre
+    # todos los puertos serie. Desactivado: con varias contadoras podría
+    # tomar el puerto de otra máquina
+    "search": os.environ.get("UWF_RECONNECT_SEARCH", "") not in ("", "0"),
+}
+
+# Lectura del puerto en la GUI: "thread" (hilo lector + buzón) o "event"
+# (sin hilo, dentro del bucle de Tk; ver gui/tk_reader.py)
+READER_CONFIG = {
+    "mode": os.environ.get("UWF_READER_MODE", "thread"),
+}
+
+# Varias contadoras en un proceso (src/monitor.py): nombre -> puerto.
+# Usar rutas estables (/dev/serial/by-id/...) para no intercambiar máquinas.
+MULTI_CONFIG = {
+    "ports": {},
+    "state_dir": STATE_DIR / "maquinas",  # Un journal por máquina
+    "columns": None,  # Columnas de la grilla (None: cuadrada)
+}
+
 # Configuración del simulador
 SIMULATOR_CONFIG = {
     "delay_between_packets": 0.1,  # segundos
@@ -52,6 +79,78 @@ GUI_CONFIG = {
     "piezas_color": "#FFC107",
 }
 
+# Ritmo de producción en la GUI (ver core/rates.py)
+RATE_CONFIG = {
+    "enabled": True,
+    "windows": (10, 60),  # segundos de las ventanas deslizantes
+    "ewma_tau": 15.0,  # constante de tiempo del promedio de piezas/s
+    "history": 120,  # segundos conservados para el gráfico
+}
+
+# Persistencia del contador acumulativo (ver core/journal.py)
+COUNTER_JOURNAL_CONFIG = {
+    "state_dir": STATE_DIR,
+    "sync_interval": 1.0,  # segundos máximos entre fsync del journal
+    "sync_every_events": 16,  # o fsync tras este número de eventos
+    "snapshot_interval": 30.0,  # segundos entre snapshots compactos
+}
+
+# Logging estructurado (ver core/log.py y core/frame_ring.py)
+LOGGING_CONFIG = {
+    "level": "INFO",
+    "log_file": STATE_DIR / "visor.log",  # JSON por línea, rotativo
+    # Niveles por logger; "uwf.frames" en DEBUG registra cada paquete
+    "levels": {"uwf.frames": os.environ.get("UWF_FRAME_LOG", "INFO")},
+}
+FRAME_RING_CONFIG = {
+    "path": STATE_DIR / "frames.ring",  # Últimos paquetes crudos (post-mortem)
+    "slots": 10000,
+}
+
+# Captura cruda del puerto con tiempos (ver protocol/raw_capture.py), para
+# reproducir fallos de campo con el simulador. Desactivada por defecto; se
+# activa con UWF_CAPTURE=1. Un archivo .uwfraw por sesión.
+RAW_CAPTURE_CONFIG = {
+    "enabled": os.environ.get("UWF_CAPTURE", "") not in ("", "0"),
+    "dir": STATE_DIR / "capturas",
+    "flush_interval": 1.0,  # segundos máximos con datos sin volcar al disco
+}
+
+# Difusión local de lecturas a suscriptores (ver core/pubsub.py)
+PUBSUB_CONFIG = {
+    "enabled": False,
+    "address": "/tmp/uwf-visor.sock",  # Ruta de socket Unix o ("127.0.0.1", puerto)
+    "format": "json",  # "json" (una línea por lectura) o "binary" (pubsub.RECORD)
+    "queue_size": 256,  # Lecturas pendientes por suscriptor antes de descartar
+}
+
+# Histórico de lecturas en SQLite (ver core/store.py)
+STORE_CONFIG = {
+    "enabled": False,
+    "path": STATE_DIR / "lecturas.sqlite3",
+    "batch_size": 500,  # Lecturas por transacción como máximo
+    "flush_interval": 1.0,  # segundos máximos entre transacciones
+}
+
+# Instrumentación de latencia (ver core/latency.py). Desactivada por defecto;
+# se activa con la variable de entorno UWF_LATENCY=1
+LATENCY_CONFIG = {
+    "enabled": os.environ.get("UWF_LATENCY", "") not in ("", "0"),
+    "dump_path": STATE_DIR / "latency.json",
+    "dump_interval": 60.0,  # segundos entre volcados periódicos (None = solo bajo demanda)
+}
+
+# Métricas en formato Prometheus (ver core/metrics.py). Desactivadas por
+# defecto; UWF_METRICS=1 las expone en "address" (solo local). Con
+# "textfile" se escriben además en ese archivo .prom para el textfile
+# collector de node_exporter.
+METRICS_CONFIG = {
+    "enabled": os.environ.get("UWF_METRICS", "") not in ("", "0"),
+    "address": ("127.0.0.1", 9752),  # None = sin servidor HTTP
+    "textfile": None,  # Ruta .prom o None
+    "textfile_interval": 15.0,  # segundos entre escrituras del archivo
+}
+
 # Protocolo
 PROTOCOL_CONFIG = {
     "STX": b"\x02",
@@ -87,6 +186,20 @@ def get_serial_port():
     return "COM3"  # Default
 
 
+def get_viewer_port():
+    """
+    Puerto que abre el visor: ``UWF_SERIAL_PORT`` si está definida; si no,
+    el extremo del visor del par de socat (``/tmp/COM4``, el simulador
+    escribe en ``/tmp/COM3``) o el de ``get_serial_port()``.
+    """
+    port = os.environ.get("UWF_SERIAL_PORT")
+    if port:
+        return port
+    if not IS_WINDOWS and os.path.exists("/tmp/COM4"):
+        return "/tmp/COM4"
+    return get_serial_port()
+
+
 def get_simulator_port():
     """
     Detecta el puerto serie para el simulador.
@@ -111,8 +224,10 @@ SIMULATOR_SERIAL_PORT = get_simulator_port()
 # Actualizar configuración del simulador
 SIMULATOR_CONFIG["serial_port"] = SIMULATOR_SERIAL_PORT
 
+# A stderr: en el modo sin pantalla stdout lleva las lecturas (JSON por línea)
 print(
-    f"[CONFIG] Sistema: {'Windows' if IS_WINDOWS else 'Linux' if IS_LINUX else 'macOS'}"
+    f"[CONFIG] Sistema: {'Windows' if IS_WINDOWS else 'Linux' if IS_LINUX else 'macOS'}",
+    file=sys.stderr,
 )
-print(f"[CONFIG] Puerto principal: {MAIN_SERIAL_PORT}")
-print(f"[CONFIG] Puerto simulador: {SIMULATOR_SERIAL_PORT}")
+print(f"[CONFIG] Puerto principal: {MAIN_SERIAL_PORT}", file=sys.stderr)
+print(f"[CONFIG] Puerto simulador: {SIMULATOR_SERIAL_PORT}", file=sys.stderr)
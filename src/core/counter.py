@@ -0,0 +1,136 @@
+"""
+Contador acumulativo de piezas (ver docs/DESBORDAMIENTO_LOGIC.md).
+"""
+
+import logging
+
+from core.journal import EVENT_MANUAL_RESET, EVENT_OVERFLOW, EVENT_SOFT_RESET
+from core.log import get_logger, log_event
+from protocol.decoder import Reading
+
+EVENT_MONTO_CHANGE = "monto_change"  # Informativo, no se journaliza
+
+# Nivel de log de cada evento del contador
+EVENT_LEVELS = {
+    EVENT_OVERFLOW: logging.WARNING,
+    EVENT_MANUAL_RESET: logging.WARNING,
+    EVENT_SOFT_RESET: logging.INFO,
+    EVENT_MONTO_CHANGE: logging.INFO,
+}
+
+_log = get_logger("counter")
+
+
+# --- Clase para manejar el contador acumulativo ---
+# Esta clase resuelve el problema del reinicio del contador de piezas
+class CumulativeCounter:
+    """
+    Gestiona un contador que se reinicia (ej. 9999 -> 0) para
+    mantener un total acumulado. Detecta reinicio basándose en:
+    1. Salto hacia atrás significativo en piezas (desbordamiento)
+    2. Reinicio manual (piezas vuelven a 0 o muy bajo)
+
+    Si se pasa un ``CounterJournal``, el estado se recupera al crear el
+    contador y cada transición queda registrada en disco. ``events`` cuenta
+    las transiciones de cada tipo desde que se creó (para las métricas).
+    """
+
+    def __init__(self, journal=None):
+        self.total_pieces = 0
+        self.offset = 0
+        self.last_reading = {"piezas": 0, "monto": 0}
+        self.max_counter_value = 10000  # Valor máximo
+        self.overflow_threshold = (
+            self.max_counter_value * 0.5
+        )  # 5000 para detectar desbordamiento
+        self.events = dict.fromkeys(EVENT_LEVELS, 0)
+
+        self.journal = journal
+        if journal is not None:
+            state = journal.load()
+            self.offset = state["offset"]
+            self.last_reading["piezas"] = state["piezas"]
+            self.last_reading["monto"] = state["monto"]
+            self.total_pieces = self.offset + state["piezas"]
+
+    def update(self, new_reading: Reading):
+        """
+        Actualiza el contador total detectando desbordamiento vs reinicio manual.
+
+        DESBORDAMIENTO: Piezas bajan mucho (>5000) pero monto sigue igual/sube
+                        Ej: 9980 piezas → 25 piezas, monto sigue igual
+
+        REINICIO MANUAL: Piezas bajan mucho Y monto también baja/es 0
+                         Ej: 5000 piezas → 0 piezas, monto 0 → 0
+        """
+        piezas_actual = new_reading.piezas
+        piezas_anterior = self.last_reading["piezas"]
+        monto_actual = new_reading.monto
+        monto_anterior = self.last_reading["monto"]
+
+        diferencia_piezas = piezas_anterior - piezas_actual
+        diferencia_monto = monto_anterior - monto_actual
+        event = None
+
+        # Caso 1: Salto hacia atrás significativo en piezas
+        if (
+            piezas_actual < piezas_anterior
+            and diferencia_piezas > self.overflow_threshold
+        ):
+            # Distinguir entre DESBORDAMIENTO y REINICIO MANUAL
+            # Si el monto también bajó significativamente → REINICIO MANUAL
+            if monto_actual < monto_anterior and diferencia_monto > 0:
+                self.offset = 0
+                event = EVENT_MANUAL_RESET
+            elif piezas_actual == 0 and monto_actual == 0:
+                self.offset = 0
+                event = EVENT_MANUAL_RESET
+            # Si el monto se mantiene igual o sube → DESBORDAMIENTO
+            else:
+                self.offset += self.max_counter_value
+                event = EVENT_OVERFLOW
+
+        # Caso 2: Reinicio suave (piezas a 0 sin gran salto)
+        # Esto ocurre cuando se resetea desde un valor bajo
+        elif piezas_actual < 100 and piezas_anterior > 100:
+            self.offset = 0
+            event = EVENT_SOFT_RESET
+
+        # Caso 3: Solo cambio en monto (informativo)
+        elif (
+            monto_actual < monto_anterior
+            and monto_anterior > 0
+            and piezas_actual >= piezas_anterior
+        ):
+            event = EVENT_MONTO_CHANGE
+
+        self.total_pieces = self.offset + piezas_actual
+        self.last_reading["piezas"] = piezas_actual
+        self.last_reading["monto"] = monto_actual
+
+        if event is not None:
+            self.events[event] += 1
+            # Registro estructurado; el formateo ocurre en el hilo de logging
+            log_event(
+                _log,
+                EVENT_LEVELS[event],
+                event,
+                piezas_anterior=piezas_anterior,
+                piezas=piezas_actual,
+                monto_anterior=monto_anterior,
+                monto=monto_actual,
+                offset=self.offset,
+            )
+        if self.journal is not None:
+            if event is not None and event != EVENT_MONTO_CHANGE:
+                self.journal.record_event(event, self.offset, piezas_actual, monto_actual)
+            self.journal.observe(self.offset, piezas_actual, monto_actual)
+        return self.total_pieces
+
+    def tick(self):
+        """
+        Da al journal la oportunidad de hacer fsync/snapshot cuando no llegan
+        lecturas nuevas (ej. repeticiones omitidas con la máquina en reposo).
+        """
+        if self.journal is not None:
+            self.journal.maybe_sync()
@@ -0,0 +1,113 @@
+"""
+Anillo en disco con los últimos N paquetes crudos, para análisis post-mortem.
+
+Archivo de tamaño fijo mapeado en memoria:
+
+    [cabecera 32 B][N ranuras de 8 + 2 + frame_length B, alineadas a 8]
+
+- Cabecera: ``<8sIIIIQ`` = magic, ranuras, tamaño de ranura, frame_length,
+  reservado, número total de paquetes escritos.
+- Ranura: timestamp (ns desde epoch), longitud real y bytes del paquete.
+
+Escribir un paquete son dos ``pack_into`` sobre el mmap, sin syscalls: el
+kernel persiste las páginas aunque el proceso muera. Se guardan todos los
+paquetes que entrega el framer, también los que luego fallan el checksum.
+"""
+
+import mmap
+import struct
+import time
+from pathlib import Path
+
+from protocol.framing import FRAME_LENGTH
+
+MAGIC = b"UWFRING1"
+HEADER = struct.Struct("<8sIIIIQ")
+HEADER_SIZE = HEADER.size  # 32
+_COUNT = struct.Struct("<Q")
+_COUNT_OFFSET = HEADER_SIZE - _COUNT.size
+
+
+class FrameRing:
+    """
+    Ring de ``slots`` paquetes. Al reabrir un archivo con los mismos
+    parámetros continúa donde quedó; si no coinciden, lo recrea.
+    """
+
+    def __init__(self, path, slots=10000, frame_length=FRAME_LENGTH, clock=time.time_ns):
+        self.path = Path(path)
+        self.slots = slots
+        self.frame_length = frame_length
+        self.clock = clock
+        self._slot = struct.Struct(f"<qH{frame_length}s")
+        self.slot_size = (self._slot.size + 7) & ~7
+        size = HEADER_SIZE + slots * self.slot_size
+
+        self.count = 0
+        existing = self._read_header() if self.path.exists() else None
+        if existing is not None and existing[:4] == (MAGIC, slots, self.slot_size, frame_length):
+            self.count = existing[4]
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "wb") as f:
+                f.write(HEADER.pack(MAGIC, slots, self.slot_size, frame_length, 0, 0))
+                f.truncate(size)
+
+        with open(self.path, "r+b") as f:
+            self._mmap = mmap.mmap(f.fileno(), size)
+
+    def _read_header(self):
+        with open(self.path, "rb") as f:
+            raw = f.read(HEADER_SIZE)
+        if len(raw) < HEADER_SIZE:
+            return None
+        magic, slots, slot_size, frame_length, _, count = HEADER.unpack(raw)
+        return magic, slots, slot_size, frame_length, count
+
+    def record(self, frame, timestamp_ns=None):
+        """
+        Guarda ``frame`` (truncado a ``frame_length``) en la siguiente ranura.
+        """
+        n = self.count
+        offset = HEADER_SIZE + (n % self.slots) * self.slot_size
+        self._slot.pack_into(
+            self._mmap,
+            offset,
+            self.clock() if timestamp_ns is None else timestamp_ns,
+            min(len(frame), self.frame_length),
+            frame,
+        )
+        self.count = n + 1
+        _COUNT.pack_into(self._mmap, _COUNT_OFFSET, n + 1)
+
+    def flush(self):
+        self._mmap.flush()
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.flush()
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_frame_ring(path):
+    """
+    Contenido de un anillo: lista de ``(timestamp_ns, paquete)`` del más
+    antiguo al más reciente.
+    """
+    raw = Path(path).read_bytes()
+    magic, slots, slot_size, frame_length, _, count = HEADER.unpack_from(raw)
+    if magic != MAGIC:
+        raise ValueError(f"{path} no es un anillo de paquetes")
+    slot = struct.Struct(f"<qH{frame_length}s")
+    entries = []
+    for n in range(max(0, count - slots), count):
+        timestamp, length, frame = slot.unpack_from(raw, HEADER_SIZE + (n % slots) * slot_size)
+        entries.append((timestamp, frame[:length]))
+    return entries
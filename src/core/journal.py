@@ -0,0 +1,220 @@
+"""
+Persistencia del contador acumulativo ante cortes de energía.
+
+Dos archivos en el directorio de estado:
+- ``counter.snapshot``: estado compacto (JSON) escrito de forma atómica
+  (archivo temporal + fsync + ``os.replace``).
+- ``counter.journal``: registro de solo-anexar con una línea JSON por cada
+  transición del contador (desbordamiento, reinicio manual, reinicio suave).
+
+Cada entrada lleva un número de secuencia creciente. Al arrancar se carga el
+snapshot y se aplican solo las entradas del journal con secuencia mayor, así
+que una caída entre escribir el snapshot y truncar el journal es inofensiva.
+Tras cada snapshot el journal se trunca, por lo que la recuperación lee
+como mucho unas pocas líneas aunque el visor lleve semanas encendido.
+
+Los fsync se agrupan por tiempo o por número de eventos: el hilo lector
+nunca espera al disco en cada paquete.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+from core.log import get_logger, log_event
+
+SNAPSHOT_FILE = "counter.snapshot"
+JOURNAL_FILE = "counter.journal"
+
+# Eventos registrados en el journal
+EVENT_OVERFLOW = "overflow"
+EVENT_MANUAL_RESET = "manual_reset"
+EVENT_SOFT_RESET = "soft_reset"
+
+_log = get_logger("journal")
+
+
+class CounterJournal:
+    """
+    Journal + snapshots del estado de ``CumulativeCounter``.
+
+    ``sync_interval`` / ``sync_every_events``: cuándo hacer fsync del journal.
+    ``snapshot_interval``: cada cuántos segundos se compacta en un snapshot
+    (el snapshot también guarda la última lectura, que no se journaliza).
+    """
+
+    def __init__(
+        self,
+        state_dir,
+        sync_interval=1.0,
+        sync_every_events=16,
+        snapshot_interval=30.0,
+        clock=time.monotonic,
+    ):
+        self.state_dir = Path(state_dir)
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        self.snapshot_path = self.state_dir / SNAPSHOT_FILE
+        self.journal_path = self.state_dir / JOURNAL_FILE
+
+        self.sync_interval = sync_interval
+        self.sync_every_events = sync_every_events
+        self.snapshot_interval = snapshot_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        self.seq = 0
+        self.state = {"offset": 0, "piezas": 0, "monto": 0}
+        self._pending_events = 0
+        self._dirty = False  # Hay lecturas nuevas sin snapshot
+        self.syncs = 0
+        self.snapshots = 0
+
+        self._journal = None
+        now = clock()
+        self._last_sync = now
+        self._last_snapshot = now
+
+    # --- Recuperación ---
+    def load(self):
+        """
+        Reconstruye el último estado conocido (snapshot + cola del journal)
+        y abre el journal para anexar. Devuelve el dict de estado.
+        """
+        if self.snapshot_path.exists():
+            try:
+                snapshot = json.loads(self.snapshot_path.read_text())
+                self.seq = snapshot["seq"]
+                self.state = snapshot["state"]
+            except (ValueError, KeyError) as e:
+                log_event(_log, logging.WARNING, "snapshot_unreadable", error=str(e))
+
+        good_end = 0  # Fin de la última línea válida
+        newline = True
+        if self.journal_path.exists():
+            with open(self.journal_path, "rb") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        seq, state = entry["seq"], entry["state"]
+                    except (ValueError, KeyError, TypeError):
+                        # Última línea cortada por el corte de energía (o una
+                        # entrada que no es del journal): se descarta desde aquí
+                        break
+                    good_end += len(line)
+                    newline = line.endswith(b"\n")
+                    if seq > self.seq:
+                        self.seq = seq
+                        self.state = state
+
+        self._journal = open(self.journal_path, "ab")
+        if self._journal.tell() != good_end:
+            # Sin el fragmento cortado, la próxima entrada empieza en su línea
+            log_event(
+                _log, logging.WARNING, "journal_torn_line", discarded_bytes=self._journal.tell() - good_end
+            )
+            self._journal.truncate(good_end)
+            self._journal.seek(good_end)
+        if not newline:
+            self._journal.write(b"\n")
+        return dict(self.state)
+
+    # --- Escritura ---
+    def record_event(self, event, offset, piezas, monto):
+        """
+        Anexa una transición del contador. Se escribe en el buffer del
+        archivo de inmediato; el fsync se agrupa (ver ``maybe_sync``).
+        """
+        with self._lock:
+            if self._journal is None:
+                return  # Journal cerrado (apagado en curso)
+            self.seq += 1
+            self._set_state(offset, piezas, monto)
+            entry = {"seq": self.seq, "t": time.time(), "event": event, "state": self.state}
+            self._journal.write(json.dumps(entry).encode() + b"\n")
+            self._pending_events += 1
+            if self._pending_events >= self.sync_every_events:
+                self._sync_locked(self._clock())
+
+    def observe(self, offset, piezas, monto):
+        """
+        Registra la última lectura sin escribir a disco (llamado por paquete).
+        Solo consulta el reloj para decidir si toca fsync o snapshot.
+        """
+        state = self.state
+        if state["piezas"] != piezas or state["monto"] != monto or state["offset"] != offset:
+            self._set_state(offset, piezas, monto)
+        self.maybe_sync()
+
+    def _set_state(self, offset, piezas, monto):
+        state = self.state
+        state["offset"] = offset
+        state["piezas"] = piezas
+        state["monto"] = monto
+        self._dirty = True
+
+    def maybe_sync(self):
+        now = self._clock()
+        if self._pending_events and now - self._last_sync >= self.sync_interval:
+            with self._lock:
+                self._sync_locked(now)
+        if self._dirty and now - self._last_snapshot >= self.snapshot_interval:
+            self.snapshot()
+
+    def _sync_locked(self, now):
+        if self._journal is None or not self._pending_events:
+            return
+        self._journal.flush()
+        os.fsync(self._journal.fileno())
+        self._pending_events = 0
+        self._last_sync = now
+        self.syncs += 1
+
+    def snapshot(self):
+        """
+        Escribe el estado actual de forma atómica y trunca el journal.
+        """
+        with self._lock:
+            data = json.dumps({"seq": self.seq, "t": time.time(), "state": self.state})
+            tmp_path = self.snapshot_path.with_suffix(".tmp")
+            with open(tmp_path, "w") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.snapshot_path)
+            _fsync_dir(self.state_dir)
+
+            # El snapshot ya cubre todo el journal: se puede vaciar
+            if self._journal is not None:
+                self._journal.truncate(0)
+                self._journal.seek(0)
+            self._pending_events = 0
+            self._dirty = False
+            self._last_snapshot = self._last_sync = self._clock()
+            self.snapshots += 1
+
+    def close(self):
+        """
+        Escribe un snapshot final y cierra el journal.
+        """
+        if self._journal is None:
+            return
+        self.snapshot()
+        with self._lock:
+            self._journal.close()
+            self._journal = None
+
+
+def _fsync_dir(path):
+    """
+    Persiste el rename del snapshot (no disponible en Windows).
+    """
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
@@ -0,0 +1,253 @@
+"""
+Instrumentación opcional de latencia extremo a extremo.
+
+Cada paquete se marca en cinco puntos:
+
+    STX recibido -> ETX recibido -> decodificado -> contador actualizado -> StringVar.set
+
+Los instantes de STX/ETX son los de la lectura del puerto que trajo esos
+bytes (un paquete partido entre lecturas toma el STX de la lectura
+anterior). Los intervalos se acumulan en histogramas de memoria fija
+(buckets log-lineales) por etapa y se vuelcan a un archivo JSON bajo
+demanda (señal, tecla) o periódicamente.
+
+Desactivada, el hilo lector recibe ``tracer=None`` y solo evalúa una
+comparación por paquete.
+"""
+
+import json
+import os
+import signal
+import threading
+import time
+
+# Etapas medidas (intervalos entre marcas consecutivas) y total
+STAGE_WIRE = "stx_etx"  # Transmisión + espera de la lectura
+STAGE_DECODE = "etx_decode"  # Framing + decodificación
+STAGE_COUNTER = "decode_counter"  # CumulativeCounter.update
+STAGE_RENDER = "counter_tk"  # Buzón + periodo de refresco + StringVar.set
+STAGE_TOTAL = "stx_tk"
+STAGES = (STAGE_WIRE, STAGE_DECODE, STAGE_COUNTER, STAGE_RENDER, STAGE_TOTAL)
+
+# Buckets: 8 por potencia de 2 entre 1 µs y ~69 s (error relativo <= 12,5 %)
+_MIN_EXP = 10  # 2**10 ns ~ 1 µs
+_MAX_EXP = 36  # 2**36 ns ~ 69 s
+_SUB_BITS = 3
+_SUB_BUCKETS = 1 << _SUB_BITS
+NUM_BUCKETS = (_MAX_EXP - _MIN_EXP) * _SUB_BUCKETS + 2  # + por debajo y por encima
+
+
+def bucket_index(ns):
+    """
+    Bucket de un valor en ns: 0 para < 1 µs, el último para >= 2**36 ns.
+    """
+    exp = ns.bit_length() - 1
+    if exp < _MIN_EXP:
+        return 0
+    if exp >= _MAX_EXP:
+        return NUM_BUCKETS - 1
+    sub = (ns >> (exp - _SUB_BITS)) & (_SUB_BUCKETS - 1)
+    return (exp - _MIN_EXP) * _SUB_BUCKETS + sub + 1
+
+
+def bucket_upper_bound(index):
+    """
+    Límite superior (ns, exclusivo) del bucket ``index``.
+    """
+    if index == 0:
+        return 1 << _MIN_EXP
+    if index >= NUM_BUCKETS - 1:
+        return None
+    exp, sub = divmod(index - 1, _SUB_BUCKETS)
+    exp += _MIN_EXP
+    return (1 << exp) + ((sub + 1) << (exp - _SUB_BITS))
+
+
+class LatencyHistogram:
+    """
+    Histograma de latencias en ns con memoria fija (``NUM_BUCKETS`` enteros).
+    """
+
+    __slots__ = ("buckets", "count", "total", "max")
+
+    def __init__(self):
+        self.buckets = [0] * NUM_BUCKETS
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def record(self, ns):
+        if ns < 0:
+            ns = 0  # Relojes de hilos distintos: no debería pasar con perf_counter
+        self.buckets[bucket_index(ns)] += 1
+        self.count += 1
+        self.total += ns
+        if ns > self.max:
+            self.max = ns
+
+    def percentile(self, q):
+        """
+        Límite superior del bucket que contiene el percentil ``q`` (0-100).
+        """
+        if not self.count:
+            return None
+        rank = q / 100 * self.count
+        seen = 0
+        for index, n in enumerate(self.buckets):
+            seen += n
+            if n and seen >= rank:
+                bound = bucket_upper_bound(index)
+                return self.max if bound is None else min(bound, self.max)
+        return self.max
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean_us": self.total / self.count / 1e3 if self.count else None,
+            "p50_us": _us(self.percentile(50)),
+            "p90_us": _us(self.percentile(90)),
+            "p99_us": _us(self.percentile(99)),
+            "max_us": self.max / 1e3,
+        }
+
+    def reset(self):
+        self.buckets = [0] * NUM_BUCKETS
+        self.count = self.total = self.max = 0
+
+
+def _us(ns):
+    return None if ns is None else ns / 1e3
+
+
+class LatencyTracer:
+    """
+    Marca los paquetes a su paso por el pipeline (ver docstring del módulo).
+
+    Hilo lector: ``chunk_read`` antes de ``FrameScanner.feed``,
+    ``chunk_framed`` después, y por paquete ``next_stx``, ``decoded`` y
+    ``counted``. Hilo de la GUI: ``rendered`` tras ``update_labels``.
+    """
+
+    def __init__(self, dump_path=None, clock=time.perf_counter_ns):
+        self.dump_path = dump_path
+        self.clock = clock
+        self.histograms = {stage: LatencyHistogram() for stage in STAGES}
+        self.dumps = 0
+
+        self._chunk_time = 0  # Lectura que trajo los bytes en proceso
+        self._partial_since = 0  # Lectura que trajo el inicio del paquete pendiente
+        self._first_stx = 0  # STX del próximo paquete que salga del framer
+        self._decoded_at = 0
+        self._published = None  # (valor, t_stx, t_contador) del último publicado
+        self._dump_lock = threading.Lock()
+        self._stop = threading.Event()
+
+    # --- Hilo lector ---
+    def chunk_read(self, had_partial):
+        """
+        Llegó un bloque del puerto. ``had_partial``: el framer ya tenía
+        bytes de un paquete incompleto.
+        """
+        now = self.clock()
+        self._chunk_time = now
+        self._first_stx = self._partial_since if had_partial else now
+
+    def chunk_framed(self, has_partial, frames):
+        """
+        Tras ``feed``: si quedó un paquete incompleto que empezó en este
+        bloque, su STX es el de esta lectura.
+        """
+        if has_partial and (frames or not self._partial_since):
+            self._partial_since = self._chunk_time
+        elif not has_partial:
+            self._partial_since = 0
+
+    def next_stx(self):
+        """
+        Instante de STX del siguiente paquete extraído del bloque actual.
+        """
+        t_stx = self._first_stx
+        self._first_stx = self._chunk_time
+        return t_stx
+
+    def decoded(self):
+        self._decoded_at = self.clock()
+
+    def counted(self, value, t_stx):
+        """
+        Registra las etapas del hilo lector. Se llama antes de publicar
+        ``value`` para que la GUI pueda asociarlo.
+        """
+        now = self.clock()
+        histograms = self.histograms
+        etx = self._chunk_time
+        histograms[STAGE_WIRE].record(etx - t_stx)
+        histograms[STAGE_DECODE].record(self._decoded_at - etx)
+        histograms[STAGE_COUNTER].record(now - self._decoded_at)
+        self._published = (value, t_stx, now)
+
+    # --- Hilo de la GUI ---
+    def rendered(self, value):
+        """
+        La GUI mostró ``value``. Si entre tanto se publicó otro valor la
+        muestra se descarta (no se puede asociar sin locks).
+        """
+        published = self._published
+        if published is None or published[0] is not value:
+            return
+        now = self.clock()
+        self.histograms[STAGE_RENDER].record(now - published[2])
+        self.histograms[STAGE_TOTAL].record(now - published[1])
+
+    # --- Volcado ---
+    def summary(self):
+        return {stage: h.summary() for stage, h in self.histograms.items()}
+
+    def dump(self, path=None):
+        """
+        Escribe el resumen y los buckets en JSON (de forma atómica) y
+        devuelve el dict escrito.
+        """
+        path = path or self.dump_path
+        report = {
+            "t": time.time(),
+            "bucket_upper_bounds_ns": [bucket_upper_bound(i) for i in range(NUM_BUCKETS)],
+            "stages": {
+                stage: {**h.summary(), "buckets": list(h.buckets)}
+                for stage, h in self.histograms.items()
+            },
+        }
+        if path is not None:
+            with self._dump_lock:
+                tmp_path = f"{path}.tmp"
+                with open(tmp_path, "w") as f:
+                    json.dump(report, f)
+                os.replace(tmp_path, path)
+        self.dumps += 1
+        return report
+
+    def install_signal_handler(self, signum=getattr(signal, "SIGUSR1", None)):
+        """
+        Vuelca al recibir ``signum`` (SIGUSR1 por defecto; no disponible
+        en Windows). Debe llamarse desde el hilo principal.
+        """
+        if signum is None:
+            return False
+        signal.signal(signum, lambda *_: self.dump())
+        return True
+
+    def start_periodic_dump(self, interval):
+        """
+        Vuelca cada ``interval`` segundos desde un hilo daemon.
+        """
+
+        def loop():
+            while not self._stop.wait(interval):
+                self.dump()
+
+        thread = threading.Thread(target=loop, name="latency-dump", daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self):
+        self._stop.set()
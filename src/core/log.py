@@ -0,0 +1,170 @@
+"""
+Logging estructurado y no bloqueante.
+
+Los módulos registran eventos con ``log_event(logger, nivel, evento, **campos)``:
+el evento y sus campos viajan en el ``LogRecord`` sin formatear. Con
+``setup_logging`` los registros pasan por una cola acotada a un hilo de
+fondo (``QueueListener``) que los escribe en consola y, opcionalmente, en
+un archivo rotativo como JSON por línea. El hilo lector solo encola: una
+consola lenta nunca lo frena, y si la cola se llena se descartan registros
+(contados en ``dropped``) en lugar de bloquear.
+
+Sin ``setup_logging`` (tests, benchmarks, uso como librería) los registros
+de ``uwf.*`` se descartan en silencio.
+"""
+
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import time
+
+ROOT_LOGGER = "uwf"
+FRAMES_LOGGER = f"{ROOT_LOGGER}.frames"  # Un registro DEBUG por paquete
+
+logging.getLogger(ROOT_LOGGER).addHandler(logging.NullHandler())
+
+
+def get_logger(name):
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+
+def log_event(logger, level, event, **fields):
+    """
+    Registra ``event`` con ``fields`` como datos estructurados. No construye
+    el registro si el nivel está desactivado.
+    """
+    if logger.isEnabledFor(level):
+        logger.log(level, event, extra={"event": event, "fields": fields})
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Una línea JSON por registro: ``t``, ``level``, ``logger``, ``event`` y
+    los campos del evento al mismo nivel.
+    """
+
+    def format(self, record):
+        entry = {
+            "t": round(record.created, 6),
+            "level": record.levelname,
+            "logger": record.name,
+            "event": getattr(record, "event", None) or record.getMessage(),
+        }
+        entry.update(getattr(record, "fields", {}))
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class ConsoleFormatter(logging.Formatter):
+    """
+    ``HH:MM:SS NIVEL logger evento clave=valor ...`` para lectura humana.
+    """
+
+    def format(self, record):
+        fields = getattr(record, "fields", None)
+        message = getattr(record, "event", None) or record.getMessage()
+        if fields:
+            message += " " + " ".join(f"{k}={v}" for k, v in fields.items())
+        line = (
+            f"{time.strftime('%H:%M:%S', time.localtime(record.created))} "
+            f"{record.levelname:<7} {record.name} {message}"
+        )
+        if record.exc_text:
+            line += "\n" + record.exc_text
+        return line
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """
+    ``QueueHandler`` que descarta el registro si la cola está llena.
+    """
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        # Los campos estructurados no se formatean aquí: el formateo ocurre
+        # en el hilo de fondo. Solo se resuelven msg % args.
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class LoggingHandle:
+    """
+    Configuración activa devuelta por ``setup_logging``.
+    """
+
+    def __init__(self, listener, queue_handler):
+        self.listener = listener
+        self.queue_handler = queue_handler
+
+    @property
+    def dropped(self):
+        return self.queue_handler.dropped
+
+    def stop(self):
+        """
+        Vacía la cola y detiene el hilo de fondo.
+        """
+        if self.listener is None:
+            return
+        self.listener.stop()
+        for handler in self.listener.handlers:
+            handler.close()
+        logging.getLogger(ROOT_LOGGER).removeHandler(self.queue_handler)
+        self.listener = None
+
+
+def setup_logging(
+    level="INFO",
+    log_file=None,
+    console=True,
+    levels=None,
+    queue_size=10000,
+    max_bytes=5 * 1024 * 1024,
+    backup_count=3,
+):
+    """
+    Activa el logging de ``uwf.*`` a través de una cola acotada.
+
+    ``levels``: niveles por logger, ej. ``{"uwf.frames": "DEBUG"}``.
+    ``log_file``: archivo JSON por línea, rotado a ``max_bytes``.
+    """
+    handlers = []
+    if console:
+        stream = logging.StreamHandler(sys.stderr)
+        stream.setFormatter(ConsoleFormatter())
+        handlers.append(stream)
+    if log_file is not None:
+        rotating = logging.handlers.RotatingFileHandler(
+            log_file, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
+        )
+        rotating.setFormatter(JsonFormatter())
+        handlers.append(rotating)
+
+    queue_handler = DroppingQueueHandler(queue.Queue(maxsize=queue_size))
+    root = logging.getLogger(ROOT_LOGGER)
+    root.setLevel(level)
+    root.addHandler(queue_handler)
+    root.propagate = False
+    for name, logger_level in (levels or {}).items():
+        logging.getLogger(name).setLevel(logger_level)
+
+    listener = logging.handlers.QueueListener(queue_handler.queue, *handlers)
+    listener.start()
+    return LoggingHandle(listener, queue_handler)
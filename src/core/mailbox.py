@@ -0,0 +1,49 @@
+"""
+Buzón de un solo valor para pasar lecturas del hilo lector a la GUI.
+
+El hilo lector publica cada lectura y la GUI la recoge a su propio ritmo:
+si llegan varias lecturas entre dos refrescos, solo se muestra la última.
+"""
+
+
+class LatestValueMailbox:
+    """
+    Buzón "último valor gana" con un único productor y un único consumidor.
+
+    No usa locks: la asignación de un atributo es atómica en CPython y el
+    consumidor detecta valores nuevos por identidad, así que ``publish``
+    nunca bloquea al hilo lector. Republicar el mismo objeto no cuenta como
+    valor nuevo para el consumidor.
+    """
+
+    def __init__(self):
+        self._slot = None
+        self._taken = None
+        self.published = 0  # Valores recibidos del productor
+        self.taken = 0  # Valores entregados al consumidor
+
+    def publish(self, value):
+        """
+        Reemplaza el valor pendiente (llamado desde el hilo lector).
+        """
+        self._slot = value
+        self.published += 1
+
+    def take(self):
+        """
+        Devuelve el último valor publicado si no se había entregado aún,
+        o ``None`` si no hay nada nuevo.
+        """
+        value = self._slot
+        if value is self._taken:
+            return None
+        self._taken = value
+        self.taken += 1
+        return value
+
+    @property
+    def coalesced(self):
+        """
+        Valores publicados que se descartaron sin llegar al consumidor.
+        """
+        return self.published - self.taken
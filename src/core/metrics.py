@@ -0,0 +1,272 @@
+"""
+Métricas del visor en formato de texto de Prometheus.
+
+Tres tipos, sin locks: cada métrica tiene un solo hilo que la escribe (el
+lector o el de la GUI) y la exposición solo lee enteros y flotantes, cuya
+lectura es atómica en CPython. Un raspado puede ver un histograma con una
+observación a medio anotar; el siguiente ya es consistente.
+
+- ``Counter``: solo sube (``inc``).
+- ``Gauge``: valor actual (``set``/``inc``/``dec``).
+- ``Histogram``: buckets fijos; ``observe`` es un ``bisect`` y dos sumas.
+
+``Counter`` y ``Gauge`` aceptan ``function``: el valor se lee al exponer.
+Así se publican los contadores que el pipeline ya mantiene (paquetes,
+bytes descartados, errores de checksum...) sin costo por paquete.
+
+Exposición: ``MetricsServer`` (HTTP local, ``GET /metrics``) o
+``TextfileExporter`` (archivo ``.prom`` para el textfile collector de
+node_exporter, reescrito de forma atómica cada ``interval`` segundos).
+"""
+
+import bisect
+import logging
+import math
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from core.log import get_logger, log_event
+
+_log = get_logger("metrics")
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+# Segundos de un refresco de la GUI
+RENDER_BUCKETS = (0.0005, 0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1)
+# Bytes por lectura del puerto: lecturas grandes = bytes acumulados en el buffer del SO
+CHUNK_BUCKETS = (1, 30, 60, 120, 240, 480, 960, 1920, 3840)
+
+
+def _format_value(value):
+    if isinstance(value, int):
+        return str(value)
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    escaped = (
+        (k, str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for k, v in labels.items()
+    )
+    return "{" + ",".join(f'{k}="{v}"' for k, v in escaped) + "}"
+
+
+class Counter:
+    __slots__ = ("labels", "value", "function")
+
+    def __init__(self, labels=None, function=None):
+        self.labels = labels or {}
+        self.value = 0
+        self.function = function
+
+    def inc(self, amount=1):
+        self.value += amount
+
+    def get(self):
+        return self.function() if self.function is not None else self.value
+
+    def samples(self, name):
+        yield name, self.labels, self.get()
+
+
+class Gauge(Counter):
+    __slots__ = ()
+
+    def set(self, value):
+        self.value = value
+
+    def dec(self, amount=1):
+        self.value -= amount
+
+
+class Histogram:
+    __slots__ = ("labels", "bounds", "counts", "sum")
+
+    def __init__(self, buckets, labels=None):
+        self.labels = labels or {}
+        self.bounds = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.bounds) + 1)  # El último es +Inf
+        self.sum = 0
+
+    def observe(self, value, _bisect=bisect.bisect_left):
+        # bisect_left: el primer límite >= value (buckets "le")
+        self.counts[_bisect(self.bounds, value)] += 1
+        self.sum += value
+
+    @property
+    def count(self):
+        return sum(self.counts)
+
+    def samples(self, name):
+        cumulative = 0
+        counts = list(self.counts)
+        for bound, count in zip(self.bounds + (math.inf,), counts):
+            cumulative += count
+            yield f"{name}_bucket", {**self.labels, "le": _format_value(bound)}, cumulative
+        yield f"{name}_sum", self.labels, self.sum
+        yield f"{name}_count", self.labels, cumulative
+
+
+class MetricsRegistry:
+    """
+    Familias de métricas por nombre (con ``HELP`` y ``TYPE``); cada
+    combinación de etiquetas es una métrica aparte.
+    """
+
+    def __init__(self, prefix="uwf_"):
+        self.prefix = prefix
+        self._families = {}  # nombre -> (tipo, ayuda, {etiquetas: métrica})
+        self._lock = threading.Lock()  # Solo para registrar y exponer
+
+    def _register(self, kind, name, help, labels, metric):
+        name = self.prefix + name
+        key = tuple(sorted((labels or {}).items()))
+        with self._lock:
+            family = self._families.setdefault(name, (kind, help, {}))
+            if family[0] != kind:
+                raise ValueError(f"{name} ya está registrada como {family[0]}")
+            if key in family[2]:
+                raise ValueError(f"{name}{_format_labels(labels)} ya está registrada")
+            family[2][key] = metric
+        return metric
+
+    def counter(self, name, help, labels=None, function=None):
+        return self._register("counter", name, help, labels, Counter(labels, function))
+
+    def gauge(self, name, help, labels=None, function=None):
+        return self._register("gauge", name, help, labels, Gauge(labels, function))
+
+    def histogram(self, name, help, buckets, labels=None):
+        return self._register("histogram", name, help, labels, Histogram(buckets, labels))
+
+    def unregister(self, name, labels=None):
+        key = tuple(sorted((labels or {}).items()))
+        with self._lock:
+            family = self._families.get(self.prefix + name)
+            if family is not None:
+                family[2].pop(key, None)
+
+    def render(self):
+        """
+        Todas las métricas en el formato de texto de Prometheus.
+        """
+        lines = []
+        with self._lock:
+            families = [(name, kind, help, list(m.values())) for name, (kind, help, m) in self._families.items()]
+        for name, kind, help, metrics in families:
+            if not metrics:
+                continue
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+            for metric in metrics:
+                try:
+                    for sample, labels, value in metric.samples(name):
+                        lines.append(f"{sample}{_format_labels(labels)} {_format_value(value)}")
+                except Exception:
+                    _log.exception("metric_failed")
+        return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    """
+    ``GET /metrics`` en ``host:port`` (con ``port`` 0, uno libre; ver
+    ``address``). Atiende en un hilo propio, fuera del lector y de la GUI.
+    """
+
+    def __init__(self, registry, host="127.0.0.1", port=9752):
+        self.registry = registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(handler):
+                if handler.path.split("?", 1)[0] not in ("/metrics", "/"):
+                    handler.send_error(404)
+                    return
+                body = registry.render().encode()
+                handler.send_response(200)
+                handler.send_header("Content-Type", CONTENT_TYPE)
+                handler.send_header("Content-Length", str(len(body)))
+                handler.end_headers()
+                handler.wfile.write(body)
+
+            def log_message(handler, *args):
+                pass  # Un raspado cada pocos segundos no va al log
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def address(self):
+        return self._server.server_address
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="uwf-metrics", daemon=True
+        )
+        self._thread.start()
+        log_event(_log, logging.INFO, "metrics_listening", address=f"{self.address[0]}:{self.address[1]}")
+        return self
+
+    def close(self):
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+        self._server.server_close()
+
+
+class TextfileExporter:
+    """
+    Escribe ``registry.render()`` en ``path`` cada ``interval`` segundos
+    (archivo temporal + ``os.replace``: el collector nunca lee uno a medias)
+    y una última vez al cerrar.
+    """
+
+    def __init__(self, registry, path, interval=15.0):
+        self.registry = registry
+        self.path = Path(path)
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def write(self):
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(self.registry.render())
+        os.replace(tmp, self.path)
+
+    def start(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        def loop():
+            while not self._stop.wait(self.interval):
+                try:
+                    self.write()
+                except OSError as e:
+                    log_event(_log, logging.ERROR, "metrics_write_failed", error=str(e))
+
+        self._thread = threading.Thread(target=loop, name="uwf-metrics-file", daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.write()
+
+
+def start_exporters(registry, address=None, textfile=None, textfile_interval=15.0):
+    """
+    Arranca el servidor HTTP (``address`` = ``(host, puerto)``) y/o el
+    archivo ``textfile``. Devuelve la lista de exportadores, para ``close()``.
+    """
+    exporters = []
+    if address is not None:
+        exporters.append(MetricsServer(registry, *address).start())
+    if textfile is not None:
+        exporters.append(TextfileExporter(registry, textfile, textfile_interval).start())
+    return exporters
@@ -0,0 +1,255 @@
+"""
+Varias contadoras desde un solo proceso y un solo hilo.
+
+Cada puerto se abre con timeout 0 y se registra en un único selector
+(epoll en Linux). ``poll`` despierta cuando algún puerto tiene bytes, vacía
+solo esos puertos y los procesa con un ``FramePipeline`` y un
+``CumulativeCounter`` propios. Un puerto más es un descriptor en el
+selector y unos pocos KB de estado: sin hilos por máquina.
+
+Un puerto perdido se reintenta por su misma ruta cada ``reconnect_delay``
+segundos (con varias máquinas, usar rutas estables como
+``/dev/serial/by-id/...``: buscar "el puerto con tráfico" confundiría una
+contadora con otra). Este módulo no importa tkinter.
+"""
+
+import logging
+import selectors
+import time
+
+import serial
+
+from core.counter import CumulativeCounter
+from core.log import get_logger, log_event
+from core.reader import FramePipeline, open_serial
+from protocol.framing import READ_CHUNK_SIZE
+
+_log = get_logger("multiport")
+
+# Espera antes de reabrir un puerto perdido
+RECONNECT_DELAY = 1.0
+# Lecturas por puerto y despertar como máximo (reparto entre puertos)
+MAX_READS_PER_EVENT = 16
+
+
+class PortMonitor:
+    """
+    Estado de una contadora: puerto, pipeline, contador y la última lectura
+    pendiente de mostrar (``take``).
+    """
+
+    __slots__ = (
+        "name",
+        "port",
+        "baudrate",
+        "counter",
+        "pipeline",
+        "ser",
+        "connected",
+        "changed",
+        "value",
+        "published",
+        "losses",
+        "retry_at",
+        "_publish",
+    )
+
+    def __init__(self, name, port, counter, baudrate=19200, publish=None, metrics=None):
+        self.name = name
+        self.port = port
+        self.baudrate = baudrate
+        self.counter = counter
+        self.pipeline = FramePipeline(
+            counter, self._on_reading, metrics=metrics, labels={"port": name}
+        )
+        self.ser = None
+        self.connected = False
+        self.changed = False  # Lectura nueva o cambio de conexión sin mostrar
+        self.value = None  # Última (lectura, total)
+        self.published = 0
+        self.losses = 0
+        self.retry_at = 0.0
+        self._publish = publish
+
+    def _on_reading(self, value):
+        self.value = value
+        self.changed = True
+        self.published += 1
+        if self._publish is not None:
+            self._publish(self.name, value)
+
+    @property
+    def total(self):
+        return self.counter.total_pieces
+
+    def stats(self):
+        return {
+            "port": self.port,
+            "connected": self.connected,
+            "total": self.total,
+            "published": self.published,
+            "losses": self.losses,
+            **self.pipeline.stats(),
+        }
+
+
+class MultiPortReader:
+    """
+    Lee N puertos con un selector. ``publish(nombre, (lectura, total))`` se
+    llama por cada lectura nueva de cualquier puerto (ej. una salida de
+    ``core.outputs`` por máquina); la GUI usa ``changed()``. Con ``metrics``
+    (``MetricsRegistry``) cada puerto publica las suyas con ``port=<nombre>``.
+    """
+
+    def __init__(
+        self, publish=None, reconnect_delay=RECONNECT_DELAY, clock=time.monotonic, metrics=None
+    ):
+        self.selector = selectors.DefaultSelector()
+        self.monitors = []
+        self.publish = publish
+        self.reconnect_delay = reconnect_delay
+        self.clock = clock
+        self.metrics = metrics
+        self.wakeups = 0
+
+    def add_port(self, name, port, counter=None, baudrate=19200):
+        """
+        Agrega una contadora y abre su puerto (si falla, se reintenta en
+        ``poll``). Devuelve su ``PortMonitor``.
+        """
+        monitor = PortMonitor(
+            name,
+            port,
+            counter if counter is not None else CumulativeCounter(),
+            baudrate,
+            self.publish,
+            self.metrics,
+        )
+        self.monitors.append(monitor)
+        self._open(monitor)
+        return monitor
+
+    def fileno(self):
+        """
+        Descriptor del selector (epoll): legible cuando algún puerto lo es.
+        ``None`` si la plataforma no lo ofrece.
+        """
+        try:
+            return self.selector.fileno()
+        except (AttributeError, NotImplementedError):
+            return None
+
+    def _open(self, monitor):
+        try:
+            ser = open_serial(monitor.port, baudrate=monitor.baudrate, timeout=0)
+        except serial.SerialException as e:
+            monitor.retry_at = self.clock() + self.reconnect_delay
+            log_event(_log, logging.ERROR, "port_open_failed", name=monitor.name, error=str(e))
+            return False
+        monitor.ser = ser
+        monitor.connected = True
+        monitor.changed = True
+        self.selector.register(ser.fileno(), selectors.EVENT_READ, monitor)
+        return True
+
+    def _lost(self, monitor):
+        log_event(_log, logging.WARNING, "port_lost", name=monitor.name, port=monitor.port)
+        self.selector.unregister(monitor.ser.fileno())
+        monitor.ser.close()
+        monitor.ser = None
+        monitor.connected = False
+        monitor.changed = True
+        monitor.losses += 1
+        monitor.pipeline.reset()
+        monitor.retry_at = self.clock() + self.reconnect_delay
+
+    def _drain(self, monitor):
+        read = monitor.ser.read
+        feed = monitor.pipeline.feed
+        try:
+            for _ in range(MAX_READS_PER_EVENT):
+                chunk = read(READ_CHUNK_SIZE)
+                if chunk:
+                    feed(chunk)
+                if len(chunk) < READ_CHUNK_SIZE:
+                    break
+        except (serial.SerialException, OSError):
+            self._lost(monitor)
+        except Exception:
+            _log.exception("unexpected_error")
+            monitor.pipeline.scanner.reset()
+
+    def next_retry(self):
+        """
+        Segundos hasta el próximo reintento de un puerto perdido (``None`` si
+        todos están conectados).
+        """
+        pending = [m.retry_at for m in self.monitors if not m.connected]
+        return max(min(pending) - self.clock(), 0.0) if pending else None
+
+    def poll(self, timeout=0):
+        """
+        Espera hasta ``timeout`` segundos (``None``: sin límite) a que algún
+        puerto tenga datos y los procesa. Reintenta los puertos perdidos
+        cuyo plazo venció. Devuelve el número de puertos atendidos.
+        """
+        retry = self.next_retry()
+        if retry is not None and (timeout is None or retry < timeout):
+            timeout = retry
+        events = self.selector.select(timeout)
+        for key, _ in events:
+            self._drain(key.data)
+        if events:
+            self.wakeups += 1
+        if retry is not None:
+            now = self.clock()
+            for monitor in self.monitors:
+                if not monitor.connected and now >= monitor.retry_at:
+                    self._open(monitor)
+        return len(events)
+
+    def changed(self):
+        """
+        Contadoras con algo nuevo que mostrar desde la última llamada.
+        """
+        changed = [m for m in self.monitors if m.changed]
+        for monitor in changed:
+            monitor.changed = False
+        return changed
+
+    def tick(self):
+        """
+        ``counter.tick()`` de todas las contadoras (journal en reposo).
+        """
+        for monitor in self.monitors:
+            monitor.counter.tick()
+
+    @property
+    def total(self):
+        """
+        Total combinado de todas las contadoras.
+        """
+        return sum(m.counter.total_pieces for m in self.monitors)
+
+    def run(self, stop_event, tick_interval=1.0):
+        """
+        Bucle sin GUI hasta que se activa ``stop_event``.
+        """
+        next_tick = self.clock() + tick_interval
+        while not stop_event.is_set():
+            self.poll(min(max(next_tick - self.clock(), 0.0), 0.2))
+            if self.clock() >= next_tick:
+                self.tick()
+                next_tick += tick_interval
+
+    def stats(self):
+        return {monitor.name: monitor.stats() for monitor in self.monitors}
+
+    def close(self):
+        for monitor in self.monitors:
+            if monitor.ser is not None:
+                self.selector.unregister(monitor.ser.fileno())
+                monitor.ser.close()
+                monitor.ser = None
+                monitor.connected = False
+        self.selector.close()
@@ -0,0 +1,151 @@
+"""
+Salidas del modo sin pantalla (``daemon.py``).
+
+Cada salida recibe ``(lectura, total)`` en el hilo lector a través de
+``publish`` y no debe bloquearlo. Formato: una línea JSON por lectura.
+
+Especificaciones aceptadas por ``make_output``:
+- ``stdout``
+- ``file:<ruta>``: anexa al archivo (con buffer, se vacía cada ``flush_interval``)
+- ``socket:<ruta>``: datagramas a un socket Unix local
+- ``socket:<host>:<puerto>``: datagramas UDP (ej. ``socket:127.0.0.1:9750``)
+- ``pubsub:<ruta>`` / ``pubsub:<host>:<puerto>``: servidor de difusión a
+  muchos suscriptores (``core/pubsub.py``), JSON por línea
+- ``pubsub-bin:<destino>``: igual, con registros binarios ``pubsub.RECORD``
+- ``sqlite:<ruta>``: histórico en SQLite con agregados por minuto y hora
+  (``core/store.py``)
+"""
+
+import json
+import logging
+import socket
+import sys
+import time
+
+from core.log import get_logger, log_event
+
+_log = get_logger("outputs")
+
+
+def reading_to_dict(reading, total, timestamp=None):
+    return {
+        "t": round(time.time() if timestamp is None else timestamp, 3),
+        "total": total,
+        "piezas": reading.piezas,
+        "monto": reading.monto,
+        "status": reading.status,
+        "rechazo_sensor": reading.rechazo_sensor,
+    }
+
+
+def encode_json_line(reading, total, timestamp=None):
+    return (json.dumps(reading_to_dict(reading, total, timestamp)) + "\n").encode()
+
+
+class StreamOutput:
+    """
+    Escribe líneas JSON en un archivo binario abierto. Vacía el buffer como
+    mucho cada ``flush_interval`` segundos (0 = en cada lectura).
+    """
+
+    def __init__(self, stream, flush_interval=0.0, close_stream=False, clock=time.monotonic):
+        self.stream = stream
+        self.flush_interval = flush_interval
+        self.close_stream = close_stream
+        self.clock = clock
+        self.written = 0
+        self._last_flush = clock()
+
+    def publish(self, value):
+        reading, total = value
+        self.stream.write(encode_json_line(reading, total))
+        self.written += 1
+        now = self.clock()
+        if now - self._last_flush >= self.flush_interval:
+            self.stream.flush()
+            self._last_flush = now
+
+    def close(self):
+        self.stream.flush()
+        if self.close_stream:
+            self.stream.close()
+
+
+class DatagramOutput:
+    """
+    Envía cada lectura como un datagrama (socket Unix o UDP local). Sin
+    receptor o con su buffer lleno, el datagrama se descarta y se cuenta.
+    """
+
+    def __init__(self, address):
+        family = socket.AF_UNIX if isinstance(address, str) else socket.AF_INET
+        self.address = address
+        self.sock = socket.socket(family, socket.SOCK_DGRAM)
+        self.sock.setblocking(False)
+        self.sent = 0
+        self.dropped = 0
+
+    def publish(self, value):
+        reading, total = value
+        try:
+            self.sock.sendto(encode_json_line(reading, total), self.address)
+            self.sent += 1
+        except OSError:
+            self.dropped += 1  # Nadie escuchando o receptor lento
+
+    def close(self):
+        self.sock.close()
+
+
+def make_output(spec, flush_interval=1.0):
+    """
+    Crea una salida a partir de su especificación (ver docstring del módulo).
+    """
+    kind, _, target = spec.partition(":")
+    if kind == "stdout":
+        return StreamOutput(sys.stdout.buffer, flush_interval=0.0)
+    if kind == "file" and target:
+        return StreamOutput(open(target, "ab"), flush_interval=flush_interval, close_stream=True)
+    if kind == "socket" and target:
+        host, sep, port = target.rpartition(":")
+        if sep and port.isdigit():
+            return DatagramOutput((host, int(port)))
+        return DatagramOutput(target)
+    if kind in ("pubsub", "pubsub-bin") and target:
+        from core.pubsub import FORMAT_BINARY, FORMAT_JSON, ReadingPublisher, parse_address
+
+        fmt = FORMAT_BINARY if kind == "pubsub-bin" else FORMAT_JSON
+        return ReadingPublisher(parse_address(target), fmt=fmt).start()
+    if kind == "sqlite" and target:
+        from core.store import ReadingStore
+
+        return ReadingStore(target).start()
+    raise ValueError(
+        f"Salida desconocida: {spec!r} "
+        "(stdout, file:<ruta>, socket:<destino>, pubsub:<destino>, pubsub-bin:<destino>, "
+        "sqlite:<ruta>)"
+    )
+
+
+class OutputFanout:
+    """
+    Publica en varias salidas; si una falla se registra y se desactiva sin
+    afectar al resto ni al hilo lector.
+    """
+
+    def __init__(self, outputs):
+        self.outputs = list(outputs)
+
+    def publish(self, value):
+        for output in tuple(self.outputs):
+            try:
+                output.publish(value)
+            except Exception as e:
+                log_event(
+                    _log, logging.ERROR, "output_failed", output=type(output).__name__, error=str(e)
+                )
+                self.outputs.remove(output)
+
+    def close(self):
+        for output in self.outputs:
+            output.close()
@@ -0,0 +1,89 @@
+"""
+Control de ritmo para el simulador (envío de paquetes a ritmo fijo).
+
+Los envíos se programan contra plazos absolutos (``t0 + n / rate``) en lugar
+de dormir un ``delay`` fijo tras cada paquete: el tiempo que tarda cada
+``write`` o ``print`` no se acumula y el ritmo medio se mantiene exacto.
+"""
+
+import math
+import time
+
+from protocol.framing import FRAME_LENGTH
+
+# 8N1: 1 bit de inicio + 8 de datos + 1 de parada por byte
+BITS_PER_BYTE = 10
+
+
+def line_capacity_fps(baudrate, frame_length=FRAME_LENGTH):
+    """
+    Paquetes por segundo que caben en la línea (19200 baud ≈ 64 paquetes/s).
+    """
+    return baudrate / BITS_PER_BYTE / frame_length
+
+
+class JitterStats:
+    """
+    Retraso de cada envío respecto a su plazo, con memoria constante.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.max = 0.0
+
+    def add(self, lateness):
+        self.count += 1
+        self.total += lateness
+        self.total_sq += lateness * lateness
+        if lateness > self.max:
+            self.max = lateness
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    @property
+    def stdev(self):
+        if self.count < 2:
+            return 0.0
+        variance = self.total_sq / self.count - self.mean**2
+        return math.sqrt(max(variance, 0.0))
+
+
+class DeadlineScheduler:
+    """
+    Espera hasta el plazo del envío ``n`` a ``rate`` envíos por segundo.
+    Con ``rate`` <= 0 no espera (lo más rápido posible).
+    """
+
+    def __init__(self, rate, clock=time.perf_counter, sleep=time.sleep):
+        self.rate = rate
+        self._clock = clock
+        self._sleep = sleep
+        self.start = clock()
+        self.jitter = JitterStats()
+
+    def wait(self, n):
+        """
+        Bloquea hasta ``start + n / rate`` y registra el retraso respecto al plazo.
+        """
+        if self.rate <= 0:
+            return
+        self.wait_at(n / self.rate)
+
+    def wait_at(self, offset):
+        """
+        Bloquea hasta ``start + offset`` segundos y registra el retraso
+        (reproducción con los tiempos originales de una captura).
+        """
+        deadline = self.start + offset
+        now = self._clock()
+        if deadline > now:
+            self._sleep(deadline - now)
+            now = self._clock()
+        self.jitter.add(now - deadline)
+
+    def elapsed(self):
+        return self._clock() - self.start
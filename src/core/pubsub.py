@@ -0,0 +1,292 @@
+"""
+Difusión local de lecturas a muchos suscriptores (paneles, segunda
+pantalla, registradores).
+
+``ReadingPublisher`` escucha en un socket Unix (ruta) o TCP local
+(``(host, puerto)``) y reenvía cada ``(lectura, total)`` a todos los
+clientes conectados, como JSON por línea o registros binarios de tamaño
+fijo (``RECORD``).
+
+El hilo lector solo codifica una vez y encola en la cola acotada de cada
+suscriptor (``deque(maxlen)``: si está llena se descarta la más antigua);
+nunca toca un socket. Un hilo propio con ``selectors`` acepta clientes y
+escribe en los sockets no bloqueantes, así que un cliente lento solo se
+pierde lecturas y nunca frena al lector ni al resto.
+"""
+
+import logging
+import os
+import selectors
+import socket
+import struct
+import threading
+import time
+from collections import deque
+
+from core.log import get_logger, log_event
+from core.outputs import encode_json_line
+
+FORMAT_JSON = "json"
+FORMAT_BINARY = "binary"
+
+# t (s desde epoch), total, monto, piezas, status, rechazo_sensor
+RECORD = struct.Struct("<dqqH??")
+
+DEFAULT_QUEUE_SIZE = 256
+
+_log = get_logger("pubsub")
+
+
+def encode_record(reading, total, timestamp=None):
+    return RECORD.pack(
+        time.time() if timestamp is None else timestamp,
+        total,
+        reading.monto,
+        reading.piezas,
+        reading.status,
+        reading.rechazo_sensor,
+    )
+
+
+def decode_record(data, offset=0):
+    """
+    Registro binario -> dict con las mismas claves que el formato JSON.
+    """
+    t, total, monto, piezas, status, rechazo = RECORD.unpack_from(data, offset)
+    return {
+        "t": t,
+        "total": total,
+        "piezas": piezas,
+        "monto": monto,
+        "status": status,
+        "rechazo_sensor": rechazo,
+    }
+
+
+def parse_address(target):
+    """
+    ``"/ruta"`` -> ruta de socket Unix; ``"host:puerto"`` -> tupla TCP.
+    """
+    host, sep, port = target.rpartition(":")
+    if sep and port.isdigit():
+        return (host or "127.0.0.1", int(port))
+    return target
+
+
+class _Subscriber:
+    __slots__ = ("sock", "queue", "pending", "dropped", "sent_bytes", "writing")
+
+    def __init__(self, sock, queue_size):
+        self.sock = sock
+        self.queue = deque(maxlen=queue_size)
+        self.pending = None  # memoryview del mensaje enviado a medias
+        self.dropped = 0
+        self.sent_bytes = 0
+        self.writing = False  # Registrado para EVENT_WRITE
+
+
+class ReadingPublisher:
+    """
+    Servidor de difusión. ``publish`` es seguro desde el hilo lector;
+    todo el I/O ocurre en el hilo del publicador (``start``/``close``).
+    """
+
+    def __init__(self, address, fmt=FORMAT_JSON, queue_size=DEFAULT_QUEUE_SIZE):
+        if fmt not in (FORMAT_JSON, FORMAT_BINARY):
+            raise ValueError(f"Formato desconocido: {fmt!r}")
+        self.address = address
+        self.format = fmt
+        self.queue_size = queue_size
+        self._encode = encode_json_line if fmt == FORMAT_JSON else encode_record
+
+        self.published = 0
+        self.dropped_total = 0  # Mensajes descartados por clientes desconectados o lentos
+        self._subscribers = ()  # Copia inmutable: el hilo lector la recorre sin lock
+
+        if isinstance(address, str):
+            if os.path.exists(address):
+                os.unlink(address)  # Socket huérfano de una ejecución anterior
+            self._server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        else:
+            self._server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self._server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._server.bind(address)
+        self._server.listen(128)
+        self._server.setblocking(False)
+        if not isinstance(address, str):
+            self.address = self._server.getsockname()  # Puerto 0 -> puerto asignado
+
+        # Despertador del hilo de I/O cuando hay mensajes nuevos
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._wake_w.setblocking(False)
+        self._wake_pending = False
+
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._server, selectors.EVENT_READ, None)
+        self._selector.register(self._wake_r, selectors.EVENT_READ, None)
+        self._running = False
+        self._thread = None
+
+    @property
+    def subscribers(self):
+        return len(self._subscribers)
+
+    # --- Hilo lector ---
+    def publish(self, value):
+        """
+        Encola ``(lectura, total)`` para todos los suscriptores sin bloquear.
+        """
+        reading, total = value
+        message = self._encode(reading, total)
+        for sub in self._subscribers:
+            queue = sub.queue
+            if len(queue) == queue.maxlen:
+                sub.dropped += 1  # deque(maxlen) descarta la más antigua
+            queue.append(message)
+        self.published += 1
+        if not self._wake_pending:
+            self._wake_pending = True
+            try:
+                self._wake_w.send(b"\0")
+            except (BlockingIOError, OSError):
+                pass  # Ya hay un despertar pendiente en el socket
+
+    # --- Hilo del publicador ---
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._serve, name="pubsub", daemon=True)
+        self._thread.start()
+        return self
+
+    def _serve(self):
+        select = self._selector.select
+        while self._running:
+            for key, events in select(timeout=0.5):
+                obj = key.fileobj
+                if obj is self._server:
+                    self._accept()
+                elif obj is self._wake_r:
+                    self._drain_wake()
+                else:
+                    sub = key.data
+                    if events & selectors.EVENT_READ and not self._check_alive(sub):
+                        continue
+                    if events & selectors.EVENT_WRITE:
+                        self._flush(sub)
+            # Tras un despertar, empezar a escribir a quien tenga cola
+            for sub in self._subscribers:
+                if (sub.queue or sub.pending) and not sub.writing:
+                    self._flush(sub)
+
+    def _accept(self):
+        while True:
+            try:
+                sock, _ = self._server.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            sock.setblocking(False)
+            if sock.family != socket.AF_UNIX:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            sub = _Subscriber(sock, self.queue_size)
+            self._selector.register(sock, selectors.EVENT_READ, sub)
+            self._subscribers = self._subscribers + (sub,)
+            log_event(_log, logging.INFO, "subscriber_connected", subscribers=self.subscribers)
+
+    def _drain_wake(self):
+        try:
+            while self._wake_r.recv(4096):
+                pass
+        except (BlockingIOError, InterruptedError):
+            pass
+        # Después de vaciar: un publish posterior vuelve a despertar, y uno
+        # anterior queda cubierto por el _flush de fin de iteración
+        self._wake_pending = False
+
+    def _check_alive(self, sub):
+        """
+        Los suscriptores no envían datos: leer b"" o un error es desconexión.
+        """
+        try:
+            data = sub.sock.recv(4096)
+        except (BlockingIOError, InterruptedError):
+            return True
+        except OSError:
+            data = b""
+        if not data:
+            self._remove(sub)
+            return False
+        return True
+
+    def _flush(self, sub):
+        """
+        Envía lo posible sin bloquear; si el socket se llena, espera EVENT_WRITE.
+        """
+        queue = sub.queue
+        try:
+            while True:
+                if sub.pending is None:
+                    if not queue:
+                        break
+                    # Agrupar lo encolado en un solo send
+                    sub.pending = memoryview(b"".join([queue.popleft() for _ in range(len(queue))]))
+                sent = sub.sock.send(sub.pending)
+                sub.sent_bytes += sent
+                sub.pending = sub.pending[sent:] if sent < len(sub.pending) else None
+                if sub.pending is not None:
+                    break
+        except (BlockingIOError, InterruptedError):
+            pass
+        except OSError:
+            self._remove(sub)
+            return
+
+        want_write = bool(sub.pending is not None or queue)
+        if want_write != sub.writing:
+            events = selectors.EVENT_READ | (selectors.EVENT_WRITE if want_write else 0)
+            self._selector.modify(sub.sock, events, sub)
+            sub.writing = want_write
+
+    def _remove(self, sub):
+        self._subscribers = tuple(s for s in self._subscribers if s is not sub)
+        self.dropped_total += sub.dropped + len(sub.queue)
+        try:
+            self._selector.unregister(sub.sock)
+        except (KeyError, ValueError):
+            pass
+        sub.sock.close()
+        log_event(
+            _log,
+            logging.INFO,
+            "subscriber_disconnected",
+            subscribers=self.subscribers,
+            dropped=sub.dropped,
+        )
+
+    def stats(self):
+        return {
+            "published": self.published,
+            "subscribers": self.subscribers,
+            "dropped": self.dropped_total + sum(s.dropped for s in self._subscribers),
+        }
+
+    def close(self):
+        self._running = False
+        if self._thread is not None:
+            self._wake_w.send(b"\0")
+            self._thread.join(timeout=2)
+        for sub in self._subscribers:
+            sub.sock.close()
+        self._subscribers = ()
+        self._selector.close()
+        self._server.close()
+        self._wake_r.close()
+        self._wake_w.close()
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            os.unlink(self.address)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,146 @@
+"""
+Ritmo de producción incremental: piezas por segundo y monto por minuto.
+
+``RateEngine`` recibe el total acumulado (salida de ``CumulativeCounter``)
+y el monto de cada lectura, y reparte los incrementos en intervalos fijos
+de ``resolution`` segundos guardados en un anillo preasignado
+(``array('d')``). Al cerrar cada intervalo se actualizan en O(1):
+
+- la suma de cada ventana deslizante (se suma el intervalo que entra y se
+  resta el que sale, sin recorrer el historial);
+- un promedio móvil exponencial (EWMA) de piezas por segundo.
+
+Como trabaja con incrementos del total, recibir solo algunas lecturas (el
+buzón de la GUI descarta las intermedias) no cambia el resultado. Si el
+total o el monto bajan (reinicio de la contadora) el valor nuevo cuenta
+como lo producido desde el reinicio.
+"""
+
+import math
+import time
+from array import array
+
+
+class RateEngine:
+    """
+    ``windows``: duraciones (segundos) de las ventanas deslizantes.
+    ``history``: intervalos cerrados que se conservan para el gráfico.
+    ``ewma_tau``: constante de tiempo (segundos) del promedio exponencial.
+
+    No es seguro entre hilos: se alimenta y se consulta desde el mismo hilo
+    (en la GUI, el hilo de Tk).
+    """
+
+    def __init__(self, windows=(10, 60), resolution=1.0, history=120, ewma_tau=15.0, clock=time.monotonic):
+        self.windows = tuple(windows)
+        self.resolution = resolution
+        self.clock = clock
+        self._window_slots = [max(1, round(w / resolution)) for w in self.windows]
+        self._size = max(self._window_slots + [history]) + 1
+        self._pieces = array("d", bytes(8 * self._size))
+        self._monto = array("d", bytes(8 * self._size))
+        self._sums_pieces = [0.0] * len(self.windows)
+        self._sums_monto = [0.0] * len(self.windows)
+        self._alpha = 1.0 - math.exp(-resolution / ewma_tau)
+        self._ewma_tau = ewma_tau
+
+        self._head = 0  # Intervalo abierto (aún acumulando)
+        self._bucket_end = None
+        self.closed = 0  # Intervalos cerrados desde el inicio
+        self.ewma = 0.0  # Piezas por segundo
+        self._last_total = None
+        self._last_monto = None
+
+    # --- Entrada ---
+    def observe(self, total, monto, now=None):
+        """
+        Registra una lectura (total acumulado de piezas y monto actual).
+        """
+        if now is None:
+            now = self.clock()
+        self.advance(now)
+        if self._last_total is not None:
+            pieces = total - self._last_total if total >= self._last_total else total
+            money = monto - self._last_monto if monto >= self._last_monto else monto
+            self._pieces[self._head] += pieces
+            self._monto[self._head] += money
+        self._last_total = total
+        self._last_monto = monto
+
+    def advance(self, now=None):
+        """
+        Cierra los intervalos vencidos hasta ``now``. Se llama también sin
+        lecturas para que el ritmo caiga a cero si la máquina se detiene.
+        """
+        if now is None:
+            now = self.clock()
+        if self._bucket_end is None:
+            self._bucket_end = now + self.resolution
+            return
+        if now < self._bucket_end:
+            return
+        missed = int((now - self._bucket_end) // self.resolution)
+        if missed >= self._size:
+            # Parada larga: todas las ventanas quedan en cero
+            self._close_bucket()
+            self._clear(missed)
+            return
+        for _ in range(missed + 1):
+            self._close_bucket()
+
+    def _close_bucket(self):
+        closed = self._head
+        pieces = self._pieces[closed]
+        money = self._monto[closed]
+        size = self._size
+        for i, slots in enumerate(self._window_slots):
+            old = (closed - slots) % size
+            self._sums_pieces[i] += pieces - self._pieces[old]
+            self._sums_monto[i] += money - self._monto[old]
+        self.ewma += self._alpha * (pieces / self.resolution - self.ewma)
+
+        self._head = head = (closed + 1) % size
+        self._pieces[head] = 0.0
+        self._monto[head] = 0.0
+        self._bucket_end += self.resolution
+        self.closed += 1
+
+    def _clear(self, missed):
+        for i in range(self._size):
+            self._pieces[i] = 0.0
+            self._monto[i] = 0.0
+        for i in range(len(self.windows)):
+            self._sums_pieces[i] = 0.0
+            self._sums_monto[i] = 0.0
+        self.ewma *= math.exp(-missed * self.resolution / self._ewma_tau)
+        self._bucket_end += missed * self.resolution
+        self.closed += missed
+
+    # --- Consultas ---
+    def _span(self, index):
+        # Al arrancar la ventana aún no está llena: dividir por lo observado
+        return min(self._window_slots[index], max(self.closed, 1)) * self.resolution
+
+    def pieces_per_second(self, window):
+        i = self.windows.index(window)
+        return self._sums_pieces[i] / self._span(i)
+
+    def monto_per_minute(self, window):
+        i = self.windows.index(window)
+        return self._sums_monto[i] / self._span(i) * 60.0
+
+    def history(self, out):
+        """
+        Llena la lista ``out`` (preasignada, reutilizable) con las piezas por
+        segundo de los últimos ``len(out)`` intervalos cerrados, del más
+        antiguo al más reciente.
+        """
+        n = len(out)
+        size = self._size
+        if n >= size:
+            raise ValueError(f"Historial de {size - 1} intervalos, se pidieron {n}")
+        start = self._head - n
+        scale = 1.0 / self.resolution
+        for i in range(n):
+            out[i] = self._pieces[(start + i) % size] * scale
+        return out
@@ -0,0 +1,285 @@
+"""
+Pipeline de lectura del puerto serie, independiente de la interfaz.
+
+``run_reader`` lee en bloque, separa paquetes, omite repeticiones, decodifica,
+actualiza el ``CumulativeCounter`` y entrega cada ``(lectura, total)`` a
+``publish``. Lo usan la GUI (``main.py``, publicando en el buzón) y el modo
+sin pantalla (``daemon.py``, publicando en las salidas configuradas). El
+procesamiento de cada bloque está en ``FramePipeline``, que también usa el
+lector sin hilo de ``gui/tk_reader.py``. Este módulo no importa tkinter.
+"""
+
+import logging
+import time
+
+import serial
+
+from core.log import FRAMES_LOGGER, get_logger, log_event
+from core.metrics import CHUNK_BUCKETS
+from protocol.decoder import FrameDecoder
+from protocol.framing import FrameScanner, RepeatFilter, read_chunk
+
+_log = get_logger("reader")
+_frame_log = logging.getLogger(FRAMES_LOGGER)
+
+# Espera antes de reabrir el puerto tras perder la conexión
+RECONNECT_DELAY = 2.0
+
+
+def open_serial(port, baudrate=19200, timeout=1):
+    """
+    Abre el puerto con la configuración de la contadora (8N1).
+    Lanza ``serial.SerialException`` si no se puede abrir.
+    """
+    ser = serial.Serial(
+        port=port,
+        baudrate=baudrate,
+        bytesize=serial.EIGHTBITS,
+        parity=serial.PARITY_NONE,
+        stopbits=serial.STOPBITS_ONE,
+        timeout=timeout,  # Tiempo de espera para la lectura
+    )
+    log_event(_log, logging.INFO, "port_opened", port=port)
+    return ser
+
+
+class FramePipeline:
+    """
+    Procesa cada bloque leído del puerto: separa paquetes, omite
+    repeticiones, decodifica, actualiza el contador y llama a
+    ``publish((lectura, total))`` por cada lectura nueva. No lee del puerto:
+    lo usan ``run_reader`` (hilo lector) y ``gui/tk_reader.py`` (bucle de Tk).
+
+    Con ``tracer`` (``LatencyTracer``) se marca cada paquete por etapa, con
+    ``frame_ring`` (``FrameRing``) se guardan los últimos paquetes crudos y
+    con ``capture`` (``RawCaptureWriter``) cada bloque leído, tal cual y con
+    su instante de llegada. Los paquetes idénticos al anterior se omiten
+    (ver ``RepeatFilter``).
+
+    Con ``metrics`` (``MetricsRegistry``) se publican sus contadores con las
+    etiquetas ``labels``; ver ``register_metrics``.
+    """
+
+    def __init__(
+        self,
+        counter,
+        publish,
+        tracer=None,
+        frame_ring=None,
+        repeat_filter=None,
+        capture=None,
+        metrics=None,
+        labels=None,
+    ):
+        self.counter = counter
+        self.publish = publish
+        self.tracer = tracer
+        self.frame_ring = frame_ring
+        self.capture = capture
+        # Framer incremental: lee en bloque y separa los paquetes completos
+        self.scanner = FrameScanner()
+        # Decodificador con validación de checksum (descarta paquetes inválidos)
+        self.decoder = FrameDecoder()
+        # Repeticiones exactas del paquete anterior (contadora en reposo)
+        self.repeat_filter = repeat_filter if repeat_filter is not None else RepeatFilter()
+        self._chunk_sizes = None
+        self._port_losses = None
+        if metrics is not None:
+            self.register_metrics(metrics, labels)
+
+    def register_metrics(self, registry, labels=None):
+        """
+        Registra las métricas del pipeline y de su contador en ``registry``.
+        Casi todas se leen al exponer de los contadores que ya existen
+        (paquetes, bytes descartados, errores, eventos del contador); por
+        bloque solo se anota su tamaño en un histograma, que muestra cuánto
+        se acumula en el buffer del puerto entre lecturas.
+        """
+        scanner, decoder, repeats, counter = (
+            self.scanner, self.decoder, self.repeat_filter, self.counter
+        )
+        functions = [
+            ("frames_total", "Paquetes completos separados del flujo", lambda: scanner.frames),
+            ("discarded_bytes_total", "Bytes descartados al resincronizar",
+             lambda: scanner.discarded_bytes),
+            ("decoded_total", "Lecturas decodificadas (sin repeticiones)", lambda: decoder.decoded),
+            ("checksum_errors_total", "Paquetes con checksum inválido",
+             lambda: decoder.checksum_errors),
+            ("malformed_total", "Paquetes con formato inválido", lambda: decoder.malformed),
+            ("repeats_total", "Paquetes idénticos al anterior omitidos",
+             lambda: repeats.skipped),
+        ]
+        for name, help, function in functions:
+            registry.counter(name, help, labels, function=function)
+        registry.gauge("partial_frame_bytes", "Bytes de un paquete a medias en el buffer",
+                       labels, function=lambda: len(scanner.buffer))
+        registry.gauge("total_pieces", "Total acumulado de piezas", labels,
+                       function=lambda: counter.total_pieces)
+        for event in counter.events:
+            registry.counter("counter_events_total", "Transiciones del contador por tipo",
+                             {**(labels or {}), "event": event},
+                             function=lambda event=event: counter.events[event])
+        self._chunk_sizes = registry.histogram(
+            "read_chunk_bytes", "Bytes por lectura del puerto", CHUNK_BUCKETS, labels
+        )
+        self._port_losses = registry.counter("port_losses_total", "Puerto perdido", labels)
+
+    def feed(self, chunk):
+        counter = self.counter
+        publish = self.publish
+        tracer = self.tracer
+        frame_ring = self.frame_ring
+        scanner = self.scanner
+        decode = self.decoder.decode
+        is_new = self.repeat_filter.is_new
+
+        if self.capture is not None:
+            self.capture.write(chunk)
+        if self._chunk_sizes is not None:
+            self._chunk_sizes.observe(len(chunk))
+        if tracer is not None:
+            tracer.chunk_read(bool(scanner.buffer))
+        frames = scanner.feed(chunk)
+        if tracer is not None:
+            tracer.chunk_framed(bool(scanner.buffer), len(frames))
+
+        # Depuración por paquete: desactivada salvo "uwf.frames" en DEBUG
+        frame_debug = _frame_log.isEnabledFor(logging.DEBUG)
+
+        for frame in frames:
+            if tracer is not None:
+                t_stx = tracer.next_stx()
+            if frame_ring is not None:
+                frame_ring.record(frame)
+            if not is_new(frame):
+                continue  # Misma lectura que la ya mostrada: nada que hacer
+            reading = decode(frame)
+            if frame_debug:
+                log_event(_frame_log, logging.DEBUG, "frame", raw=frame.hex(), reading=reading)
+            if reading is None:
+                continue  # Checksum o formato inválido: no se muestra
+            if tracer is not None:
+                tracer.decoded()
+
+            # Actualizar el contador acumulativo
+            piezas_acumuladas = counter.update(reading)
+
+            # Publicar (la GUI solo muestra la última lectura)
+            value = (reading, piezas_acumuladas)
+            if tracer is not None:
+                tracer.counted(value, t_stx)
+            publish(value)
+
+        # Las repeticiones omitidas no pasan por update(): el journal
+        # sigue sincronizando aunque la máquina esté en reposo
+        counter.tick()
+
+    def reset(self):
+        """
+        Descarta el paquete a medias y la última lectura (puerto perdido).
+        """
+        self.scanner.reset()
+        self.repeat_filter.reset()  # La última lectura ya no está a la vista
+        if self._port_losses is not None:
+            self._port_losses.inc()
+
+    def stats(self):
+        scanner, decoder = self.scanner, self.decoder
+        return {
+            "frames": scanner.frames,
+            "discarded_bytes": scanner.discarded_bytes,
+            "decoded": decoder.decoded,
+            "checksum_errors": decoder.checksum_errors,
+            "malformed": decoder.malformed,
+            **self.repeat_filter.stats(),
+        }
+
+
+def run_reader(
+    ser,
+    counter,
+    publish,
+    on_connection_lost=None,
+    tracer=None,
+    frame_ring=None,
+    repeat_filter=None,
+    stop_event=None,
+    reconnect_delay=RECONNECT_DELAY,
+    reconnector=None,
+    capture=None,
+    metrics=None,
+    initial=b"",
+):
+    """
+    Procesa el puerto ``ser`` hasta que se activa ``stop_event`` (o para
+    siempre si es ``None``). Devuelve un dict con las estadísticas finales.
+
+    ``publish((lectura, total))`` se llama en este hilo por cada lectura
+    nueva y no debe bloquear. ``on_connection_lost()`` se llama al perder
+    el puerto, antes de reintentar abrirlo. ``tracer``, ``frame_ring``,
+    ``repeat_filter``, ``capture`` y ``metrics`` son los de ``FramePipeline``;
+    con ``metrics`` también se publican los de ``reconnector``
+    (``ReconnectManager.register_metrics``).
+
+    Con ``reconnector`` (``ReconnectManager``) se reabre el mismo puerto con
+    espera exponencial (y, si se activó su búsqueda, se busca el adaptador
+    con otro nombre); sin él se reabre ``ser`` cada ``reconnect_delay``
+    segundos. Si se cambia de puerto, el nuevo se cierra al terminar (el
+    original sigue siendo del llamador). ``initial``: bytes ya leídos de
+    ``ser`` (ver ``ReconnectManager.attempt``), se procesan antes de leer.
+    """
+    pipeline = FramePipeline(
+        counter, publish, tracer, frame_ring, repeat_filter, capture, metrics
+    )
+    if metrics is not None and reconnector is not None:
+        reconnector.register_metrics(metrics)
+    feed = pipeline.feed
+    stopped = stop_event.is_set if stop_event is not None else lambda: False
+    wait = stop_event.wait if stop_event is not None else time.sleep
+    original = ser
+    if initial:
+        feed(initial)
+
+    while not stopped():
+        try:
+            chunk = read_chunk(ser)
+            if not chunk:
+                counter.tick()
+                continue  # Si no hay datos, vuelve a intentar
+            feed(chunk)
+
+        except (serial.SerialException, OSError):
+            # Al desconectar el adaptador, in_waiting (ioctl) puede fallar con
+            # OSError (EIO) en lugar de SerialException
+            lost_at = time.monotonic()
+            log_event(_log, logging.WARNING, "port_lost")
+            if on_connection_lost is not None:
+                on_connection_lost()
+            ser.close()
+            pipeline.reset()
+            if reconnector is not None:
+                found = reconnector.reconnect(ser.port, lost_at, wait=wait, stopped=stopped)
+                if found is None:
+                    break  # Apagado durante la búsqueda
+                ser, initial = found
+                if initial:
+                    feed(initial)  # Lo leído al probar el puerto
+                continue
+            if wait(reconnect_delay):
+                break  # Apagado durante la espera
+            try:
+                ser.open()
+                log_event(_log, logging.INFO, "port_reopened", port=ser.port)
+            except serial.SerialException as e:
+                log_event(_log, logging.ERROR, "port_reopen_failed", error=str(e))
+                wait(reconnect_delay)
+        except Exception:
+            _log.exception("unexpected_error")
+            pipeline.scanner.reset()
+
+    if ser is not original:
+        ser.close()
+    return {
+        **pipeline.stats(),
+        **(reconnector.stats() if reconnector is not None else {}),
+    }
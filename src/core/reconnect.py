@@ -0,0 +1,352 @@
+"""
+Reconexión rápida tras desconectar el adaptador USB-serie.
+
+En vez de esperar un tiempo fijo, ``ReconnectManager``:
+
+- reintenta con espera exponencial con jitter (``Backoff``), empezando en
+  decenas de milisegundos;
+- en cada intento reabre primero, y solo, el último puerto usado (o el
+  configurado, ``config.get_viewer_port()``): en una planta con varias
+  contadoras, el puerto con tráfico más cercano puede ser el de otra
+  máquina y sus piezas no deben sumarse a este contador;
+- solo con ``search=True`` (``RECONNECT_CONFIG["search"]``), si ese puerto no
+  abre, busca el adaptador con otro nombre entre los dispositivos de ``/dev``
+  y ``/tmp`` (``DEFAULT_PATTERNS``): los abre a la vez y se queda con el
+  primero que entrega un paquete válido (STX/ETX con checksum correcto). Lo
+  leído de ese puerto durante la prueba se devuelve para procesarlo.
+
+Los puertos se abren en modo exclusivo (``flock`` en POSIX): nunca se leen
+bytes de un puerto que ya tiene abierto otro visor.
+
+El tiempo hasta recuperar cada desconexión queda en ``stats()`` y en el
+evento ``port_recovered`` del log.
+"""
+
+import glob
+import logging
+import os
+import random
+import selectors
+import time
+
+import serial
+
+from core.log import get_logger, log_event
+from protocol.decoder import FrameDecoder
+from protocol.framing import READ_CHUNK_SIZE, FrameScanner
+
+_log = get_logger("reconnect")
+
+# Dispositivos donde puede reaparecer el adaptador o el puerto virtual
+DEFAULT_PATTERNS = (
+    "/dev/serial/by-id/*",
+    "/dev/ttyUSB*",
+    "/dev/ttyACM*",
+    "/tmp/COM*",
+)
+
+
+class Backoff:
+    """
+    Espera exponencial con jitter: ``initial * factor**n`` acotada a
+    ``maximum``, escalada por un factor aleatorio en ``[1 - jitter, 1]``
+    para que varios visores no reintenten al unísono.
+    """
+
+    def __init__(self, initial=0.05, maximum=1.0, factor=2.0, jitter=0.5, rng=random.random):
+        self.initial = initial
+        self.maximum = maximum
+        self.factor = factor
+        self.jitter = jitter
+        self.rng = rng
+        self.attempts = 0
+
+    def next(self):
+        delay = min(self.maximum, self.initial * self.factor**self.attempts)
+        self.attempts += 1
+        return delay * (1.0 - self.jitter * self.rng())
+
+    def reset(self):
+        self.attempts = 0
+
+
+def discover_ports(patterns=DEFAULT_PATTERNS):
+    """
+    Rutas existentes que coinciden con ``patterns``, en orden estable.
+    """
+    found = []
+    for pattern in patterns:
+        found.extend(sorted(glob.glob(pattern)))
+    return found
+
+
+def open_exclusive(port, baudrate=19200, timeout=0):
+    """
+    Abre ``port`` (8N1) sin compartirlo con otros procesos que lo abran igual.
+    """
+    return serial.Serial(port, baudrate=baudrate, timeout=timeout, exclusive=True)
+
+
+class PortProbe:
+    """
+    Prueba varios puertos a la vez sin bloquear: ``poll(timeout)`` lee lo
+    disponible y devuelve ``(puerto, Serial abierto, bytes leídos)`` del
+    primero con un paquete válido; ``expired`` indica que pasó ``timeout``
+    (o que no queda ninguno). ``close()`` cierra los no elegidos.
+    """
+
+    def __init__(self, ports, baudrate=19200, timeout=0.3, clock=time.monotonic):
+        self.selector = selectors.DefaultSelector()
+        self.opened = []
+        self.decoder = FrameDecoder()
+        self.clock = clock
+        self.deadline = clock() + timeout
+        for port in ports:
+            try:
+                ser = open_exclusive(port, baudrate)
+            except (serial.SerialException, OSError, ValueError):
+                continue  # Inexistente o ya abierto por otro proceso
+            self.opened.append(ser)
+            self.selector.register(
+                ser.fileno(), selectors.EVENT_READ, (port, ser, FrameScanner(), bytearray())
+            )
+
+    @property
+    def expired(self):
+        return not self.opened or self.clock() >= self.deadline
+
+    def poll(self, timeout=0):
+        timeout = max(0.0, min(timeout, self.deadline - self.clock()))
+        for key, _ in self.selector.select(timeout):
+            port, ser, scanner, data = key.data
+            try:
+                chunk = ser.read(READ_CHUNK_SIZE)
+            except (serial.SerialException, OSError):
+                self.selector.unregister(key.fd)  # Desapareció mientras se probaba
+                self.opened.remove(ser)
+                ser.close()
+                continue
+            data += chunk
+            if any(self.decoder.decode(frame) is not None for frame in scanner.feed(chunk)):
+                self.opened.remove(ser)
+                self.close()
+                return port, ser, bytes(data)
+        return None
+
+    def close(self):
+        self.selector.close()
+        for ser in self.opened:
+            ser.close()
+        self.opened = []
+
+
+def probe_ports(ports, baudrate=19200, timeout=0.3):
+    """
+    Abre todos los ``ports`` a la vez y espera hasta ``timeout`` segundos
+    el primer paquete válido en cualquiera de ellos (``selectors``: los
+    puertos mudos no suman espera). Devuelve ``(puerto, Serial abierto,
+    bytes leídos)`` o ``None``; los demás puertos se cierran.
+    """
+    probe = PortProbe(ports, baudrate, timeout)
+    try:
+        while not probe.expired:
+            found = probe.poll(probe.deadline - probe.clock())
+            if found is not None:
+                return found
+        return None
+    finally:
+        probe.close()
+
+
+class ReconnectAttempt:
+    """
+    Un intento de ``ReconnectManager`` paso a paso, para bucles de eventos:
+    ``step(timeout)`` devuelve ``(Serial, bytes leídos)`` al encontrar el
+    puerto o ``None``; ``done`` indica que el intento terminó (con o sin
+    puerto). Al crearlo se reabre el puerto propio, que no espera tráfico.
+    """
+
+    def __init__(self, manager, last_port=None, lost_at=None):
+        self.manager = manager
+        self.lost_at = lost_at
+        self.result = None
+        self.probe = None
+        manager.attempts += 1
+        port = last_port or manager.preferred()
+        try:
+            self._found(port, open_exclusive(port, manager.baudrate, manager.timeout), b"")
+            return
+        except (serial.SerialException, OSError, ValueError):
+            pass
+        if manager.search:
+            others = [p for p in manager.candidates(port) if p != port]
+            self.probe = PortProbe(others, manager.baudrate, manager.probe_timeout, manager.clock)
+
+    @property
+    def done(self):
+        return self.result is not None or self.probe is None or self.probe.expired
+
+    def step(self, timeout=0):
+        if self.result is None and self.probe is not None:
+            found = self.probe.poll(timeout)
+            if found is not None:
+                port, ser, data = found
+                ser.timeout = self.manager.timeout
+                self._found(port, ser, data)
+        return self.result
+
+    def _found(self, port, ser, data):
+        self.result = (ser, data)
+        if self.lost_at is not None:
+            self.manager._recovered(port, self.manager.clock() - self.lost_at)
+
+    def close(self):
+        """
+        Abandona el intento (los puertos en prueba se cierran).
+        """
+        if self.probe is not None:
+            self.probe.close()
+
+
+class ReconnectManager:
+    """
+    Busca y abre un puerto con tráfico válido tras perder la conexión.
+
+    ``preferred``: función que devuelve el puerto configurado (por defecto
+    ``config.get_viewer_port``, consultada en cada intento). Con ``search``
+    se buscan otros puertos cuando el propio no abre.
+    """
+
+    def __init__(
+        self,
+        baudrate=19200,
+        timeout=1,
+        patterns=DEFAULT_PATTERNS,
+        preferred=None,
+        backoff=None,
+        probe_timeout=0.3,
+        clock=time.monotonic,
+        search=False,
+    ):
+        if preferred is None:
+            from config import get_viewer_port as preferred
+        self.baudrate = baudrate
+        self.timeout = timeout
+        self.patterns = patterns
+        self.preferred = preferred
+        self.backoff = backoff or Backoff()
+        self.probe_timeout = probe_timeout
+        self.clock = clock
+        self.search = search
+
+        self.recoveries = 0
+        self.attempts = 0
+        self.last_downtime = None
+        self.max_downtime = 0.0
+        self.total_downtime = 0.0
+
+    def candidates(self, last_port=None):
+        ports = [last_port, self.preferred(), *discover_ports(self.patterns)]
+        seen = set()
+        ordered = []
+        for port in ports:
+            if port and port not in seen and os.path.exists(port):
+                seen.add(port)
+                ordered.append(port)
+        return ordered
+
+    def reconnect(self, last_port=None, lost_at=None, wait=time.sleep, stopped=lambda: False):
+        """
+        Reintenta hasta abrir un puerto y devuelve ``(Serial, bytes leídos)``,
+        o ``None`` si ``stopped()`` se activa antes. ``wait(segundos)``
+        espera entre intentos y devuelve ``True`` si hay que detenerse.
+        """
+        if lost_at is None:
+            lost_at = self.clock()
+        self.backoff.reset()
+        while not stopped():
+            found = self.attempt(last_port, lost_at)
+            if found is not None:
+                return found
+            if wait(self.backoff.next()):
+                break
+        return None
+
+    def begin(self, last_port=None, lost_at=None):
+        """
+        Empieza un intento sin bloquear (``ReconnectAttempt``). Para
+        reintentar desde un bucle de eventos, esperar ``backoff.next()``
+        entre intentos (``backoff.reset()`` al empezar).
+        """
+        return ReconnectAttempt(self, last_port, lost_at)
+
+    def attempt(self, last_port=None, lost_at=None):
+        """
+        Un solo intento: ``(Serial, bytes leídos)`` o ``None``. Con ``search``
+        puede bloquear hasta ``probe_timeout``.
+        """
+        attempt = self.begin(last_port, lost_at)
+        try:
+            while not attempt.done:
+                attempt.step(self.probe_timeout)
+            return attempt.result
+        finally:
+            attempt.close()
+
+    def _recovered(self, port, downtime):
+        self.recoveries += 1
+        self.last_downtime = downtime
+        self.max_downtime = max(self.max_downtime, downtime)
+        self.total_downtime += downtime
+        log_event(
+            _log,
+            logging.INFO,
+            "port_recovered",
+            port=port,
+            downtime_s=round(downtime, 3),
+            attempts=self.backoff.attempts + 1,
+        )
+
+    def register_metrics(self, registry, labels=None):
+        """
+        Publica en ``registry`` los intentos, las reconexiones y cuánto
+        tardaron (se leen al exponer; ``0`` antes de la primera).
+        """
+        functions = [
+            ("counter", "reconnect_attempts_total", "Intentos de reapertura del puerto",
+             lambda: self.attempts),
+            ("counter", "reconnect_recoveries_total", "Reconexiones logradas",
+             lambda: self.recoveries),
+            ("gauge", "reconnect_last_downtime_seconds", "Duración del último corte",
+             lambda: self.last_downtime or 0.0),
+            ("gauge", "reconnect_max_downtime_seconds", "Corte más largo",
+             lambda: self.max_downtime),
+            ("counter", "reconnect_downtime_seconds_total", "Tiempo total sin puerto",
+             lambda: self.total_downtime),
+        ]
+        for kind, name, help, function in functions:
+            getattr(registry, kind)(name, help, labels, function=function)
+
+    def stats(self):
+        return {
+            "recoveries": self.recoveries,
+            "reconnect_attempts": self.attempts,
+            "last_downtime_s": self.last_downtime,
+            "max_downtime_s": self.max_downtime,
+            "mean_downtime_s": self.total_downtime / self.recoveries if self.recoveries else None,
+        }
+
+
+def make_reconnector(
+    baudrate=19200, timeout=1, initial_delay=0.05, max_delay=1.0, probe_timeout=0.3, search=False
+):
+    """
+    ``ReconnectManager`` a partir de ``config.RECONNECT_CONFIG``.
+    """
+    return ReconnectManager(
+        baudrate=baudrate,
+        timeout=timeout,
+        backoff=Backoff(initial=initial_delay, maximum=max_delay),
+        probe_timeout=probe_timeout,
+        search=search,
+    )
@@ -0,0 +1,273 @@
+"""
+Histórico de lecturas en SQLite con agregados por minuto y por hora.
+
+``ReadingStore`` es una salida más del lector (``publish((lectura, total))``):
+el hilo lector solo encola la lectura con su marca de tiempo y un hilo
+propio la escribe en lotes, una transacción por lote, con la base en modo
+WAL. En la misma transacción se actualizan las tablas ``rollup_minute`` y
+``rollup_hour``, así que consultas como "piezas contadas en el turno" leen
+unas decenas de filas agregadas en lugar de recorrer todas las lecturas.
+
+Las piezas de cada intervalo son la suma de los incrementos del total
+acumulado. Si el total baja (reinicio manual o suave del contador), el
+nuevo total son las piezas contadas desde el reinicio.
+"""
+
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from pathlib import Path
+
+from core.log import get_logger, log_event
+
+MINUTE = 60
+HOUR = 3600
+
+_log = get_logger("store")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS readings (
+    t REAL NOT NULL,
+    monto INTEGER NOT NULL,
+    piezas INTEGER NOT NULL,
+    total INTEGER NOT NULL,
+    status INTEGER NOT NULL,
+    rechazo_sensor INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS readings_t ON readings (t);
+"""
+
+_ROLLUP_SCHEMA = """
+CREATE TABLE IF NOT EXISTS {table} (
+    bucket INTEGER PRIMARY KEY,  -- Inicio del intervalo (segundos desde epoch)
+    readings INTEGER NOT NULL,
+    pieces INTEGER NOT NULL,
+    resets INTEGER NOT NULL,
+    first_total INTEGER NOT NULL,
+    last_total INTEGER NOT NULL,
+    last_monto INTEGER NOT NULL
+);
+"""
+
+_ROLLUP_UPSERT = """
+INSERT INTO {table} (bucket, readings, pieces, resets, first_total, last_total, last_monto)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (bucket) DO UPDATE SET
+    readings = readings + excluded.readings,
+    pieces = pieces + excluded.pieces,
+    resets = resets + excluded.resets,
+    last_total = excluded.last_total,
+    last_monto = excluded.last_monto
+"""
+
+ROLLUP_TABLES = {MINUTE: "rollup_minute", HOUR: "rollup_hour"}
+
+_STOP = object()
+
+
+def connect(path):
+    """
+    Abre (o crea) la base con el esquema y en modo WAL.
+    """
+    conn = sqlite3.connect(str(path), check_same_thread=False)  # Se usa en el hilo escritor
+    conn.execute("PRAGMA journal_mode=WAL")
+    # Con WAL, NORMAL no pierde consistencia; solo las últimas transacciones
+    # ante un corte de energía (el total sigue a salvo en core/journal.py)
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(_SCHEMA)
+    for table in ROLLUP_TABLES.values():
+        conn.executescript(_ROLLUP_SCHEMA.format(table=table))
+    return conn
+
+
+def _aggregate(rows, width, last_total):
+    """
+    Agrupa filas ``(t, monto, piezas, total, ...)`` en intervalos de
+    ``width`` segundos. Devuelve ``(filas para el upsert, último total)``.
+    """
+    buckets = {}
+    for t, monto, _, total, _, _ in rows:
+        bucket = int(t // width) * width
+        if last_total is None:
+            pieces, reset = 0, 0  # Primera lectura de la base: solo referencia
+        elif total >= last_total:
+            pieces, reset = total - last_total, 0
+        else:
+            pieces, reset = total, 1  # Reinicio del contador
+        agg = buckets.get(bucket)
+        if agg is None:
+            buckets[bucket] = [bucket, 1, pieces, reset, total, total, monto]
+        else:
+            agg[1] += 1
+            agg[2] += pieces
+            agg[3] += reset
+            agg[5] = total
+            agg[6] = monto
+        last_total = total
+    return list(buckets.values()), last_total
+
+
+class ReadingStore:
+    """
+    Escritor en segundo plano. ``publish`` es seguro desde el hilo lector y
+    nunca espera al disco; si la cola se llena (disco bloqueado) la lectura
+    se descarta y se cuenta en ``dropped``.
+
+    ``batch_size`` / ``flush_interval``: una transacción cada tantas
+    lecturas o cada tantos segundos, lo que ocurra primero.
+    """
+
+    def __init__(self, path, batch_size=500, flush_interval=1.0, queue_size=100000, clock=time.time):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.clock = clock
+
+        self.written = 0
+        self.dropped = 0
+        self.batches = 0
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._conn = connect(self.path)
+        row = self._conn.execute(
+            "SELECT total FROM readings ORDER BY rowid DESC LIMIT 1"
+        ).fetchone()
+        self._last_total = row[0] if row else None
+        self._thread = None
+
+    # --- Hilo lector ---
+    def publish(self, value):
+        reading, total = value
+        try:
+            self._queue.put_nowait(
+                (
+                    self.clock(),
+                    reading.monto,
+                    reading.piezas,
+                    total,
+                    reading.status,
+                    reading.rechazo_sensor,
+                )
+            )
+        except queue.Full:
+            self.dropped += 1
+
+    # --- Hilo escritor ---
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="store", daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        get = self._queue.get
+        while True:
+            batch = [get()]
+            deadline = time.monotonic() + self.flush_interval
+            stop = batch[0] is _STOP
+            while not stop and len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    row = get(timeout=timeout)
+                except queue.Empty:
+                    break
+                stop = row is _STOP
+                batch.append(row)
+            if stop:
+                batch = [row for row in batch if row is not _STOP]
+            if batch:
+                try:
+                    self.write_batch(batch)
+                except sqlite3.Error as e:
+                    log_event(_log, logging.ERROR, "store_write_failed", rows=len(batch), error=str(e))
+            if stop:
+                return
+
+    def write_batch(self, rows):
+        """
+        Inserta ``rows`` y actualiza los agregados en una sola transacción.
+        """
+        last_total = self._last_total
+        with self._conn:
+            self._conn.executemany("INSERT INTO readings VALUES (?, ?, ?, ?, ?, ?)", rows)
+            for width, table in ROLLUP_TABLES.items():
+                buckets, last = _aggregate(rows, width, last_total)
+                self._conn.executemany(_ROLLUP_UPSERT.format(table=table), buckets)
+        self._last_total = last
+        self.written += len(rows)
+        self.batches += 1
+
+    # --- Consultas ---
+    def pieces_between(self, start, end):
+        """
+        Piezas contadas en ``[start, end)`` (segundos desde epoch) usando los
+        agregados: horas completas de ``rollup_hour`` y los minutos de los
+        extremos de ``rollup_minute``. Resolución de un minuto.
+        """
+        with closing(self._reader()) as conn:
+            return pieces_between(conn, start, end)
+
+    def rollups(self, start, end, width=MINUTE):
+        with closing(self._reader()) as conn:
+            return rollups(conn, start, end, width)
+
+    def _reader(self):
+        # Conexión propia por consulta: con WAL las lecturas no bloquean al escritor
+        return sqlite3.connect(str(self.path))
+
+    def stats(self):
+        return {
+            "written": self.written,
+            "batches": self.batches,
+            "dropped": self.dropped,
+            "queued": self._queue.qsize(),
+        }
+
+    def close(self):
+        """
+        Escribe lo pendiente y cierra la base.
+        """
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join()
+            self._thread = None
+        self._conn.close()
+
+
+def _sum_pieces(conn, table, start, end):
+    row = conn.execute(
+        f"SELECT COALESCE(SUM(pieces), 0) FROM {table} WHERE bucket >= ? AND bucket < ?",
+        (start, end),
+    ).fetchone()
+    return row[0]
+
+
+def pieces_between(conn, start, end):
+    start = int(start // MINUTE) * MINUTE
+    end = -int(-end // MINUTE) * MINUTE  # Redondeo hacia arriba al minuto
+    first_hour = -(-start // HOUR) * HOUR
+    last_hour = end // HOUR * HOUR
+    if first_hour >= last_hour:
+        return _sum_pieces(conn, ROLLUP_TABLES[MINUTE], start, end)
+    return (
+        _sum_pieces(conn, ROLLUP_TABLES[MINUTE], start, first_hour)
+        + _sum_pieces(conn, ROLLUP_TABLES[HOUR], first_hour, last_hour)
+        + _sum_pieces(conn, ROLLUP_TABLES[MINUTE], last_hour, end)
+    )
+
+
+def rollups(conn, start, end, width=MINUTE):
+    """
+    Filas agregadas de ``[start, end)`` como dicts, en orden temporal.
+    """
+    cursor = conn.execute(
+        f"SELECT * FROM {ROLLUP_TABLES[width]} WHERE bucket >= ? AND bucket < ? ORDER BY bucket",
+        (start, end),
+    )
+    columns = [c[0] for c in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor]
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Modo sin pantalla: el mismo pipeline de lectura que ``main.py`` (ver
+``core/reader.py``) como servicio, sin importar tkinter. Cada lectura nueva
+se entrega a las salidas configuradas como una línea JSON.
+
+Se detiene limpiamente con SIGTERM o Ctrl+C: termina la lectura en curso,
+vacía las salidas y escribe el snapshot final del contador.
+
+Uso:
+    python daemon.py [--port /dev/ttyUSB0] [--output stdout]
+        [--output file:lecturas.jsonl] [--output socket:/tmp/uwf.sock]
+        [--output sqlite:lecturas.sqlite3] [--capture capturas/]
+        [--metrics-port 9752] [--metrics-textfile /var/lib/node_exporter/uwf.prom]
+"""
+
+import argparse
+import logging
+import signal
+import sys
+import threading
+from pathlib import Path
+
+from config import (
+    COUNTER_JOURNAL_CONFIG,
+    FRAME_RING_CONFIG,
+    LATENCY_CONFIG,
+    LOGGING_CONFIG,
+    METRICS_CONFIG,
+    RAW_CAPTURE_CONFIG,
+    RECONNECT_CONFIG,
+    SERIAL_CONFIG,
+    get_viewer_port,
+)
+from core.counter import CumulativeCounter
+from core.frame_ring import FrameRing
+from core.journal import CounterJournal
+from core.latency import LatencyTracer
+from core.log import get_logger, log_event, setup_logging
+from core.metrics import MetricsRegistry, start_exporters
+from core.outputs import OutputFanout, make_output
+from core.reader import run_reader
+from core.reconnect import make_reconnector
+from protocol.raw_capture import open_session
+
+_log = get_logger("daemon")
+
+
+def run(
+    port,
+    baudrate,
+    outputs,
+    stop_event,
+    state_dir=None,
+    tracer=None,
+    ready_event=None,
+    capture_dir=None,
+    metrics=None,
+):
+    """
+    Lee ``port`` hasta que se activa ``stop_event`` publicando en
+    ``outputs`` (lista de salidas de ``core.outputs``). El puerto se abre
+    como en una reconexión: si no está, se reintenta hasta que aparece o se
+    activa ``stop_event``. ``ready_event`` se activa con el puerto ya
+    abierto. Con ``capture_dir`` se guarda una captura cruda ``.uwfraw`` de
+    la sesión y con ``metrics`` (``MetricsRegistry``) se publican los
+    contadores del lector. Devuelve el código de salida del proceso.
+    """
+    journal_config = dict(COUNTER_JOURNAL_CONFIG)
+    ring_path = FRAME_RING_CONFIG["path"]
+    if state_dir is not None:
+        journal_config["state_dir"] = state_dir
+        ring_path = Path(state_dir) / ring_path.name
+
+    counter = CumulativeCounter(journal=CounterJournal(**journal_config))
+    log_event(_log, logging.INFO, "counter_restored", total=counter.total_pieces)
+    fanout = OutputFanout(outputs)
+    frame_ring = FrameRing(ring_path, FRAME_RING_CONFIG["slots"])
+    capture = None
+    if capture_dir is not None:
+        capture = open_session(capture_dir, flush_interval=RAW_CAPTURE_CONFIG["flush_interval"])
+        log_event(_log, logging.INFO, "raw_capture_opened", path=capture.path)
+    reconnector = make_reconnector(baudrate, SERIAL_CONFIG["timeout"], **RECONNECT_CONFIG)
+    try:
+        # Como una reconexión: sin el adaptador se espera a que aparezca
+        found = reconnector.attempt(port)
+        if found is None:
+            log_event(_log, logging.WARNING, "port_open_failed", port=port)
+            found = reconnector.reconnect(port, wait=stop_event.wait, stopped=stop_event.is_set)
+            if found is None:
+                return 0  # Detenido antes de abrir el puerto
+        ser, initial = found
+        if ready_event is not None:
+            ready_event.set()
+        try:
+            stats = run_reader(
+                ser,
+                counter,
+                fanout.publish,
+                tracer=tracer,
+                frame_ring=frame_ring,
+                stop_event=stop_event,
+                reconnector=reconnector,
+                capture=capture,
+                metrics=metrics,
+                initial=initial,
+            )
+        finally:
+            ser.close()
+        log_event(_log, logging.INFO, "reader_stopped", total=counter.total_pieces, **stats)
+        return 0
+    finally:
+        fanout.close()
+        frame_ring.close()
+        if capture is not None:
+            capture.close()
+        counter.journal.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Visor de la contadora sin pantalla")
+    parser.add_argument("--port", default=get_viewer_port())
+    parser.add_argument("--baudrate", type=int, default=SERIAL_CONFIG["baudrate"])
+    parser.add_argument(
+        "--output",
+        action="append",
+        dest="outputs",
+        help="stdout, file:<ruta>, socket:<destino>, pubsub:<destino> o sqlite:<ruta> (repetible)",
+    )
+    parser.add_argument("--state-dir", type=Path, default=None)
+    parser.add_argument(
+        "--capture",
+        type=Path,
+        nargs="?",
+        const=RAW_CAPTURE_CONFIG["dir"],
+        default=RAW_CAPTURE_CONFIG["dir"] if RAW_CAPTURE_CONFIG["enabled"] else None,
+        help="Guardar lo leído del puerto, con tiempos, en un .uwfraw en este directorio",
+    )
+    metrics_port = METRICS_CONFIG["address"][1] if METRICS_CONFIG["address"] else None
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=metrics_port if METRICS_CONFIG["enabled"] else None,
+        help="Exponer métricas Prometheus en http://127.0.0.1:<puerto>/metrics",
+    )
+    parser.add_argument(
+        "--metrics-textfile",
+        type=Path,
+        default=METRICS_CONFIG["textfile"] if METRICS_CONFIG["enabled"] else None,
+        help="Escribir las métricas en este archivo .prom (textfile collector)",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        outputs = [make_output(spec) for spec in args.outputs or ["stdout"]]
+    except (ValueError, OSError) as e:
+        parser.error(str(e))
+
+    state_dir = args.state_dir or COUNTER_JOURNAL_CONFIG["state_dir"]
+    Path(state_dir).mkdir(parents=True, exist_ok=True)
+    logging_handle = setup_logging(
+        **{**LOGGING_CONFIG, "log_file": Path(state_dir) / LOGGING_CONFIG["log_file"].name}
+    )
+
+    # Apagado limpio: las señales solo activan el evento, el lector termina solo
+    stop_event = threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: stop_event.set())
+
+    tracer = None
+    if LATENCY_CONFIG["enabled"]:
+        tracer = LatencyTracer(dump_path=LATENCY_CONFIG["dump_path"])
+        tracer.install_signal_handler()
+        if LATENCY_CONFIG["dump_interval"]:
+            tracer.start_periodic_dump(LATENCY_CONFIG["dump_interval"])
+
+    metrics = None
+    metrics_exporters = []
+    if args.metrics_port is not None or args.metrics_textfile is not None:
+        metrics = MetricsRegistry()
+        host = METRICS_CONFIG["address"][0] if METRICS_CONFIG["address"] else "127.0.0.1"
+        metrics_exporters = start_exporters(
+            metrics,
+            (host, args.metrics_port) if args.metrics_port is not None else None,
+            args.metrics_textfile,
+            METRICS_CONFIG["textfile_interval"],
+        )
+
+    try:
+        return run(
+            args.port,
+            args.baudrate,
+            outputs,
+            stop_event,
+            args.state_dir,
+            tracer,
+            capture_dir=args.capture,
+            metrics=metrics,
+        )
+    finally:
+        for exporter in metrics_exporters:
+            exporter.close()
+        if tracer is not None:
+            tracer.stop()
+            tracer.dump()
+        logging_handle.stop()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+"""
+Ventana de varias contadoras: una tarjeta por máquina en una grilla y el
+total combinado arriba.
+
+El ``MultiPortReader`` se atiende en el hilo de Tk: el descriptor de su
+selector (epoll) se registra con ``createfilehandler``, así que Tk despierta
+cuando cualquier puerto tiene datos (sin hilos ni consulta periódica; en
+Windows se consulta con ``after``). Las tarjetas se refrescan a lo sumo
+cada ``render_ms`` (al momento si la pantalla estaba quieta) y solo las
+que cambiaron.
+"""
+
+import math
+import time
+import tkinter as tk
+
+from gui.root_windows import format_number
+
+BG = "#2E3B4E"
+TILE_BG = "#3A4A60"
+# Refresco máximo de las tarjetas y consulta de respaldo sin createfilehandler
+RENDER_INTERVAL_MS = 33
+POLL_INTERVAL_MS = 10
+TICK_INTERVAL_MS = 1000
+
+_UNSET = object()
+
+
+class MachineTile(tk.Frame):
+    """
+    Tarjeta de una contadora: nombre, piezas acumuladas, monto y estado.
+    """
+
+    def __init__(self, parent, name):
+        super().__init__(parent, bg=TILE_BG, padx=8, pady=6)
+        self._shown = {}
+        self.vars = {
+            "piezas": tk.StringVar(value="0"),
+            "monto": tk.StringVar(value="Esperando datos..."),
+            "estado": tk.StringVar(value=""),
+        }
+        tk.Label(self, text=name, font=("Helvetica", 11), fg="white", bg=TILE_BG).pack(anchor="w")
+        tk.Label(
+            self,
+            textvariable=self.vars["piezas"],
+            font=("Consolas", 20, "bold"),
+            fg="#FFC107",
+            bg=TILE_BG,
+        ).pack(anchor="e")
+        tk.Label(
+            self, textvariable=self.vars["monto"], font=("Consolas", 12), fg="#4CAF50", bg=TILE_BG
+        ).pack(anchor="e")
+        tk.Label(
+            self, textvariable=self.vars["estado"], font=("Consolas", 9), fg="#B8120C", bg=TILE_BG
+        ).pack(anchor="w")
+
+    def show(self, monitor):
+        if not monitor.connected:
+            self._set("estado", "Desconectado", str)
+            return
+        self._set("estado", "", str)
+        if monitor.value is not None:
+            reading, total = monitor.value
+            self._set("piezas", total, format_number)
+            self._set("monto", reading.monto, format_number)
+
+    def _set(self, key, value, formatter):
+        if self._shown.get(key, _UNSET) == value:
+            return
+        self._shown[key] = value
+        self.vars[key].set(formatter(value))
+
+
+class MultiWindow(tk.Tk):
+    def __init__(self, names, columns=None):
+        super().__init__()
+        self.title("Visor Contadoras Glory")
+        self.configure(bg=BG)
+        self.total_var = tk.StringVar(value="0")
+        self._total_shown = None
+        self._reader = None
+        self._render_id = None
+        self._last_render = float("-inf")
+        self.renders = 0
+
+        header = tk.Frame(self, bg=BG)
+        header.pack(fill="x", padx=10, pady=(10, 0))
+        tk.Label(
+            header, text="Total combinado", font=("Helvetica", 16), fg="white", bg=BG
+        ).pack(side="left")
+        tk.Label(
+            header,
+            textvariable=self.total_var,
+            font=("Consolas", 28, "bold"),
+            fg="#FFC107",
+            bg=BG,
+        ).pack(side="right")
+
+        grid = tk.Frame(self, bg=BG)
+        grid.pack(fill="both", expand=True, padx=10, pady=10)
+        columns = columns or math.ceil(math.sqrt(len(names)))
+        self.tiles = {}
+        for i, name in enumerate(names):
+            tile = MachineTile(grid, name)
+            tile.grid(row=i // columns, column=i % columns, padx=4, pady=4, sticky="nsew")
+            self.tiles[name] = tile
+        for column in range(columns):
+            grid.columnconfigure(column, weight=1, uniform="tile")
+
+    def attach_reader(self, reader, render_ms=RENDER_INTERVAL_MS):
+        """
+        Atiende ``reader`` (``MultiPortReader``) desde el bucle de Tk.
+        """
+        self._reader = reader
+        self._render_ms = render_ms
+        fd = reader.fileno()
+        if fd is not None and hasattr(self.tk, "createfilehandler"):
+            self.tk.createfilehandler(fd, tk.READABLE, lambda _fd, _mask: self._on_ready())
+            self._retry_tick()
+        else:
+            self._poll_tick()
+        self.after(TICK_INTERVAL_MS, self._tick)
+        self._render()  # Estado inicial (puertos que no abrieron)
+
+    def detach_reader(self):
+        fd = self._reader.fileno()
+        if fd is not None and hasattr(self.tk, "createfilehandler"):
+            self.tk.deletefilehandler(fd)
+
+    def _on_ready(self):
+        self._reader.poll(0)
+        self._schedule_render()
+
+    def _poll_tick(self):
+        self._on_ready()
+        self.after(POLL_INTERVAL_MS, self._poll_tick)
+
+    def _retry_tick(self):
+        # Los puertos perdidos no están en el selector: reintento por temporizador
+        retry = self._reader.next_retry()
+        if retry is not None and retry == 0:
+            self._on_ready()
+        self.after(max(int((retry or 1.0) * 1000), 1), self._retry_tick)
+
+    def _tick(self):
+        self._reader.tick()
+        self.after(TICK_INTERVAL_MS, self._tick)
+
+    def _schedule_render(self):
+        # Al momento si la pantalla lleva render_ms sin cambios; si no, al cumplirse
+        if self._render_id is not None:
+            return
+        wait = self._last_render + self._render_ms / 1000 - time.monotonic()
+        if wait <= 0:
+            self._render()
+        else:
+            self._render_id = self.after(max(int(wait * 1000), 1), self._deferred_render)
+
+    def _deferred_render(self):
+        self._render_id = None
+        self._render()
+
+    def _render(self):
+        changed = self._reader.changed()
+        if not changed:
+            return
+        self._last_render = time.monotonic()
+        self.renders += 1
+        for monitor in changed:
+            self.tiles[monitor.name].show(monitor)
+        total = self._reader.total
+        if total != self._total_shown:
+            self._total_shown = total
+            self.total_var.set(format_number(total))
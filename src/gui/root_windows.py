@@ -1,20 +1,66 @@
+import logging
+import time
 import tkinter as tk
 from tkinter import messagebox
 
+from core.log import get_logger, log_event
+from core.metrics import RENDER_BUCKETS
+from gui.sparkline import Sparkline
+
+_log = get_logger("gui")
+
+# Cadencia de refresco de las etiquetas (~30 Hz)
+RENDER_INTERVAL_MS = 33
+# Cadencia del ritmo de producción y su gráfico (4 Hz)
+RATE_INTERVAL_MS = 250
+
+
+def format_number(value):
+    """
+    Formatea con separador de miles ".", ej. 10025 -> "10.025".
+    """
+    return f"{value:,}".replace(",", ".")
+
+
+def format_status(active):
+    return "🟢" if active else ""
+
+
+def format_rechazo_sensor(active):
+    return "🔴​" if active else ""
+
+
+def format_rate(rate):
+    piezas_s, monto_min = rate
+    return f"{piezas_s:.1f} pzs/s  {format_number(round(monto_min))}/min"
+
+
+_UNSET = object()
+
 
 class RootWindow(tk.Tk):
     def __init__(self):
         super().__init__()
         self.title("Visor Contadora Glory")
-        self.geometry("500x250")
+        self.geometry("500x270")
         self.configure(bg="#2E3B4E")
         self.gui_vars = {
             "monto": tk.StringVar(value="Esperando datos..."),
             "piezas": tk.StringVar(value="0"),
             "status": tk.StringVar(value=""),
             "rechazo_sensor": tk.StringVar(value="Desconectado"),
+            "ritmo": tk.StringVar(value=""),
         }
 
+        # Últimos valores mostrados, para tocar solo las variables que cambian
+        self._shown = {}
+        self._mailbox = None
+        self._tracer = None  # LatencyTracer opcional (core/latency.py)
+        self._rates = None  # RateEngine opcional (core/rates.py)
+        self._render_seconds = None  # Histograma opcional (core/metrics.py)
+        self.renders = 0  # Refrescos que encontraron una lectura nueva
+        self.label_sets = 0  # Llamadas a StringVar.set realizadas
+
         # Crear y estilizar las etiquetas y los valores
         tk.Label(
             self,
@@ -45,9 +91,10 @@ class RootWindow(tk.Tk):
             bg="#2E3B4E",
         ).pack()
 
-        # Frame para los labels de status y rechazo en la esquina inferior izquierda
+        # Frame inferior: status y rechazo a la izquierda, ritmo (opcional) a la derecha
         bottom_frame = tk.Frame(self, bg="#2E3B4E")
-        bottom_frame.pack(side="bottom", anchor="sw", padx=(10, 0), pady=(0, 10))
+        bottom_frame.pack(side="bottom", fill="x", padx=(10, 10), pady=(0, 10))
+        self._bottom_frame = bottom_frame
 
         tk.Label(
             bottom_frame,
@@ -76,9 +123,125 @@ class RootWindow(tk.Tk):
         )
         self.quit()
 
-    def update_labels(self, data):
-        # Actualizar las variables de la GUI
-        self.gui_vars["monto"].set(f"{data['monto']:,}".replace(",", "."))
-        self.gui_vars["piezas"].set(f"{data['piezas']:,}".replace(",", "."))
-        self.gui_vars["status"].set(f"{'🟢' if data['status'] else ''}")
-        self.gui_vars["rechazo_sensor"].set(f"{'🔴​' if data['rechazo_sensor'] else ''}")
+    def attach_mailbox(self, mailbox, interval_ms=RENDER_INTERVAL_MS):
+        """
+        Empieza a refrescar las etiquetas desde ``mailbox`` cada ``interval_ms``.
+        Todo el acceso a Tk ocurre en el hilo principal.
+        """
+        self._mailbox = mailbox
+        self._render_interval_ms = interval_ms
+        self.after(interval_ms, self._render_tick)
+
+    def attach_latency_tracer(self, tracer, key="<F9>"):
+        """
+        Mide la latencia hasta ``StringVar.set`` y vuelca los histogramas
+        al presionar ``key``.
+        """
+        self._tracer = tracer
+        self.bind_all(key, lambda _event: self._dump_latency())
+
+    def attach_metrics(self, registry):
+        """
+        Publica en ``registry`` (``MetricsRegistry``) los refrescos, las
+        lecturas coalescidas y la duración de cada ``render``.
+        """
+        registry.counter("gui_renders_total", "Refrescos de la GUI con lectura nueva",
+                         function=lambda: self.renders)
+        registry.counter("gui_label_sets_total", "Llamadas a StringVar.set",
+                         function=lambda: self.label_sets)
+        registry.counter("gui_coalesced_total", "Lecturas reemplazadas antes de mostrarse",
+                         function=lambda: self.render_stats()["coalesced"])
+        self._render_seconds = registry.histogram(
+            "gui_render_seconds", "Duración de un refresco de la GUI", RENDER_BUCKETS
+        )
+
+    def attach_rate_engine(self, engine, interval_ms=RATE_INTERVAL_MS, window=60):
+        """
+        Muestra el ritmo de producción (EWMA de piezas por segundo y monto por
+        minuto en ``window`` segundos) con un gráfico de los últimos segundos.
+        Se redibuja cada ``interval_ms``, no por lectura.
+        """
+        self._rates = engine
+        self._rate_window = window
+        self._rate_interval_ms = interval_ms
+        self._sparkline = Sparkline(self._bottom_frame, bg="#2E3B4E")
+        self._sparkline.pack(side="right")
+        tk.Label(
+            self._bottom_frame,
+            textvariable=self.gui_vars["ritmo"],
+            font=("Consolas", 10),
+            fg="white",
+            bg="#2E3B4E",
+        ).pack(side="right", padx=(0, 6))
+        self.after(interval_ms, self._rate_tick)
+
+    def _rate_tick(self):
+        engine = self._rates
+        engine.advance()
+        self._sparkline.redraw(engine)
+        rate = (round(engine.ewma, 1), round(engine.monto_per_minute(self._rate_window)))
+        self._set_if_changed("ritmo", rate, format_rate)
+        self.after(self._rate_interval_ms, self._rate_tick)
+
+    def _dump_latency(self):
+        self._tracer.dump()
+        log_event(_log, logging.INFO, "latency_dump", **self._tracer.summary())
+
+    def _render_tick(self):
+        value = self._mailbox.take()
+        if value is not None:
+            self.render(value)
+        self.after(self._render_interval_ms, self._render_tick)
+
+    def render(self, value):
+        """
+        Muestra ``(lectura, total)``. La llama el refresco periódico del
+        buzón o, sin hilo lector, ``TkSerialReader`` tras cada bloque leído.
+        """
+        histogram = self._render_seconds
+        if histogram is not None:
+            start = time.perf_counter()
+        self.update_labels(*value)
+        if self._rates is not None:
+            reading, total_pieces = value
+            self._rates.observe(total_pieces, reading.monto)
+        if self._tracer is not None:
+            self._tracer.rendered(value)
+        if histogram is not None:
+            histogram.observe(time.perf_counter() - start)
+
+    def update_labels(self, reading, total_pieces):
+        # Actualizar solo las variables de la GUI cuyo valor cambió
+        self.renders += 1
+        self._set_if_changed("monto", reading.monto, format_number)
+        self._set_if_changed("piezas", total_pieces, format_number)
+        self._set_if_changed("status", reading.status, format_status)
+        self._set_if_changed("rechazo_sensor", reading.rechazo_sensor, format_rechazo_sensor)
+
+    def _set_if_changed(self, key, value, formatter):
+        if self._shown.get(key, _UNSET) == value:
+            return
+        self._shown[key] = value
+        self.gui_vars[key].set(formatter(value))
+        self.label_sets += 1
+
+    def show_connection_lost(self):
+        """
+        Indica en pantalla que se perdió la conexión con la contadora.
+        """
+        self._shown.clear()
+        self.gui_vars["monto"].set("Error de Conexión")
+        self.gui_vars["piezas"].set("Reconectar")
+
+    def render_stats(self):
+        """
+        Lecturas recibidas frente a refrescos realizados.
+        """
+        # Sin buzón, lo recibido y coalescido está en TkSerialReader.stats()
+        received = self._mailbox.published if self._mailbox else self.renders
+        return {
+            "frames_received": received,
+            "renders": self.renders,
+            "coalesced": received - self.renders,
+            "label_sets": self.label_sets,
+        }
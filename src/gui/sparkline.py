@@ -0,0 +1,38 @@
+import tkinter as tk
+
+
+def fill_coords(values, coords, width, height, pad=2):
+    """
+    Convierte ``values`` en coordenadas ``x0, y0, x1, y1, ...`` escritas en
+    ``coords`` (lista preasignada de ``2 * len(values)``). La escala
+    vertical se ajusta al máximo visible (mínimo 1 para no amplificar ruido).
+    """
+    n = len(values)
+    top = max(max(values), 1.0)
+    step = (width - 2 * pad) / max(n - 1, 1)
+    usable = height - 2 * pad
+    for i, v in enumerate(values):
+        coords[2 * i] = pad + i * step
+        coords[2 * i + 1] = pad + usable * (1.0 - v / top)
+    return coords
+
+
+class Sparkline(tk.Canvas):
+    """
+    Gráfico mínimo de piezas por segundo de un ``RateEngine``. Reutiliza una
+    sola línea del canvas y sus buffers: cada redibujado solo mueve puntos.
+    """
+
+    def __init__(self, parent, points=60, width=120, height=28, color="#FFC107", **kwargs):
+        super().__init__(parent, width=width, height=height, highlightthickness=0, **kwargs)
+        self._width = width
+        self._height = height
+        self._values = [0.0] * points
+        self._coords = [0.0] * (2 * points)
+        fill_coords(self._values, self._coords, width, height)
+        self._line = self.create_line(*self._coords, fill=color, width=1)
+
+    def redraw(self, engine):
+        engine.history(self._values)
+        fill_coords(self._values, self._coords, self._width, self._height)
+        self.coords(self._line, self._coords)
@@ -0,0 +1,263 @@
+"""
+Lectura del puerto serie dentro del bucle de eventos de Tk, sin hilo lector.
+
+En el modo con hilo (``main.serial_reader``) un hilo bloquea en
+``ser.read`` con timeout de 1 s, publica en un buzón con lock y la GUI lo
+consulta cada 33 ms. Aquí el descriptor del puerto se registra con
+``createfilehandler``: Tk despierta solo cuando hay bytes, se vacía todo lo
+disponible sin bloquear (timeout 0), se procesa con ``FramePipeline`` y se
+muestra la última lectura en el mismo hilo: al momento si la pantalla no se
+refrescó en los últimos ``render_ms`` y, si no, al completar ese intervalo
+(con tráfico continuo, a ~60 Hz como máximo).
+Sin datos no hay despertares salvo el ``tick`` del journal.
+
+Donde Tk no tiene ``createfilehandler`` (Windows) se consulta el puerto
+con ``after`` cada ``poll_ms``.
+"""
+
+import logging
+import time
+import tkinter
+
+import serial
+
+from core.log import get_logger, log_event
+from core.reader import RECONNECT_DELAY, FramePipeline
+from protocol.framing import READ_CHUNK_SIZE
+
+_log = get_logger("tk_reader")
+
+# Consulta periódica del puerto cuando no hay createfilehandler
+POLL_INTERVAL_MS = 10
+# Lecturas por evento como máximo: con tráfico continuo Tk sigue atendiendo
+# el resto de eventos entre vaciados
+MAX_READS_PER_EVENT = 16
+# Refresco máximo de la pantalla (~60 Hz): por encima de la cadencia real de
+# la contadora, así que cada lectura se muestra al llegar
+MIN_RENDER_INTERVAL_MS = 16
+# Cadencia de counter.tick() (sincronización del journal) en reposo
+TICK_INTERVAL_MS = 1000
+# Consulta de los puertos en prueba durante una reconexión
+PROBE_STEP_MS = 10
+
+
+class TkSerialReader:
+    """
+    Conecta ``ser`` al bucle de eventos de ``root`` (``RootWindow``: usa
+    ``after``, ``render`` y ``show_connection_lost``).
+
+    ``outputs``: salidas adicionales con ``publish((lectura, total))``
+    (``ReadingPublisher``, ``ReadingStore``); reciben todas las lecturas,
+    la GUI solo la última de cada bloque. ``reconnector``, ``capture`` y
+    ``metrics`` como en ``run_reader``; los intentos de reconexión avanzan
+    con ``after`` (``ReconnectAttempt.step`` sin esperar), sin bloquear el
+    bucle aunque se prueben puertos mudos.
+    """
+
+    def __init__(
+        self,
+        root,
+        ser,
+        counter,
+        outputs=(),
+        tracer=None,
+        frame_ring=None,
+        repeat_filter=None,
+        reconnector=None,
+        reconnect_delay=RECONNECT_DELAY,
+        poll_ms=POLL_INTERVAL_MS,
+        render_ms=MIN_RENDER_INTERVAL_MS,
+        use_filehandler=True,
+        capture=None,
+        metrics=None,
+    ):
+        self.root = root
+        self.ser = ser
+        self.counter = counter
+        self.pipeline = FramePipeline(
+            counter, self._publish, tracer, frame_ring, repeat_filter, capture, metrics
+        )
+        self._outputs = [output.publish for output in outputs]
+        self.reconnector = reconnector
+        if metrics is not None and reconnector is not None:
+            reconnector.register_metrics(metrics)
+        self.reconnect_delay = reconnect_delay
+        self.poll_ms = poll_ms
+        self.render_interval = render_ms / 1000
+        self.use_filehandler = use_filehandler and hasattr(root.tk, "createfilehandler")
+        self._original = ser
+        self._fd = None
+        self._poll_id = None
+        self._tick_id = None
+        self._latest = None
+        self._last_render = float("-inf")
+        self._render_id = None
+        self._lost_at = None
+        self._attempt = None  # ReconnectAttempt en curso
+        self._probe_id = None
+        self._running = False
+
+        self.published = 0  # Lecturas nuevas
+        self.renders = 0  # Llamadas a root.render (una por render_ms como máximo)
+        self.events = 0  # Despertares con el puerto legible o consultas
+
+    def start(self):
+        self._running = True
+        self._watch()
+        self._tick_id = self.root.after(TICK_INTERVAL_MS, self._tick)
+        return self
+
+    def stop(self):
+        self._running = False
+        self._unwatch()
+        if self._render_id is not None:
+            self.root.after_cancel(self._render_id)
+            self._render_id = None
+        if self._tick_id is not None:
+            self.root.after_cancel(self._tick_id)
+            self._tick_id = None
+        if self._probe_id is not None:
+            self.root.after_cancel(self._probe_id)
+            self._probe_id = None
+        if self._attempt is not None:
+            self._attempt.close()
+            self._attempt = None
+        if self.ser is not self._original:
+            self.ser.close()
+
+    def _watch(self):
+        self.ser.timeout = 0  # Nunca bloquear el hilo de Tk
+        if self.use_filehandler:
+            self._fd = self.ser.fileno()
+            self.root.tk.createfilehandler(self._fd, tkinter.READABLE, self._on_readable)
+        else:
+            self._poll_id = self.root.after(self.poll_ms, self._poll)
+
+    def _unwatch(self):
+        if self._fd is not None:
+            self.root.tk.deletefilehandler(self._fd)
+            self._fd = None
+        if self._poll_id is not None:
+            self.root.after_cancel(self._poll_id)
+            self._poll_id = None
+
+    def _on_readable(self, _fd, _mask):
+        self._drain()
+
+    def _poll(self):
+        self._poll_id = None
+        self._drain()
+        if self._running and self._lost_at is None:
+            self._poll_id = self.root.after(self.poll_ms, self._poll)
+
+    def _tick(self):
+        self.counter.tick()
+        self._tick_id = self.root.after(TICK_INTERVAL_MS, self._tick)
+
+    def _publish(self, value):
+        self.published += 1
+        self._latest = value
+        for publish in self._outputs:
+            publish(value)
+
+    def _drain(self):
+        self.events += 1
+        feed = self.pipeline.feed
+        try:
+            for _ in range(MAX_READS_PER_EVENT):
+                chunk = self.ser.read(READ_CHUNK_SIZE)
+                if chunk:
+                    feed(chunk)
+                if len(chunk) < READ_CHUNK_SIZE:
+                    break
+        except (serial.SerialException, OSError):
+            self._connection_lost()
+        except Exception:
+            _log.exception("unexpected_error")
+            self.pipeline.scanner.reset()
+
+        # Solo la última lectura llega a la pantalla
+        if self._latest is None or self._render_id is not None:
+            return
+        wait = self._last_render + self.render_interval - time.monotonic()
+        if wait <= 0:
+            self._render()
+        else:
+            self._render_id = self.root.after(max(int(wait * 1000), 1), self._deferred_render)
+
+    def _deferred_render(self):
+        self._render_id = None
+        if self._latest is not None:
+            self._render()
+
+    def _render(self):
+        value, self._latest = self._latest, None
+        self._last_render = time.monotonic()
+        self.renders += 1
+        self.root.render(value)
+
+    def _connection_lost(self):
+        self._lost_at = time.monotonic()
+        log_event(_log, logging.WARNING, "port_lost")
+        self._unwatch()
+        self.root.show_connection_lost()
+        self.ser.close()
+        self.pipeline.reset()
+        self._latest = None
+        if self.reconnector is not None:
+            self.reconnector.backoff.reset()
+            self.root.after(0, self._reconnect)
+        else:
+            self.root.after(int(self.reconnect_delay * 1000), self._reopen)
+
+    def _reconnect(self):
+        if not self._running:
+            return
+        self._attempt = self.reconnector.begin(self.ser.port, self._lost_at)
+        self._probe_step()
+
+    def _probe_step(self):
+        self._probe_id = None
+        attempt = self._attempt
+        found = attempt.step(0)
+        if found is None and not attempt.done:
+            self._probe_id = self.root.after(PROBE_STEP_MS, self._probe_step)
+            return
+        attempt.close()
+        self._attempt = None
+        if found is None:
+            delay = self.reconnector.backoff.next()
+            self.root.after(int(delay * 1000), self._reconnect)
+            return
+        if self.ser is not self._original:
+            self.ser.close()
+        self.ser, initial = found
+        if initial:
+            self.pipeline.feed(initial)  # Lo leído al probar el puerto
+        self._resume()
+
+    def _reopen(self):
+        if not self._running:
+            return
+        try:
+            self.ser.open()
+        except serial.SerialException as e:
+            log_event(_log, logging.ERROR, "port_reopen_failed", error=str(e))
+            self.root.after(int(self.reconnect_delay * 1000), self._reopen)
+            return
+        log_event(_log, logging.INFO, "port_reopened", port=self.ser.port)
+        self._resume()
+
+    def _resume(self):
+        self._lost_at = None
+        self._watch()
+
+    def stats(self):
+        return {
+            **self.pipeline.stats(),
+            "published": self.published,
+            "renders": self.renders,
+            "coalesced": self.published - self.renders,
+            "events": self.events,
+            **(self.reconnector.stats() if self.reconnector is not None else {}),
+        }
@@ -1,112 +1,40 @@
+import logging
 import threading
-import time
 from tkinter import messagebox
 
-import serial
-
+from config import (
+    COUNTER_JOURNAL_CONFIG,
+    FRAME_RING_CONFIG,
+    LATENCY_CONFIG,
+    LOGGING_CONFIG,
+    METRICS_CONFIG,
+    PUBSUB_CONFIG,
+    RATE_CONFIG,
+    RAW_CAPTURE_CONFIG,
+    READER_CONFIG,
+    RECONNECT_CONFIG,
+    STATE_DIR,
+    STORE_CONFIG,
+)
+from core.counter import CumulativeCounter
+from core.frame_ring import FrameRing
+from core.journal import CounterJournal
+from core.latency import LatencyTracer
+from core.log import get_logger, log_event, setup_logging
+from core.mailbox import LatestValueMailbox
+from core.metrics import MetricsRegistry, start_exporters
+from core.outputs import OutputFanout
+from core.pubsub import ReadingPublisher
+from core.rates import RateEngine
+from core.reader import run_reader
+from core.reconnect import make_reconnector
+from core.store import ReadingStore
 from gui.root_windows import RootWindow
+from gui.tk_reader import TkSerialReader
+from protocol.framing import RepeatFilter
+from protocol.raw_capture import open_session
 
-# --- Constantes del Protocolo ---
-STX = b"\x02"  # Start of Text
-ETX = b"\x03"  # End of Text
-PAYLOAD_LENGTH = 27  # Longitud esperada del payload en caracteres
-
-
-# --- Clase para manejar el contador acumulativo ---
-# Esta clase resuelve el problema del reinicio del contador de piezas
-class CumulativeCounter:
-    """
-    Gestiona un contador que se reinicia (ej. 9999 -> 0) para
-    mantener un total acumulado. Detecta reinicio basándose en:
-    1. Salto hacia atrás significativo en piezas (desbordamiento)
-    2. Reinicio manual (piezas vuelven a 0 o muy bajo)
-    """
-
-    def __init__(self):
-        self.total_pieces = 0
-        self.offset = 0
-        self.last_reading = {"piezas": 0, "monto": 0}
-        self.max_counter_value = 10000  # Valor máximo
-        self.overflow_threshold = (
-            self.max_counter_value * 0.5
-        )  # 5000 para detectar desbordamiento
-
-    def update(self, new_reading: dict[str, int]):
-        """
-        Actualiza el contador total detectando desbordamiento vs reinicio manual.
-
-        DESBORDAMIENTO: Piezas bajan mucho (>5000) pero monto sigue igual/sube
-                        Ej: 9980 piezas → 25 piezas, monto sigue igual
-
-        REINICIO MANUAL: Piezas bajan mucho Y monto también baja/es 0
-                         Ej: 5000 piezas → 0 piezas, monto 0 → 0
-        """
-        piezas_actual = new_reading["piezas"]
-        piezas_anterior = self.last_reading["piezas"]
-        monto_actual = new_reading["monto"]
-        monto_anterior = self.last_reading["monto"]
-
-        diferencia_piezas = piezas_anterior - piezas_actual
-        diferencia_monto = monto_anterior - monto_actual
-
-        # Caso 1: Salto hacia atrás significativo en piezas
-        if (
-            piezas_actual < piezas_anterior
-            and diferencia_piezas > self.overflow_threshold
-        ):
-            # Distinguir entre DESBORDAMIENTO y REINICIO MANUAL
-            # Si el monto también bajó significativamente → REINICIO MANUAL
-            if monto_actual < monto_anterior and diferencia_monto > 0:
-                self.offset = 0
-                print(
-                    f"🔄 REINICIO MANUAL detectado! "
-                    f"Piezas: {piezas_anterior} → {piezas_actual}, "
-                    f"Monto: {monto_anterior} → {monto_actual}. "
-                    f"Offset reseteado a 0"
-                )
-            elif piezas_actual == 0 and monto_actual == 0:
-                self.offset = 0
-                print(
-                    f"🔄 REINICIO MANUAL detectado! "
-                    f"Piezas: {piezas_anterior} → {piezas_actual}, "
-                    f"Monto: {monto_anterior} → {monto_actual}. "
-                    f"Offset reseteado a 0"
-                )
-            # Si el monto se mantiene igual o sube → DESBORDAMIENTO
-            else:
-                self.offset += self.max_counter_value
-                print(
-                    f"⚠️  DESBORDAMIENTO detectado! "
-                    f"Piezas: {piezas_anterior} → {piezas_actual}, "
-                    f"Monto: {monto_anterior} → {monto_actual}. "
-                    f"Nuevo offset: {self.offset}"
-                )
-
-        # Caso 2: Reinicio suave (piezas a 0 sin gran salto)
-        # Esto ocurre cuando se resetea desde un valor bajo
-        elif piezas_actual < 100 and piezas_anterior > 100:
-            self.offset = 0
-            print(
-                f"🔄 Reinicio suave detectado! "
-                f"Piezas: {piezas_anterior} → {piezas_actual}. "
-                f"Offset reseteado a 0"
-            )
-
-        # Caso 3: Solo cambio en monto (informativo)
-        elif (
-            monto_actual < monto_anterior
-            and monto_anterior > 0
-            and piezas_actual >= piezas_anterior
-        ):
-            print(
-                f"ℹ️  Cambio en monto detectado: {monto_anterior} → {monto_actual} "
-                f"(piezas sin cambio: {piezas_actual})"
-            )
-
-        self.total_pieces = self.offset + piezas_actual
-        self.last_reading["piezas"] = piezas_actual
-        self.last_reading["monto"] = monto_actual
-        return self.total_pieces
+_log = get_logger("main")
 
 
 # --- Funciones para la GUI ---
@@ -121,22 +49,6 @@ def show_serial_error(self, error_message):
     self.quit()
 
 
-def parse_payload(payload: bytearray):
-    """
-    Extrae los datos relevantes del payload.
-    """
-
-    payload_str = payload.decode("ascii")
-    print(payload_str)
-
-    return {
-        "monto": int(payload_str[7:20]),
-        "piezas": int(payload_str[23:27]),
-        "status": True if payload_str[2] != "0" else False,
-        "rechazo_sensor": True if payload_str[5] == "1" else False,
-    }
-
-
 def update_gui(gui_vars, data):
     """
     Actualiza las variables de la GUI con los datos recibidos.
@@ -147,95 +59,247 @@ def update_gui(gui_vars, data):
     # gui_vars["rechazo_sensor"].set(f"{'Activo' if data['rechazo_sensor'] else 'Inactivo'}")
 
 
+def open_configured_port(gui: RootWindow, reconnector):
+    """
+    Abre el puerto del visor (``config.get_viewer_port``) como lo haría una
+    reconexión. Devuelve ``(Serial, bytes leídos)`` o ``None`` tras mostrar
+    el error.
+    """
+    found = reconnector.attempt()
+    if found is None:
+        message = f"No se pudo abrir el puerto {reconnector.preferred()}"
+        log_event(_log, logging.ERROR, "port_open_failed", port=reconnector.preferred())
+        gui.after(100, gui.show_serial_error, message)
+    return found
+
+
 # --- Función Principal para Leer el Puerto Serie ---
-def serial_reader(gui: RootWindow, counter):
+def serial_reader(
+    gui: RootWindow,
+    counter,
+    mailbox: LatestValueMailbox,
+    tracer=None,
+    frame_ring=None,
+    repeat_filter=None,
+    publisher=None,
+    store=None,
+    capture=None,
+    metrics=None,
+):
     """
     Se ejecuta en un hilo separado para leer y procesar datos del puerto serie
-    sin bloquear la interfaz gráfica.
+    sin bloquear la interfaz gráfica. Las lecturas se publican en ``mailbox``;
+    la GUI las recoge en su propio hilo (ver ``RootWindow.attach_mailbox``).
+    Con ``publisher`` (``ReadingPublisher``) también se difunden a los
+    suscriptores locales y con ``store`` (``ReadingStore``) se guardan en el
+    histórico. Con ``capture`` (``RawCaptureWriter``) cada bloque leído se
+    guarda crudo y con ``metrics`` (``MetricsRegistry``) se publican los
+    contadores del lector. El pipeline es el de ``core.reader.run_reader``.
     """
-    try:
-        # Configuración y apertura del puerto serie
-        ser = serial.Serial(
-            port="/tmp/COM4",
-            baudrate=19200,
-            bytesize=serial.EIGHTBITS,
-            parity=serial.PARITY_NONE,
-            stopbits=serial.STOPBITS_ONE,
-            timeout=1,  # Tiempo de espera para la lectura
-        )
-        print("Puerto COM3 abierto con éxito.")
-    except serial.SerialException as e:
-        print(f"Error al abrir el puerto serie: {e}")
-        gui.after(100, gui.show_serial_error, str(e))
+    # Mismo orden que la reconexión: el puerto configurado y, solo con
+    # RECONNECT_CONFIG["search"], el adaptador con otro nombre
+    reconnector = make_reconnector(19200, **RECONNECT_CONFIG)
+    found = open_configured_port(gui, reconnector)
+    if found is None:
         return
+    ser, initial = found
+
+    outputs = [o for o in (publisher, store) if o is not None]
+    publish = OutputFanout([mailbox, *outputs]).publish if outputs else mailbox.publish
+
+    run_reader(
+        ser,
+        counter,
+        publish,
+        on_connection_lost=lambda: gui.after(0, gui.show_connection_lost),
+        tracer=tracer,
+        frame_ring=frame_ring,
+        repeat_filter=repeat_filter,
+        capture=capture,
+        metrics=metrics,
+        # Tras desconectar el adaptador: reabre el puerto con espera exponencial
+        reconnector=reconnector,
+        initial=initial,
+    )
 
-    # Máquina de estados para la lectura de datos
-    state = "WAITING_FOR_STX"
-    payload_buffer = bytearray()
-
-    while True:
-        try:
-            byte = ser.read(1)
-            if not byte:
-                continue  # Si no hay datos, vuelve a intentar
-
-            # Lógica de la máquina de estados
-            if state == "WAITING_FOR_STX":
-                if byte == STX:
-                    payload_buffer.clear()
-                    state = "READING_PAYLOAD"
-
-            elif state == "READING_PAYLOAD":
-                if byte == ETX:
-                    # Paquete recibido, ahora se procesa
-                    if len(payload_buffer) == PAYLOAD_LENGTH:
-                        # Extraer checksum (los últimos 2 bytes del buffer original no son parte del payload)
-                        # No es necesario leerlo aparte ya que lo descartamos.
-
-                        data = parse_payload(payload_buffer)
-
-                        # Actualizar el contador acumulativo
-                        piezas_acumuladas = counter.update(data)
-
-                        data["piezas"] = piezas_acumuladas
-
-                        # Actualizar las variables de la GUI
-                        gui.update_labels(data)
-
-                    # Volver al estado inicial para el próximo paquete
-                    state = "WAITING_FOR_STX"
-                else:
-                    payload_buffer.append(ord(byte))
-
-        except serial.SerialException:
-            print("Error de lectura o puerto desconectado.")
-            gui.gui_vars["monto"].set("Error de Conexión")
-            gui.gui_vars["piezas"].set("Reconectar")
-            ser.close()
-            time.sleep(2)  # Esperar antes de intentar reabrir
-            try:
-                ser.open()
-                print("Puerto reabierto.")
-            except serial.SerialException:
-                print("Fallo al reabrir el puerto.")
-                time.sleep(2)
-        except Exception as e:
-            print(f"Error inesperado: {e}")
-            state = "WAITING_FOR_STX"
+
+def event_reader(
+    gui: RootWindow,
+    counter,
+    tracer=None,
+    frame_ring=None,
+    repeat_filter=None,
+    publisher=None,
+    store=None,
+    capture=None,
+    metrics=None,
+):
+    """
+    Alternativa a ``serial_reader`` sin hilo: el puerto se atiende desde el
+    bucle de Tk (``TkSerialReader``) y cada bloque leído se muestra al
+    momento, sin buzón. Devuelve el lector o ``None`` si no se pudo abrir.
+    """
+    reconnector = make_reconnector(19200, **RECONNECT_CONFIG)
+    found = open_configured_port(gui, reconnector)
+    if found is None:
+        return None
+    ser, initial = found
+
+    tk_reader = TkSerialReader(
+        gui,
+        ser,
+        counter,
+        outputs=[o for o in (publisher, store) if o is not None],
+        tracer=tracer,
+        frame_ring=frame_ring,
+        repeat_filter=repeat_filter,
+        reconnector=reconnector,
+        capture=capture,
+        metrics=metrics,
+    )
+    if initial:
+        tk_reader.pipeline.feed(initial)
+    return tk_reader.start()
 
 
 # --- Inicio del Programa ---
 if __name__ == "__main__":
-    # Crear una instancia del contador acumulativo
-    piece_counter = CumulativeCounter()
+    # Logging en un hilo de fondo: el hilo lector nunca escribe en consola
+    STATE_DIR.mkdir(parents=True, exist_ok=True)
+    logging_handle = setup_logging(**LOGGING_CONFIG)
+
+    # Crear una instancia del contador acumulativo (recupera el estado guardado)
+    piece_counter = CumulativeCounter(journal=CounterJournal(**COUNTER_JOURNAL_CONFIG))
+    log_event(_log, logging.INFO, "counter_restored", total=piece_counter.total_pieces)
+    frame_ring = FrameRing(FRAME_RING_CONFIG["path"], FRAME_RING_CONFIG["slots"])
+    repeat_filter = RepeatFilter()
+
+    # Difusión opcional a paneles y registradores locales
+    publisher = None
+    if PUBSUB_CONFIG["enabled"]:
+        publisher = ReadingPublisher(
+            PUBSUB_CONFIG["address"],
+            fmt=PUBSUB_CONFIG["format"],
+            queue_size=PUBSUB_CONFIG["queue_size"],
+        ).start()
+        log_event(_log, logging.INFO, "pubsub_listening", address=publisher.address)
+
+    # Histórico opcional en SQLite (escrito en lotes por su propio hilo)
+    store = None
+    if STORE_CONFIG["enabled"]:
+        store = ReadingStore(
+            STORE_CONFIG["path"],
+            batch_size=STORE_CONFIG["batch_size"],
+            flush_interval=STORE_CONFIG["flush_interval"],
+        ).start()
+        log_event(_log, logging.INFO, "store_opened", path=STORE_CONFIG["path"])
+
+    # Captura cruda opcional de lo que llega por el puerto, con tiempos
+    raw_capture = None
+    if RAW_CAPTURE_CONFIG["enabled"]:
+        raw_capture = open_session(
+            RAW_CAPTURE_CONFIG["dir"], flush_interval=RAW_CAPTURE_CONFIG["flush_interval"]
+        )
+        log_event(_log, logging.INFO, "raw_capture_opened", path=raw_capture.path)
     root_window = RootWindow()
 
-    # Crear e iniciar el hilo para la lectura serie
-    # El 'daemon=True' asegura que el hilo se cierre cuando la ventana principal se cierre
-    serial_thread = threading.Thread(
-        target=serial_reader, args=(root_window, piece_counter), daemon=True
-    )
-    serial_thread.start()
+    # Métricas opcionales para Prometheus (HTTP local y/o archivo .prom)
+    metrics = None
+    metrics_exporters = []
+    if METRICS_CONFIG["enabled"]:
+        metrics = MetricsRegistry()
+        root_window.attach_metrics(metrics)
+        metrics_exporters = start_exporters(
+            metrics,
+            METRICS_CONFIG["address"],
+            METRICS_CONFIG["textfile"],
+            METRICS_CONFIG["textfile_interval"],
+        )
+
+    # Piezas/s y monto/min con gráfico, calculados en el hilo de la GUI
+    if RATE_CONFIG["enabled"]:
+        root_window.attach_rate_engine(
+            RateEngine(
+                windows=RATE_CONFIG["windows"],
+                history=RATE_CONFIG["history"],
+                ewma_tau=RATE_CONFIG["ewma_tau"],
+            ),
+            window=RATE_CONFIG["windows"][-1],
+        )
+
+    # Instrumentación de latencia opcional (F9 o SIGUSR1 vuelcan los histogramas)
+    latency_tracer = None
+    if LATENCY_CONFIG["enabled"]:
+        latency_tracer = LatencyTracer(dump_path=LATENCY_CONFIG["dump_path"])
+        root_window.attach_latency_tracer(latency_tracer)
+        latency_tracer.install_signal_handler()
+        if LATENCY_CONFIG["dump_interval"]:
+            latency_tracer.start_periodic_dump(LATENCY_CONFIG["dump_interval"])
+        log_event(_log, logging.INFO, "latency_enabled", dump_path=LATENCY_CONFIG["dump_path"])
+
+    tk_reader = None
+    if READER_CONFIG["mode"] == "event":
+        # Sin hilo lector: Tk despierta cuando el puerto tiene datos
+        tk_reader = event_reader(
+            root_window,
+            piece_counter,
+            latency_tracer,
+            frame_ring,
+            repeat_filter,
+            publisher,
+            store,
+            raw_capture,
+            metrics,
+        )
+    else:
+        # Buzón entre el hilo lector y el refresco periódico de la GUI
+        reading_mailbox = LatestValueMailbox()
+        root_window.attach_mailbox(reading_mailbox)
+
+        # Crear e iniciar el hilo para la lectura serie
+        # El 'daemon=True' asegura que el hilo se cierre cuando la ventana principal se cierre
+        serial_thread = threading.Thread(
+            target=serial_reader,
+            args=(
+                root_window,
+                piece_counter,
+                reading_mailbox,
+                latency_tracer,
+                frame_ring,
+                repeat_filter,
+                publisher,
+                store,
+                raw_capture,
+                metrics,
+            ),
+            daemon=True,
+        )
+        serial_thread.start()
 
     # Iniciar el bucle principal de la GUI
     root_window.mainloop()
+
+    log_event(_log, logging.INFO, "gui_closed", **root_window.render_stats())
+    if tk_reader is not None:
+        log_event(_log, logging.INFO, "tk_reader", **tk_reader.stats())
+        tk_reader.stop()
+    log_event(_log, logging.INFO, "repeat_filter", **repeat_filter.stats())
+    if publisher is not None:
+        log_event(_log, logging.INFO, "pubsub_closed", **publisher.stats())
+        publisher.close()
+    if store is not None:
+        log_event(_log, logging.INFO, "store_closed", **store.stats())
+        store.close()
+    if latency_tracer is not None:
+        latency_tracer.stop()
+        latency_tracer.dump()
+    for exporter in metrics_exporters:
+        exporter.close()
+    piece_counter.journal.close()
+    frame_ring.flush()  # El hilo lector (daemon) puede seguir escribiendo
+    if raw_capture is not None:
+        log_event(
+            _log, logging.INFO, "raw_capture_closed", chunks=raw_capture.chunks, bytes=raw_capture.bytes
+        )
+        raw_capture.flush()  # Ídem: el archivo se cierra al salir
+    logging_handle.stop()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Varias contadoras en un proceso: una tarjeta por máquina y el total
+combinado. Todos los puertos se leen en el hilo de la GUI con un único
+selector (ver ``core/multiport.py``); cada máquina tiene su propio
+``CumulativeCounter`` y su journal en ``<state-dir>/<nombre>``.
+
+Uso:
+    python monitor.py --port L1=/dev/ttyUSB0 --port L2=/dev/ttyUSB1
+        [--columns 4] [--state-dir state/maquinas] [--metrics-port 9752]
+
+Sin ``--port`` se usan los puertos de ``MULTI_CONFIG["ports"]``.
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+from config import (
+    COUNTER_JOURNAL_CONFIG,
+    LOGGING_CONFIG,
+    METRICS_CONFIG,
+    MULTI_CONFIG,
+    SERIAL_CONFIG,
+)
+from core.counter import CumulativeCounter
+from core.journal import CounterJournal
+from core.log import get_logger, log_event, setup_logging
+from core.metrics import MetricsRegistry, start_exporters
+from core.multiport import MultiPortReader
+
+_log = get_logger("monitor")
+
+
+def parse_port(spec):
+    """
+    ``"nombre=ruta"`` -> ``(nombre, ruta)``.
+    """
+    name, sep, port = spec.partition("=")
+    if not sep or not name or not port:
+        raise argparse.ArgumentTypeError(f"se esperaba nombre=puerto: {spec!r}")
+    return name, port
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Visor de varias contadoras")
+    parser.add_argument(
+        "--port",
+        action="append",
+        dest="ports",
+        type=parse_port,
+        help="nombre=puerto de una máquina (repetible)",
+    )
+    parser.add_argument("--baudrate", type=int, default=SERIAL_CONFIG["baudrate"])
+    parser.add_argument("--columns", type=int, default=MULTI_CONFIG["columns"])
+    parser.add_argument("--state-dir", type=Path, default=MULTI_CONFIG["state_dir"])
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=METRICS_CONFIG["address"][1]
+        if METRICS_CONFIG["enabled"] and METRICS_CONFIG["address"]
+        else None,
+        help="Exponer métricas Prometheus (una serie por máquina) en 127.0.0.1:<puerto>",
+    )
+    parser.add_argument(
+        "--metrics-textfile",
+        type=Path,
+        default=METRICS_CONFIG["textfile"] if METRICS_CONFIG["enabled"] else None,
+        help="Escribir las métricas en este archivo .prom (textfile collector)",
+    )
+    args = parser.parse_args(argv)
+
+    ports = dict(args.ports or MULTI_CONFIG["ports"])
+    if not ports:
+        parser.error("no hay puertos: usar --port nombre=puerto o MULTI_CONFIG['ports']")
+
+    args.state_dir.mkdir(parents=True, exist_ok=True)
+    logging_handle = setup_logging(
+        **{**LOGGING_CONFIG, "log_file": args.state_dir / LOGGING_CONFIG["log_file"].name}
+    )
+
+    # Importado aquí: --help y los errores de argumentos no necesitan display
+    from gui.multi_window import MultiWindow
+
+    metrics = None
+    metrics_exporters = []
+    if args.metrics_port is not None or args.metrics_textfile is not None:
+        metrics = MetricsRegistry()
+        metrics_exporters = start_exporters(
+            metrics,
+            ("127.0.0.1", args.metrics_port) if args.metrics_port is not None else None,
+            args.metrics_textfile,
+            METRICS_CONFIG["textfile_interval"],
+        )
+
+    reader = MultiPortReader(metrics=metrics)
+    try:
+        for name, port in ports.items():
+            journal = CounterJournal(**{**COUNTER_JOURNAL_CONFIG, "state_dir": args.state_dir / name})
+            counter = CumulativeCounter(journal=journal)
+            log_event(_log, logging.INFO, "counter_restored", name=name, total=counter.total_pieces)
+            reader.add_port(name, port, counter, baudrate=args.baudrate)
+
+        window = MultiWindow(list(ports), columns=args.columns)
+        window.attach_reader(reader)
+        window.mainloop()
+        window.detach_reader()
+
+        log_event(_log, logging.INFO, "gui_closed", renders=window.renders, total=reader.total)
+        for name, stats in reader.stats().items():
+            log_event(_log, logging.INFO, "port_stats", name=name, **stats)
+        return 0
+    finally:
+        for exporter in metrics_exporters:
+            exporter.close()
+        reader.close()
+        for monitor in reader.monitors:
+            monitor.counter.journal.close()
+        logging_handle.stop()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,273 @@
+"""
+Formato binario de capturas (``.uwfcap``).
+
+Los logs de texto (hex + ASCII) ocupan ~4 veces lo que se transmite por la
+línea. Este formato guarda los paquetes tal cual:
+
+    [cabecera 64 B][N paquetes de frame_length B][relleno a 8 B][N timestamps int64]
+
+- Cabecera: ``<8sHHHHqq24x`` = magic, versión, flags, frame_length,
+  reservado, número de paquetes, tiempo base (ns desde epoch).
+- Timestamps (opcional, flag ``FLAG_TIMESTAMPS``): ns relativos al tiempo base,
+  no decrecientes.
+- Índice lateral ``<archivo>.idx``: pares ``(timestamp, n_paquete)`` int64 cada
+  ``INDEX_STRIDE`` paquetes, para buscar por tiempo sin recorrer la columna.
+
+El lector usa ``mmap``: ``frame(i)`` y ``frames(a, b)`` devuelven
+``memoryview`` sobre el archivo, sin copiar.
+"""
+
+import bisect
+import mmap
+import os
+import struct
+from pathlib import Path
+
+from protocol.framing import FRAME_LENGTH
+
+CAPTURE_SUFFIX = ".uwfcap"
+INDEX_SUFFIX = ".idx"
+MAGIC = b"UWFCAP\x00\x01"
+VERSION = 1
+HEADER = struct.Struct("<8sHHHHqq24x")
+HEADER_SIZE = HEADER.size  # 64
+FLAG_TIMESTAMPS = 0x0001
+INDEX_STRIDE = 1024
+
+_INT64 = struct.Struct("<q")
+_INDEX_ENTRY = struct.Struct("<qq")
+
+
+def is_capture_file(path):
+    return Path(path).suffix == CAPTURE_SUFFIX
+
+
+def _align8(n):
+    return (n + 7) & ~7
+
+
+class CaptureWriter:
+    """
+    Escribe una captura de forma incremental con memoria constante: los
+    paquetes van directo al archivo y los timestamps a un archivo temporal
+    que se anexa al cerrar, cuando ya se conoce el número de paquetes.
+    """
+
+    def __init__(self, path, frame_length=FRAME_LENGTH, with_timestamps=False, base_time_ns=0):
+        self.path = Path(path)
+        self.frame_length = frame_length
+        self.with_timestamps = with_timestamps
+        self.base_time_ns = base_time_ns
+        self.count = 0
+        self.skipped = 0  # Paquetes con longitud distinta de frame_length
+        self._last_ts = None
+
+        self._file = open(self.path, "wb")
+        self._file.write(bytes(HEADER_SIZE))
+        self._ts_path = self.path.with_name(self.path.name + ".ts.tmp")
+        self._ts_file = open(self._ts_path, "wb") if with_timestamps else None
+        self._index = []
+
+    def write(self, frame, timestamp_ns=None):
+        """
+        Agrega un paquete. ``timestamp_ns`` es relativo a ``base_time_ns`` y
+        obligatorio si la captura tiene timestamps.
+        """
+        if len(frame) != self.frame_length:
+            self.skipped += 1
+            return False
+        if self._ts_file is not None:
+            if timestamp_ns is None:
+                raise ValueError("La captura requiere timestamp por paquete")
+            if self._last_ts is not None and timestamp_ns < self._last_ts:
+                raise ValueError("Los timestamps deben ser no decrecientes")
+            if self.count % INDEX_STRIDE == 0:
+                self._index.append((timestamp_ns, self.count))
+            self._ts_file.write(_INT64.pack(timestamp_ns))
+            self._last_ts = timestamp_ns
+        self._file.write(frame)
+        self.count += 1
+        return True
+
+    def write_many(self, frames, timestamps_ns=None):
+        """
+        Agrega un bloque de paquetes contiguos (``bytes`` o matriz NumPy
+        ``(N, frame_length)``) con una sola escritura. ``timestamps_ns`` es
+        un arreglo int64 de N valores si la captura tiene timestamps.
+        """
+        data = memoryview(frames).cast("B")
+        n, rest = divmod(len(data), self.frame_length)
+        if rest:
+            raise ValueError(f"El bloque no es múltiplo de {self.frame_length} bytes")
+        if self._ts_file is not None:
+            import numpy as np
+
+            if timestamps_ns is None or len(timestamps_ns) != n:
+                raise ValueError("La captura requiere timestamp por paquete")
+            ts = np.ascontiguousarray(timestamps_ns, dtype=np.int64)
+            if n and (
+                (self._last_ts is not None and ts[0] < self._last_ts) or np.any(ts[1:] < ts[:-1])
+            ):
+                raise ValueError("Los timestamps deben ser no decrecientes")
+            first = -self.count % INDEX_STRIDE
+            for i in range(first, n, INDEX_STRIDE):
+                self._index.append((int(ts[i]), self.count + i))
+            self._ts_file.write(ts)
+            if n:
+                self._last_ts = int(ts[-1])
+        self._file.write(data)
+        self.count += n
+        return n
+
+    def close(self):
+        if self._file is None:
+            return
+        flags = 0
+        if self._ts_file is not None:
+            flags |= FLAG_TIMESTAMPS
+            self._ts_file.close()
+            data_end = HEADER_SIZE + self.count * self.frame_length
+            self._file.write(bytes(_align8(data_end) - data_end))
+            with open(self._ts_path, "rb") as ts:
+                while chunk := ts.read(1 << 20):
+                    self._file.write(chunk)
+            os.remove(self._ts_path)
+            with open(self.path.with_name(self.path.name + INDEX_SUFFIX), "wb") as idx:
+                for entry in self._index:
+                    idx.write(_INDEX_ENTRY.pack(*entry))
+
+        self._file.seek(0)
+        self._file.write(
+            HEADER.pack(
+                MAGIC, VERSION, flags, self.frame_length, 0, self.count, self.base_time_ns
+            )
+        )
+        self._file.close()
+        self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class CaptureReader:
+    """
+    Acceso aleatorio a una captura mapeada en memoria.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+
+        magic, version, flags, frame_length, _, count, base_time_ns = HEADER.unpack_from(
+            self._mmap
+        )
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{self.path} no es una captura {CAPTURE_SUFFIX} válida")
+        self.frame_length = frame_length
+        self.count = count
+        self.base_time_ns = base_time_ns
+        self.has_timestamps = bool(flags & FLAG_TIMESTAMPS)
+
+        data_end = HEADER_SIZE + count * frame_length
+        self._data = self._view[HEADER_SIZE:data_end]
+        self._timestamps = None
+        if self.has_timestamps:
+            ts_start = _align8(data_end)
+            self._timestamps = self._view[ts_start : ts_start + 8 * count].cast("q")
+        self._index = self._load_index()
+
+    def _load_index(self):
+        idx_path = self.path.with_name(self.path.name + INDEX_SUFFIX)
+        if not self.has_timestamps or not idx_path.exists():
+            return None
+        raw = idx_path.read_bytes()
+        entries = [_INDEX_ENTRY.unpack_from(raw, i) for i in range(0, len(raw), _INDEX_ENTRY.size)]
+        return [t for t, _ in entries], [n for _, n in entries]
+
+    def __len__(self):
+        return self.count
+
+    def frame(self, i):
+        """
+        Paquete ``i`` como ``memoryview`` (sin copia).
+        """
+        if not 0 <= i < self.count:
+            raise IndexError(i)
+        start = i * self.frame_length
+        return self._data[start : start + self.frame_length]
+
+    def frames(self, start=0, stop=None):
+        """
+        Paquetes ``[start, stop)`` como un único ``memoryview`` contiguo.
+        """
+        stop = self.count if stop is None else min(stop, self.count)
+        return self._data[start * self.frame_length : stop * self.frame_length]
+
+    def __iter__(self):
+        for i in range(self.count):
+            yield self.frame(i)
+
+    def timestamp(self, i):
+        """
+        Timestamp absoluto (ns desde epoch) del paquete ``i``.
+        """
+        if self._timestamps is None:
+            raise ValueError("La captura no tiene timestamps")
+        return self.base_time_ns + self._timestamps[i]
+
+    def index_at_time(self, time_ns):
+        """
+        Primer paquete con timestamp >= ``time_ns`` (absoluto). Usa el índice
+        lateral para acotar la búsqueda a un bloque de ``INDEX_STRIDE``.
+        """
+        if self._timestamps is None:
+            raise ValueError("La captura no tiene timestamps")
+        relative = time_ns - self.base_time_ns
+        lo, hi = 0, self.count
+        if self._index is not None:
+            times, numbers = self._index
+            block = bisect.bisect_left(times, relative)
+            if block > 0:
+                lo = numbers[block - 1]
+            if block < len(numbers):
+                hi = numbers[block]
+        return bisect.bisect_left(self._timestamps, relative, lo, hi)
+
+    def as_array(self):
+        """
+        Matriz NumPy ``(N, frame_length)`` sobre el mmap (sin copia).
+        """
+        import numpy as np
+
+        return np.frombuffer(
+            self._mmap, dtype=np.uint8, count=self.count * self.frame_length, offset=HEADER_SIZE
+        ).reshape(-1, self.frame_length)
+
+    def timestamps_array(self):
+        import numpy as np
+
+        if self._timestamps is None:
+            return None
+        offset = _align8(HEADER_SIZE + self.count * self.frame_length)
+        return np.frombuffer(self._mmap, dtype=np.int64, count=self.count, offset=offset)
+
+    def close(self):
+        self._timestamps = None
+        self._data = None
+        self._view.release()
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass  # Aún hay memoryviews del usuario vivas; se cierra al liberarlas
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,128 @@
+"""
+Decodificador de paquetes de la contadora Glory (UWF).
+
+Valida el checksum y extrae los campos directamente de los bytes del paquete,
+sin decodificar a ``str`` ni construir diccionarios intermedios.
+
+Checksum: XOR de todos los bytes entre STX (excluido) y ETX (incluido).
+Equivale a que el XOR del paquete completo (STX ... checksum) sea igual a STX.
+Los paquetes editados a mano sin recalcular el checksum se descartan (ver
+docs/ARCHIVOS_LOG_GENERADOS.md, "Compatibilidad con el visor").
+"""
+
+from typing import NamedTuple
+
+from protocol.framing import FRAME_LENGTH, STX
+
+# Posiciones dentro del paquete completo (STX en la posición 0)
+STATUS_POS = 3
+RECHAZO_SENSOR_POS = 6
+MONTO_SLICE = slice(8, 21)  # 13 dígitos
+PIEZAS_SLICE = slice(24, 28)  # 4 dígitos
+
+_ASCII_ZERO = 0x30
+_ASCII_ONE = 0x31
+
+# Tabla precalculada "0000".."9999" -> entero (valida dígitos en la misma consulta)
+_PIEZAS_TABLE = {b"%04d" % i: i for i in range(10000)}
+
+
+class Reading(NamedTuple):
+    """
+    Lectura decodificada de un paquete.
+    """
+
+    monto: int
+    piezas: int
+    status: bool
+    rechazo_sensor: bool
+
+
+def frame_checksum_ok(frame, _from_bytes=int.from_bytes):
+    """
+    Verifica el checksum plegando el paquete como un entero: el XOR de los
+    30 bytes se reduce a un byte con 5 desplazamientos en lugar de un bucle.
+    """
+    x = _from_bytes(frame, "little")
+    x ^= x >> 128
+    x ^= x >> 64
+    x ^= x >> 32
+    x ^= x >> 16
+    x ^= x >> 8
+    return x & 0xFF == STX[0]
+
+
+def compute_checksum(payload_and_etx):
+    """
+    Calcula el checksum de los bytes entre STX y ETX (ETX incluido).
+    """
+    checksum = 0
+    for b in payload_and_etx:
+        checksum ^= b
+    return checksum
+
+
+class FrameDecoder:
+    """
+    Decodifica paquetes completos y contabiliza los descartados.
+    Los paquetes inválidos devuelven ``None`` y no deben llegar a la GUI.
+    """
+
+    def __init__(self, verify_checksum=True):
+        self.verify_checksum = verify_checksum
+        self.decoded = 0
+        self.checksum_errors = 0
+        self.malformed = 0
+
+    @property
+    def invalid(self):
+        return self.checksum_errors + self.malformed
+
+    def decode(
+        self,
+        frame,
+        _from_bytes=int.from_bytes,
+        _piezas_get=_PIEZAS_TABLE.get,
+        _new_reading=tuple.__new__,
+    ):
+        """
+        Devuelve un ``Reading`` o ``None`` si el paquete es inválido.
+        Los argumentos con guion bajo son enlaces locales para el camino rápido.
+        """
+        if len(frame) != FRAME_LENGTH:
+            self.malformed += 1
+            return None
+
+        if self.verify_checksum:
+            # Igual que frame_checksum_ok(), en línea para evitar la llamada
+            x = _from_bytes(frame, "little")
+            x ^= x >> 128
+            x ^= x >> 64
+            x ^= x >> 32
+            x ^= x >> 16
+            x ^= x >> 8
+            if x & 0xFF != 0x02:
+                self.checksum_errors += 1
+                return None
+
+        piezas = _piezas_get(frame[24:28])  # PIEZAS_SLICE
+        if piezas is None:
+            self.malformed += 1
+            return None
+        monto_digits = frame[8:21]  # MONTO_SLICE
+        # int() también acepta signo, espacios y "_": solo dígitos ASCII
+        if not monto_digits.isdigit():
+            self.malformed += 1
+            return None
+        monto = int(monto_digits)  # int() acepta bytes sin pasar por str
+
+        self.decoded += 1
+        return _new_reading(
+            Reading,
+            (
+                monto,
+                piezas,
+                frame[STATUS_POS] != _ASCII_ZERO,
+                frame[RECHAZO_SENSOR_POS] == _ASCII_ONE,
+            ),
+        )
@@ -0,0 +1,33 @@
+"""
+Codificador de paquetes de la contadora Glory (UWF), inverso de
+``protocol/decoder.py``. Lo usan los benchmarks y generadores de datos
+sintéticos para producir paquetes con checksum válido.
+
+Campos que el visor no interpreta (cabecera y bytes 21-23) se rellenan con
+los valores más frecuentes en las capturas reales.
+"""
+
+from protocol.framing import ETX, STX
+
+_HEADER = b"00%c10%c0"  # payload[0:7]: status en [2], rechazo_sensor en [5]
+_RESERVED = b"000"  # payload[20:23]
+
+
+def encode_payload(monto, piezas, status=True, rechazo_sensor=False):
+    """
+    Payload ASCII de 27 bytes (sin STX/ETX).
+    """
+    header = _HEADER % (0x31 if status else 0x30, 0x31 if rechazo_sensor else 0x30)
+    return b"%s%013d%s%04d" % (header, monto, _RESERVED, piezas)
+
+
+def encode_frame(monto, piezas, status=True, rechazo_sensor=False):
+    """
+    Paquete completo STX + payload + ETX + checksum (30 bytes).
+    """
+    body = encode_payload(monto, piezas, status, rechazo_sensor) + ETX
+    checksum = int.from_bytes(body, "little")
+    # Pliegue XOR a un byte, como frame_checksum_ok()
+    for shift in (128, 64, 32, 16, 8):
+        checksum ^= checksum >> shift
+    return STX + body + bytes((checksum & 0xFF,))
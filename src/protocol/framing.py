@@ -0,0 +1,126 @@
+"""
+Framer incremental para el protocolo de la contadora Glory (UWF).
+
+Reemplaza la lectura byte a byte (``ser.read(1)``) por lecturas en bloque:
+los bytes recibidos se acumulan en un buffer reutilizable y los delimitadores
+STX/ETX se buscan con ``bytearray.find``, que recorre el buffer en C.
+"""
+
+# --- Constantes del Protocolo ---
+STX = b"\x02"  # Start of Text
+ETX = b"\x03"  # End of Text
+PAYLOAD_LENGTH = 27  # Longitud esperada del payload en caracteres
+FRAME_LENGTH = PAYLOAD_LENGTH + 3  # STX + payload + ETX + checksum
+
+# Lectura máxima por llamada al puerto serie
+READ_CHUNK_SIZE = 4096
+
+
+class FrameScanner:
+    """
+    Extrae paquetes completos de un flujo de bytes que llega en trozos
+    arbitrarios. Tolera paquetes partidos entre lecturas y ruido entre
+    paquetes: todo lo que no forme un paquete STX + payload + ETX + checksum
+    se descarta y se contabiliza en ``discarded_bytes``.
+    """
+
+    def __init__(self, payload_length=PAYLOAD_LENGTH):
+        self.payload_length = payload_length
+        self.buffer = bytearray()
+        self.frames = 0
+        self.discarded_bytes = 0
+
+    def feed(self, data):
+        """
+        Agrega ``data`` al buffer y devuelve la lista de paquetes completos
+        (``bytes`` desde STX hasta el checksum inclusive) encontrados.
+        El checksum no se valida aquí, ver ``protocol.decoder``.
+        """
+        buf = self.buffer
+        buf += data
+        etx_offset = self.payload_length + 1
+        frames = []
+        pos = 0
+
+        while True:
+            start = buf.find(STX, pos)
+            if start < 0:
+                # Ningún inicio de paquete: todo lo pendiente es ruido
+                self.discarded_bytes += len(buf) - pos
+                pos = len(buf)
+                break
+
+            self.discarded_bytes += start - pos
+            end = start + etx_offset
+            if end + 1 >= len(buf):
+                # Paquete incompleto: se conserva desde STX hasta la próxima lectura
+                pos = start
+                break
+
+            if buf[end] == ETX[0]:
+                frames.append(bytes(buf[start : end + 2]))
+                pos = end + 2
+            else:
+                # STX falso o paquete truncado: resincronizar en el siguiente STX
+                self.discarded_bytes += 1
+                pos = start + 1
+
+        del buf[:pos]
+        self.frames += len(frames)
+        return frames
+
+    def reset(self):
+        """
+        Descarta el paquete parcial pendiente (ej. tras una reconexión).
+        """
+        self.buffer.clear()
+
+
+class RepeatFilter:
+    """
+    Detecta paquetes idénticos byte a byte al anterior. En reposo la
+    contadora retransmite el mismo estado sin cesar; una repetición exacta
+    produce la misma lectura, que ``CumulativeCounter.update`` aplica sin
+    efecto (sin diferencia de piezas ni monto no hay evento), así que
+    decodificarla, contarla y mostrarla se puede omitir sin alterar la
+    lógica de desbordamiento/reinicio.
+
+    Se compara contra el paquete anterior aunque este haya sido inválido:
+    la repetición fallaría igual en el decodificador.
+    """
+
+    def __init__(self):
+        self.last = None
+        self.skipped = 0  # Repeticiones omitidas
+        self.processed = 0  # Paquetes distintos del anterior
+
+    def is_new(self, frame):
+        if frame == self.last:
+            self.skipped += 1
+            return False
+        self.last = frame
+        self.processed += 1
+        return True
+
+    def reset(self):
+        """
+        Olvida el último paquete: el siguiente se procesa siempre (ej. tras
+        una reconexión, cuando la GUI dejó de mostrar la última lectura).
+        """
+        self.last = None
+
+    def stats(self):
+        total = self.skipped + self.processed
+        return {
+            "processed": self.processed,
+            "skipped": self.skipped,
+            "skipped_ratio": self.skipped / total if total else 0.0,
+        }
+
+
+def read_chunk(ser, max_size=READ_CHUNK_SIZE):
+    """
+    Lee todo lo disponible en el puerto (hasta ``max_size`` bytes). Si no hay
+    nada esperando, bloquea por al menos un byte respetando el timeout del puerto.
+    """
+    return ser.read(min(max(ser.in_waiting, 1), max_size))
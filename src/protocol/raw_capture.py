@@ -0,0 +1,175 @@
+"""
+Captura cruda del puerto serie (``.uwfraw``): cada bloque tal como lo
+entregó ``read`` con su instante de llegada, incluidos paquetes partidos,
+ruido y silencios. A diferencia de ``.uwfcap`` (paquetes completos, cabecera
+escrita al cerrar) es solo de anexar: lo escrito hasta un corte se puede leer.
+
+    [cabecera 24 B][registro]...
+
+- Cabecera: ``<8sqq`` = magic, tiempo base (ns desde epoch) y reloj
+  monótono base (ns) al abrir.
+- Registro: ``<IH`` = µs desde el registro anterior (o desde la cabecera) y
+  longitud, seguido de los bytes. Un hueco de más de ``0xFFFFFFFF`` µs
+  (~71 min) se escribe con registros vacíos de relleno; los bloques de más
+  de 65535 bytes, en varios registros.
+
+Un registro a medias al final (proceso interrumpido) se ignora al leer.
+"""
+
+import struct
+import time
+from pathlib import Path
+
+RAW_CAPTURE_SUFFIX = ".uwfraw"
+MAGIC = b"UWFRAW\x00\x01"
+HEADER = struct.Struct("<8sqq")
+HEADER_SIZE = HEADER.size  # 24
+RECORD = struct.Struct("<IH")
+MAX_DELTA_US = 0xFFFFFFFF
+MAX_CHUNK = 0xFFFF
+BUFFER_SIZE = 1 << 16
+
+
+def is_raw_capture_file(path):
+    return Path(path).suffix == RAW_CAPTURE_SUFFIX
+
+
+class RawCaptureWriter:
+    """
+    Anexa bloques con su instante de llegada. Las escrituras pasan por un
+    buffer de ``buffer_size`` bytes que se vuelca al disco cuando se llena
+    o, si llegan datos, cada ``flush_interval`` segundos como máximo: el
+    lector solo paga un ``pack`` y una copia a memoria por bloque.
+    """
+
+    def __init__(
+        self,
+        path,
+        flush_interval=1.0,
+        buffer_size=BUFFER_SIZE,
+        clock=time.monotonic_ns,
+        wall_clock=time.time_ns,
+    ):
+        self.path = Path(path)
+        self._clock = clock
+        self._flush_ns = int(flush_interval * 1e9)
+        # "xb": una captura nunca pisa otra
+        self._file = open(self.path, "xb", buffering=buffer_size)
+        self._base_ns = clock()
+        self._file.write(HEADER.pack(MAGIC, wall_clock(), self._base_ns))
+        self._last_us = 0
+        self._next_flush = self._base_ns + self._flush_ns
+        self.chunks = 0
+        self.bytes = 0
+
+    def write(self, chunk, _pack=RECORD.pack):
+        """
+        Anota ``chunk`` con el instante actual.
+        """
+        f = self._file
+        if f is None:
+            return  # Cerrado: el lector pudo seguir un instante tras el cierre
+        now = self._clock()
+        now_us = (now - self._base_ns) // 1000
+        delta = now_us - self._last_us
+        self._last_us = now_us
+        while delta > MAX_DELTA_US:
+            f.write(_pack(MAX_DELTA_US, 0))
+            delta -= MAX_DELTA_US
+        if len(chunk) > MAX_CHUNK:
+            view = memoryview(chunk)
+            for i in range(0, len(view), MAX_CHUNK):
+                f.write(_pack(delta if i == 0 else 0, len(view[i : i + MAX_CHUNK])))
+                f.write(view[i : i + MAX_CHUNK])
+        else:
+            f.write(_pack(delta, len(chunk)) + chunk)
+        self.chunks += 1
+        self.bytes += len(chunk)
+        if now >= self._next_flush:
+            f.flush()
+            self._next_flush = now + self._flush_ns
+
+    def flush(self):
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self):
+        f, self._file = self._file, None
+        if f is not None:
+            f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def open_session(directory, prefix="uwf", **kwargs):
+    """
+    Nueva captura ``<prefix>-AAAAMMDD-HHMMSS[-n].uwfraw`` en ``directory``.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    stem = f"{prefix}-{time.strftime('%Y%m%d-%H%M%S')}"
+    for n in range(100):
+        name = stem + (f"-{n}" if n else "") + RAW_CAPTURE_SUFFIX
+        try:
+            return RawCaptureWriter(directory / name, **kwargs)
+        except FileExistsError:
+            continue
+    raise FileExistsError(directory / (stem + RAW_CAPTURE_SUFFIX))
+
+
+class RawCaptureReader:
+    """
+    Recorre una captura: ``(ns desde el inicio, bloque)`` por registro, en
+    orden. ``truncated`` indica si el último registro estaba incompleto.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        header = self._file.read(HEADER_SIZE)
+        if len(header) < HEADER_SIZE or header[:8] != MAGIC:
+            self.close()
+            raise ValueError(f"{self.path} no es una captura {RAW_CAPTURE_SUFFIX} válida")
+        _, self.base_time_ns, self.base_monotonic_ns = HEADER.unpack(header)
+        self.truncated = False
+
+    def __iter__(self):
+        f = self._file
+        f.seek(HEADER_SIZE)
+        read = f.read
+        unpack = RECORD.unpack
+        size = RECORD.size
+        elapsed_us = 0
+        while True:
+            record = read(size)
+            if len(record) < size:
+                self.truncated = bool(record)
+                return
+            delta, length = unpack(record)
+            elapsed_us += delta
+            if not length:
+                continue  # Relleno de un hueco largo
+            chunk = read(length)
+            if len(chunk) < length:
+                self.truncated = True
+                return
+            yield elapsed_us * 1000, chunk
+
+    def stream(self):
+        """
+        Todos los bytes seguidos, como llegaron por la línea.
+        """
+        return b"".join(chunk for _, chunk in self)
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
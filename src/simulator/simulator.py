@@ -4,13 +4,25 @@ Simulador de datos de conteo para la UWF (Visor Externo)
 Lee datos del archivo de log y los envía a través de un puerto serie virtual.
 """
 
+import argparse
+import itertools
 import os
 import sys
 import time
 from pathlib import Path
 import serial
 
+# Agregar el directorio src al path (para ejecutar el script directamente)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.pacing import DeadlineScheduler, line_capacity_fps
+from protocol.capture import CaptureReader, is_capture_file
+from protocol.framing import FrameScanner
+from protocol.raw_capture import RawCaptureReader, is_raw_capture_file
+
 # Configuración
+# Monto editado a mano sin recalcular el checksum: el visor descarta casi todos
+# sus paquetes (ver docs/ARCHIVOS_LOG_GENERADOS.md)
 LOG_FILE_1 = Path(__file__).parent.parent / "data" / "conteo_real_solo_piezas.txt"
 LOG_FILE_2 = Path(__file__).parent.parent / "data" / "conteo_real_desbordamiento.txt"
 
@@ -19,6 +31,10 @@ SERIAL_PORT = (
 )
 BAUDRATE = 19200
 DELAY_BETWEEN_PACKETS = 0.1  # Segundos entre paquetes
+BURST_PERIOD = 0.25  # Segundos de envío agrupados en cada escritura en modo ráfaga
+BURST_MIN_BATCH = 8  # Paquetes por escritura en ráfaga como mínimo
+BURST_MAX_BATCH = 256  # Paquetes por escritura en ráfaga como máximo (y sin límite de ritmo)
+STATS_INTERVAL = 1.0  # Segundos entre líneas de estadísticas en modo silencioso
 
 # Detectar sistema operativo
 IS_LINUX = sys.platform.startswith("linux")
@@ -32,92 +48,338 @@ def parse_hex_line(line):
     Formato esperado: "02 30 30 ... 03 XX"
     """
     # Tomar solo la parte hexadecimal (antes del punto)
-    hex_part = line.split(".")[0].strip()
-
-    # Dividir por espacios y convertir a bytes
-    hex_values = hex_part.split()
+    hex_part = line.split(".", 1)[0]
 
     try:
-        packet = bytes([int(h, 16) for h in hex_values])
-
-        # Validar que el paquete tenga la estructura correcta
-        # STX (02) ... ETX (03) ... CHECKSUM
-        if len(packet) >= 3 and packet[0] == 0x02 and packet[-2] == 0x03:
-            return packet
-        else:
-            return None
+        # bytes.fromhex ignora los espacios entre pares: una sola llamada en C
+        packet = bytes.fromhex(hex_part)
     except ValueError:
         return None
 
+    # Validar que el paquete tenga la estructura correcta
+    # STX (02) ... ETX (03) ... CHECKSUM
+    if len(packet) >= 3 and packet[0] == 0x02 and packet[-2] == 0x03:
+        return packet
+    return None
+
 
-def read_log_file(filepath):
+def _parse_lines(f, verbose):
     """
-    Lee el archivo de log y extrae todos los paquetes.
+    Archivo de texto -> paquetes válidos, línea a línea.
     """
-    packets = []
+    for line_num, line in enumerate(f, 1):
+        if line.isspace() or not line:
+            continue
+        packet = parse_hex_line(line)
+        if packet is not None:
+            yield packet
+        elif verbose:
+            print(f"⚠️  Línea {line_num}: No se pudo parsear")
 
-    try:
-        with open(filepath, "r") as f:
-            for line_num, line in enumerate(f, 1):
-                line = line.strip()
-                if not line:
-                    continue
-
-                packet = parse_hex_line(line)
-                if packet:
-                    packets.append(packet)
-                else:
-                    print(f"⚠️  Línea {line_num}: No se pudo parsear")
 
+def iter_packets(filepath, verbose=True, start=0, loop=False):
+    """
+    Genera los paquetes del log de forma perezosa, con memoria constante:
+    archivo -> línea -> ``bytes.fromhex`` -> validación. El primer paquete
+    está disponible sin leer el resto del archivo.
+
+    - ``start``: empieza en el paquete válido número ``start`` (en capturas
+      ``.uwfcap`` se salta directo; en texto se recorren las líneas previas
+      sin enviarlas).
+    - ``loop``: al llegar al final vuelve a empezar desde el paquete 0, sin
+      fin (pruebas de larga duración). Si una vuelta completa no da ningún
+      paquete (log vacío o sin paquetes válidos), termina.
+
+    De una captura cruda ``.uwfraw`` salen los paquetes completos que separa
+    el framer (sin ruido ni tiempos; para eso, ``stream_chunks``).
+
+    Lanza ``FileNotFoundError`` al pedir el primer paquete si no existe.
+    """
+    first_pass = True
+    while True:
+        skip = start if first_pass else 0
+        yielded = 0
+        if is_capture_file(filepath):
+            with CaptureReader(filepath) as reader:
+                for i in range(skip, len(reader)):
+                    yielded += 1
+                    yield reader.frame(i)
+        elif is_raw_capture_file(filepath):
+            with RawCaptureReader(filepath) as reader:
+                scanner = FrameScanner()
+                frames = (f for _, chunk in reader for f in scanner.feed(chunk))
+                for frame in itertools.islice(frames, skip, None):
+                    yielded += 1
+                    yield frame
+        else:
+            with open(filepath, "r") as f:
+                packets = _parse_lines(f, verbose and first_pass)
+                for packet in itertools.islice(packets, skip, None):
+                    yielded += 1
+                    yield packet
+        # Una vuelta desde el inicio sin paquetes: en bucle no terminaría nunca
+        if not loop or (not yielded and not skip):
+            return
+        first_pass = False
+
+
+def read_log_file(filepath, verbose=True):
+    """
+    Lee el archivo de log y extrae todos los paquetes.
+    Acepta logs de texto o capturas binarias ``.uwfcap`` (paquetes como
+    ``memoryview`` sobre el archivo mapeado, sin copia).
+    Con ``verbose=False`` no avisa de las líneas que no se pueden parsear.
+    Para archivos grandes, ver ``iter_packets`` (no carga todo en memoria).
+    """
+    try:
+        return list(iter_packets(filepath, verbose=verbose))
     except FileNotFoundError:
         print(f"❌ Archivo no encontrado: {filepath}")
         return None
 
-    return packets
-
 
 def send_packets(
-    packets, port=SERIAL_PORT, baudrate=BAUDRATE, delay=DELAY_BETWEEN_PACKETS
+    packets,
+    port=SERIAL_PORT,
+    baudrate=BAUDRATE,
+    delay=DELAY_BETWEEN_PACKETS,
+    rate=None,
+    burst=False,
+    quiet=False,
 ):
     """
     Envía los paquetes a través del puerto serie.
+    Ver ``stream_packets`` para ``rate``, ``burst`` y ``quiet``.
     """
     try:
-        ser = serial.Serial(
-            port=port,
-            baudrate=baudrate,
-            bytesize=serial.EIGHTBITS,
-            parity=serial.PARITY_NONE,
-            stopbits=serial.STOPBITS_ONE,
-            timeout=1,
-        )
-        print(f"✅ Puerto {port} abierto correctamente")
-        print(f"📊 Enviando {len(packets)} paquetes...\n")
-
-        for i, packet in enumerate(packets, 1):
-            try:
-                ser.write(packet)
-                print(f"[{i:3d}/{len(packets)}] Enviado: {packet.hex().upper()}")
-                time.sleep(delay)
-            except Exception as e:
-                print(f" Error al enviar paquete {i}: {e}")
-
-        print(f"\n✅ Simulación completada. {len(packets)} paquetes enviados.")
+        ser = _open_port(port, baudrate)
+        if hasattr(packets, "__len__"):
+            print(f"📊 Enviando {len(packets)} paquetes...\n")
+        else:
+            print("📊 Enviando paquetes a medida que se leen del log...\n")
+
+        if rate is None:
+            rate = line_capacity_fps(baudrate) if burst else 1 / delay
+        stream_packets(ser, packets, rate=rate, burst=burst, quiet=quiet)
         ser.close()
 
     except serial.SerialException as e:
-        print(f" Error al abrir puerto serie: {e}")
-        print("\n💡 Soluciones:")
-        print("   - En Windows: Asegúrate de que COM3 existe")
-        print(
-            "   - En Linux: Usa 'socat -d -d pty,raw,echo=0 pty,raw,echo=0' para crear puertos virtuales"
-        )
-        print("   - O modifica SERIAL_PORT en este script")
+        _print_port_help(e)
+        return False
+
+    return True
+
+
+def send_capture(path, port=SERIAL_PORT, baudrate=BAUDRATE, speed=1.0, loop=False, quiet=False):
+    """
+    Reproduce una captura cruda ``.uwfraw`` por el puerto serie.
+    Ver ``stream_chunks`` para ``speed``, ``loop`` y ``quiet``.
+    """
+    try:
+        ser = _open_port(port, baudrate)
+        print("📊 Reproduciendo los bloques leídos en la captura...\n")
+        stream_chunks(ser, path, speed=speed, loop=loop, quiet=quiet)
+        ser.close()
+    except serial.SerialException as e:
+        _print_port_help(e)
         return False
 
     return True
 
 
+def _open_port(port, baudrate):
+    ser = serial.Serial(
+        port=port,
+        baudrate=baudrate,
+        bytesize=serial.EIGHTBITS,
+        parity=serial.PARITY_NONE,
+        stopbits=serial.STOPBITS_ONE,
+        timeout=1,
+    )
+    print(f"✅ Puerto {port} abierto correctamente")
+    return ser
+
+
+def _print_port_help(error):
+    print(f" Error al abrir puerto serie: {error}")
+    print("\n💡 Soluciones:")
+    print("   - En Windows: Asegúrate de que COM3 existe")
+    print(
+        "   - En Linux: Usa 'socat -d -d pty,raw,echo=0 pty,raw,echo=0' para crear puertos virtuales"
+    )
+    print("   - O modifica SERIAL_PORT en este script")
+
+
+def stream_packets(
+    ser,
+    packets,
+    rate,
+    burst=False,
+    quiet=False,
+    stats_interval=STATS_INTERVAL,
+    clock=time.perf_counter,
+    sleep=time.sleep,
+):
+    """
+    Envía ``packets`` por ``ser`` a ``rate`` paquetes/s sin deriva acumulada.
+
+    - ``burst``: agrupa los paquetes de cada ``BURST_PERIOD`` en una sola
+      escritura (una llamada al sistema por lote en lugar de por paquete),
+      entre ``BURST_MIN_BATCH`` y ``BURST_MAX_BATCH`` paquetes. A la
+      capacidad de la línea (19200 baud, 64 paquetes/s) son 16 por escritura.
+    - ``quiet``: en vez de imprimir cada paquete, una línea de estadísticas
+      cada ``stats_interval`` segundos.
+    - ``rate`` <= 0: lo más rápido posible.
+
+    Devuelve un dict con el rendimiento logrado y el jitter de planificación.
+    """
+    total = len(packets) if hasattr(packets, "__len__") else None
+    batch_size = 1
+    if burst:
+        batch_size = BURST_MAX_BATCH
+        if rate > 0:
+            batch_size = min(BURST_MAX_BATCH, max(BURST_MIN_BATCH, round(rate * BURST_PERIOD)))
+    scheduler = DeadlineScheduler(rate, clock=clock, sleep=sleep)
+
+    sent = 0
+    sent_bytes = 0
+    writes = 0
+    next_stats = stats_interval
+    batch = []
+
+    def flush():
+        nonlocal sent, sent_bytes, writes
+        scheduler.wait(sent)
+        data = b"".join(batch) if len(batch) > 1 else batch[0]
+        try:
+            ser.write(data)
+        except Exception as e:
+            print(f" Error al enviar paquete {sent + 1}: {e}")
+        writes += 1
+        sent_bytes += len(data)
+        for packet in batch:
+            sent += 1
+            if not quiet:
+                print(f"[{sent:3d}/{total or '?'}] Enviado: {packet.hex().upper()}")
+        batch.clear()
+
+    for packet in packets:
+        batch.append(packet)
+        if len(batch) >= batch_size:
+            flush()
+            if quiet and scheduler.elapsed() >= next_stats:
+                _print_stats(sent, sent_bytes, scheduler)
+                next_stats += stats_interval
+    if batch:
+        flush()
+
+    elapsed = scheduler.elapsed()
+    jitter = scheduler.jitter
+    report = {
+        "frames": sent,
+        "bytes": sent_bytes,
+        "writes": writes,
+        "elapsed": elapsed,
+        "frames_per_s": sent / elapsed if elapsed else 0.0,
+        "bytes_per_s": sent_bytes / elapsed if elapsed else 0.0,
+        "target_frames_per_s": rate,
+        "jitter_mean_ms": jitter.mean * 1000,
+        "jitter_stdev_ms": jitter.stdev * 1000,
+        "jitter_max_ms": jitter.max * 1000,
+    }
+    print(f"\n✅ Simulación completada. {sent} paquetes enviados en {writes} escrituras.")
+    target = f"objetivo {rate:.1f} paquetes/s" if rate > 0 else "sin límite"
+    print(
+        f"📈 {report['frames_per_s']:.1f} paquetes/s ({report['bytes_per_s']:.0f} B/s), {target}"
+    )
+    print(
+        f"⏱️  Jitter: media {report['jitter_mean_ms']:.3f} ms, "
+        f"desv. {report['jitter_stdev_ms']:.3f} ms, máx {report['jitter_max_ms']:.3f} ms"
+    )
+    return report
+
+
+def stream_chunks(
+    ser,
+    path,
+    speed=1.0,
+    loop=False,
+    quiet=False,
+    stats_interval=STATS_INTERVAL,
+    clock=time.perf_counter,
+    sleep=time.sleep,
+):
+    """
+    Reproduce una captura cruda ``.uwfraw`` por ``ser``: cada bloque tal
+    como se leyó, con los tiempos originales (``speed`` 1), ``speed`` veces
+    más rápido o, con ``speed`` <= 0, lo más rápido posible. El primer
+    bloque sale al empezar; con ``loop`` se repite sin fin.
+
+    Devuelve un dict con lo enviado y el retraso respecto a los tiempos
+    de la captura.
+    """
+    scheduler = DeadlineScheduler(speed, clock=clock, sleep=sleep)
+    sent = 0  # Bloques
+    sent_bytes = 0
+    offset = 0.0  # Segundos de captura ya reproducidos (vueltas anteriores)
+    next_stats = stats_interval
+    while True:
+        last = 0.0
+        with RawCaptureReader(path) as reader:
+            for t_ns, chunk in reader:
+                last = t_ns / 1e9
+                if speed > 0:
+                    scheduler.wait_at((offset + last) / speed)
+                try:
+                    ser.write(chunk)
+                except Exception as e:
+                    print(f" Error al enviar bloque {sent + 1}: {e}")
+                sent += 1
+                sent_bytes += len(chunk)
+                if not quiet:
+                    print(f"[{last:9.3f}s] {len(chunk):4d} B: {chunk.hex().upper()}")
+                elif scheduler.elapsed() >= next_stats:
+                    elapsed = scheduler.elapsed()
+                    print(
+                        f"[{elapsed:7.1f}s] {sent} bloques, {sent_bytes / elapsed:.0f} B/s, "
+                        f"retraso máx {scheduler.jitter.max * 1000:.2f} ms"
+                    )
+                    next_stats += stats_interval
+            if reader.truncated:
+                print("⚠️  Último registro incompleto (captura interrumpida)")
+        if not loop or not sent:
+            break
+        offset += last
+
+    elapsed = scheduler.elapsed()
+    jitter = scheduler.jitter
+    report = {
+        "chunks": sent,
+        "bytes": sent_bytes,
+        "elapsed": elapsed,
+        "capture_seconds": offset + last,
+        "bytes_per_s": sent_bytes / elapsed if elapsed else 0.0,
+        "speed": speed,
+        "jitter_mean_ms": jitter.mean * 1000,
+        "jitter_max_ms": jitter.max * 1000,
+    }
+    print(f"\n✅ Reproducción completada. {sent} bloques ({sent_bytes} B) en {elapsed:.2f} s.")
+    if speed > 0:
+        print(
+            f"⏱️  Retraso respecto a la captura (x{speed:g}): media {report['jitter_mean_ms']:.3f} ms, "
+            f"máx {report['jitter_max_ms']:.3f} ms"
+        )
+    return report
+
+
+def _print_stats(sent, sent_bytes, scheduler):
+    elapsed = scheduler.elapsed()
+    print(
+        f"[{elapsed:7.1f}s] {sent} paquetes, {sent / elapsed:.1f} paquetes/s, "
+        f"{sent_bytes / elapsed:.0f} B/s, jitter máx {scheduler.jitter.max * 1000:.2f} ms"
+    )
+
+
 def get_serial_port():
     """
     Detecta el puerto serie a usar según el SO.
@@ -138,30 +400,75 @@ def main():
     """
     Función principal.
     """
+    parser = argparse.ArgumentParser(description="Simulador de conteo UWF")
+    parser.add_argument("--log", type=Path, default=LOG_FILE_2, help="Log de texto, .uwfcap o .uwfraw")
+    parser.add_argument("--port", default=None)
+    parser.add_argument("--baudrate", type=int, default=BAUDRATE)
+    parser.add_argument(
+        "--rate", type=float, default=None,
+        help="Paquetes por segundo (0 = sin límite). Por defecto 1/delay, o la capacidad de la línea en ráfaga",
+    )
+    parser.add_argument("--burst", action="store_true", help="Varios paquetes por escritura")
+    parser.add_argument("--quiet", action="store_true", help="Estadísticas periódicas en vez de cada paquete")
+    parser.add_argument("--start", type=int, default=0, help="Empezar en este paquete del log")
+    parser.add_argument("--loop", action="store_true", help="Repetir el log sin fin (Ctrl+C para salir)")
+    parser.add_argument(
+        "--speed", type=float, default=1.0,
+        help="Capturas .uwfraw: 1 = tiempos originales, N = N veces más rápido, 0 = sin pausas",
+    )
+    args = parser.parse_args()
+
     print("=" * 60)
     print("🔄 SIMULADOR DE CONTEO - UWF (Visor Externo)")
     print("=" * 60)
-    print(f"📁 Archivo de log: {LOG_FILE_2}")
+    print(f"📁 Archivo de log: {args.log}")
 
     # Detectar puerto
-    port = get_serial_port()
+    port = args.port or get_serial_port()
     print(f"🔌 Puerto serie: {port}")
-    print(f"⚙️  Baudrate: {BAUDRATE}")
-    print(f"⏱️  Delay entre paquetes: {DELAY_BETWEEN_PACKETS}s")
+    print(f"⚙️  Baudrate: {args.baudrate}")
+    if is_raw_capture_file(args.log):
+        # Captura cruda: bloques y tiempos tal como se leyeron del puerto
+        if not args.log.exists():
+            print(f"❌ Archivo no encontrado: {args.log}")
+            return False
+        pace = f"x{args.speed:g} sobre los tiempos originales" if args.speed > 0 else "sin pausas"
+        print(f"⏱️  Ritmo: {pace}{', en bucle' if args.loop else ''}")
+        print("=" * 60 + "\n")
+        return send_capture(
+            args.log, port=port, baudrate=args.baudrate, speed=args.speed, loop=args.loop, quiet=args.quiet
+        )
+    if args.rate is None and not args.burst:
+        print(f"⏱️  Delay entre paquetes: {DELAY_BETWEEN_PACKETS}s")
+    else:
+        rate = args.rate if args.rate is not None else line_capacity_fps(args.baudrate)
+        print(f"⏱️  Ritmo: {rate:.1f} paquetes/s{' (ráfaga)' if args.burst else ''}")
     print("=" * 60 + "\n")
 
-    # Leer archivo de log
-    packets = read_log_file(LOG_FILE_2)
-
-    if not packets:
+    # Paquetes leídos del log a medida que se envían (memoria constante)
+    packets = iter_packets(args.log, start=args.start, loop=args.loop)
+    try:
+        first = next(packets, None)
+    except FileNotFoundError:
+        print(f"❌ Archivo no encontrado: {args.log}")
+        return False
+    if first is None:
         print("No se pudieron cargar los paquetes")
         return False
-
-    print(f"✅ Se cargaron {len(packets)} paquetes\n")
+    packets = itertools.chain([first], packets)
+    if args.start or args.loop:
+        print(f"▶️  Desde el paquete {args.start}{', en bucle' if args.loop else ''}\n")
 
     # Enviar paquetes
     # input("Presiona ENTER para comenzar la simulación...")
-    return send_packets(packets, port=port)
+    return send_packets(
+        packets,
+        port=port,
+        baudrate=args.baudrate,
+        rate=args.rate,
+        burst=args.burst,
+        quiet=args.quiet,
+    )
 
 
 if __name__ == "__main__":
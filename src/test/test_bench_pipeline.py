@@ -0,0 +1,51 @@
+"""
+Pruebas del benchmark por etapas (bench/bench_pipeline.py).
+Verifica:
+- Que el flujo sintético llega completo a través del framing y el decodificador
+- Que los paquetes corruptos del escenario con ruido se descartan por checksum
+- Que la comparación marca como regresión solo lo que supera la tolerancia
+"""
+
+import sys
+from pathlib import Path
+
+# Agregar el directorio src al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bench.bench_pipeline import STAGES, compare, run_pipeline
+from bench.synthetic import synthetic_stream
+
+
+def test_counting_stream_roundtrip():
+    """Todos los paquetes generados se decodifican y el total refleja los desbordamientos."""
+    stream, injected = synthetic_stream(3000, "conteo", seed=1)
+    times, counts = run_pipeline(stream, chunk_size=61)
+    assert set(times) == set(STAGES)
+    assert counts["frames"] == counts["readings"] == 3000
+    assert counts["discarded_bytes"] == 0
+    assert injected["overflows"] > 0
+    assert counts["final_total"] >= injected["overflows"] * 10000
+
+
+def test_noisy_stream_drops_corrupted():
+    """El ruido se descarta y los paquetes alterados fallan el checksum."""
+    stream, injected = synthetic_stream(3000, "ruido", seed=2)
+    _, counts = run_pipeline(stream)
+    assert injected["noise_bytes"] > 0 and injected["corrupted"] > 0
+    assert counts["checksum_errors"] >= injected["corrupted"]
+    assert counts["readings"] == 3000 - injected["corrupted"]
+
+
+def test_compare_flags_regressions():
+    """Solo las etapas más lentas que la tolerancia cuentan como regresión."""
+    reference = {"results": [
+        {"scenario": "conteo", "frames": 10, "stage": "decode", "ns_per_frame": 100.0},
+        {"scenario": "conteo", "frames": 10, "stage": "render", "ns_per_frame": 100.0},
+    ]}
+    current = {"results": [
+        {"scenario": "conteo", "frames": 10, "stage": "decode", "ns_per_frame": 110.0},
+        {"scenario": "conteo", "frames": 10, "stage": "render", "ns_per_frame": 130.0},
+        {"scenario": "ruido", "frames": 10, "stage": "render", "ns_per_frame": 500.0},
+    ]}
+    rows = compare(current, reference, tolerance=0.15)
+    assert [(key[2], bad) for key, _, _, _, bad in rows] == [("decode", False), ("render", True)]
@@ -0,0 +1,83 @@
+"""
+Pruebas del formato binario de capturas (protocol/capture.py).
+Verifica:
+- Que la conversión desde texto conserva los paquetes
+- El acceso aleatorio por número de paquete y por tiempo
+- Que el simulador puede leer capturas binarias
+- Que la escritura por bloques equivale a la escritura paquete a paquete
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Agregar el directorio src al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from protocol.capture import INDEX_STRIDE, CaptureReader, CaptureWriter
+from simulator.simulator import read_log_file
+from tools.convert_capture import convert
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+LOG_FILE = DATA_DIR / "conteo_real_desbordamiento.txt"
+
+
+def test_convert_roundtrip(tmp_path):
+    """Los paquetes de la captura binaria son los mismos que los del texto."""
+    out = tmp_path / "captura.uwfcap"
+    writer, _ = convert(LOG_FILE, out)
+    packets = read_log_file(LOG_FILE)
+
+    with CaptureReader(out) as reader:
+        assert len(reader) == writer.count == len(packets)
+        assert reader.frame(0) == packets[0]
+        assert reader.frame(len(reader) - 1) == packets[-1]
+        assert reader.frames(10, 12).tobytes() == packets[10] + packets[11]
+        assert not reader.has_timestamps
+
+
+def test_lookup_by_time(tmp_path):
+    """Búsqueda por tiempo a través del índice lateral."""
+    out = tmp_path / "tiempos.uwfcap"
+    frame = read_log_file(LOG_FILE)[0]
+    count = INDEX_STRIDE * 3 + 17
+    with CaptureWriter(out, with_timestamps=True, base_time_ns=1_000) as writer:
+        for i in range(count):
+            writer.write(frame, i * 10)
+
+    with CaptureReader(out) as reader:
+        assert reader.has_timestamps
+        assert reader.timestamp(5) == 1_050
+        assert reader.index_at_time(1_000) == 0
+        assert reader.index_at_time(1_000 + 10 * 2500) == 2500
+        assert reader.index_at_time(1_000 + 10 * 2500 - 5) == 2500
+        assert reader.index_at_time(10**12) == count
+
+
+def test_simulator_reads_capture(tmp_path):
+    """read_log_file acepta .uwfcap y devuelve los mismos paquetes."""
+    out = tmp_path / "sim.uwfcap"
+    convert(LOG_FILE, out)
+    assert [bytes(p) for p in read_log_file(out)] == read_log_file(LOG_FILE)
+
+
+def test_write_many_matches_write(tmp_path):
+    """Escribir por bloques produce el mismo archivo e índice que paquete a paquete."""
+    np = pytest.importorskip("numpy")
+    packets = read_log_file(LOG_FILE, verbose=False)
+    frames = np.frombuffer(b"".join(packets * 8), dtype=np.uint8).reshape(len(packets) * 8, -1)
+    timestamps = np.arange(len(frames), dtype=np.int64) * 7
+
+    with CaptureWriter(tmp_path / "uno.uwfcap", with_timestamps=True) as writer:
+        for i, frame in enumerate(frames):
+            writer.write(frame.tobytes(), int(timestamps[i]))
+    with CaptureWriter(tmp_path / "bloques.uwfcap", with_timestamps=True) as writer:
+        for start in range(0, len(frames), 1000):
+            writer.write_many(frames[start : start + 1000], timestamps[start : start + 1000])
+        with pytest.raises(ValueError):
+            writer.write_many(frames[:1], timestamps[:1])  # Timestamp hacia atrás
+
+    for suffix in ("", ".idx"):
+        one = (tmp_path / ("uno.uwfcap" + suffix)).read_bytes()
+        assert (tmp_path / ("bloques.uwfcap" + suffix)).read_bytes() == one
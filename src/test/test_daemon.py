@@ -0,0 +1,153 @@
+"""
+Pruebas del modo sin pantalla (daemon.py, core/reader.py, core/outputs.py).
+Verifica:
+- Que el modo sin pantalla no importa tkinter
+- Que las lecturas de un puerto (pty) llegan a una salida de archivo y el
+  apagado con el evento de parada cierra todo limpiamente
+- Que con captura cruda se guarda todo lo leído del puerto
+- Que sin el adaptador al arrancar se espera a que aparezca (sin salir con
+  error) y se publican los intentos en las métricas
+"""
+
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+import tty
+from pathlib import Path
+
+import pytest
+
+# Agregar el directorio src al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.metrics import MetricsRegistry
+from core.outputs import make_output
+from protocol.encoder import encode_frame
+from protocol.raw_capture import RawCaptureReader
+
+SRC_DIR = Path(__file__).parent.parent
+
+
+def test_daemon_does_not_import_tkinter():
+    """Importar el daemon no carga tkinter (arranque rápido sin display)."""
+    code = "import sys, daemon; print('tkinter' in sys.modules)"
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=SRC_DIR, capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip().splitlines()[-1] == "False"
+
+
+@pytest.mark.skipif(not hasattr(os, "openpty"), reason="Requiere pty")
+def test_daemon_reads_pty_to_file(tmp_path):
+    """Paquetes escritos en un pty terminan como líneas JSON en la salida."""
+    import daemon
+
+    master, slave = os.openpty()
+    tty.setraw(slave)  # Sin modo canónico: ETX (0x03) no es Ctrl+C
+    out_path = tmp_path / "lecturas.jsonl"
+    stop_event = threading.Event()
+    ready_event = threading.Event()
+    result = {}
+    thread = threading.Thread(
+        target=lambda: result.setdefault(
+            "code",
+            daemon.run(
+                os.ttyname(slave),
+                19200,
+                [make_output(f"file:{out_path}")],
+                stop_event,
+                state_dir=tmp_path / "state",
+                ready_event=ready_event,
+                capture_dir=tmp_path / "capturas",
+            ),
+        )
+    )
+    thread.start()
+    try:
+        # pyserial vacía la entrada al abrir: escribir solo con el puerto abierto
+        assert ready_event.wait(timeout=10)
+        frames = [encode_frame(1000 * i, 9990 + i if i < 5 else i, True) for i in range(10)]
+        os.write(master, b"".join(frames + frames[-1:]))  # Última repetida
+        time.sleep(0.5)
+    finally:
+        stop_event.set()
+        thread.join(timeout=5)
+        os.close(master)
+        os.close(slave)
+
+    assert not thread.is_alive() and result["code"] == 0
+    lines = [json.loads(line) for line in out_path.read_text().splitlines()]
+    assert len(lines) == 10  # La repetición exacta se omite
+    assert lines[-1]["total"] == 10000 + 9
+    snapshot = json.loads((tmp_path / "state" / "counter.snapshot").read_text())
+    assert snapshot["state"]["offset"] == 10000
+    (capture,) = (tmp_path / "capturas").glob("*.uwfraw")
+    with RawCaptureReader(capture) as reader:
+        assert reader.stream() == b"".join(frames + frames[-1:])
+
+
+@pytest.mark.skipif(not hasattr(os, "openpty"), reason="Requiere pty")
+def test_daemon_waits_for_missing_port(tmp_path):
+    """El adaptador conectado después de arrancar se abre como una reconexión."""
+    import daemon
+
+    port = tmp_path / "COM4"
+    out_path = tmp_path / "lecturas.jsonl"
+    stop_event = threading.Event()
+    ready_event = threading.Event()
+    registry = MetricsRegistry()
+    result = {}
+    thread = threading.Thread(
+        target=lambda: result.setdefault(
+            "code",
+            daemon.run(
+                str(port),
+                19200,
+                [make_output(f"file:{out_path}")],
+                stop_event,
+                state_dir=tmp_path / "state",
+                ready_event=ready_event,
+                metrics=registry,
+            ),
+        )
+    )
+    thread.start()
+    master, slave = os.openpty()
+    tty.setraw(slave)
+    try:
+        assert not ready_event.wait(timeout=0.3)  # Sigue esperando, no terminó
+        assert thread.is_alive()
+        os.symlink(os.ttyname(slave), port)
+        assert ready_event.wait(timeout=10)
+        os.write(master, encode_frame(0, 7, True))
+        time.sleep(0.5)
+    finally:
+        stop_event.set()
+        thread.join(timeout=5)
+        os.close(master)
+        os.close(slave)
+
+    assert not thread.is_alive() and result["code"] == 0
+    assert [json.loads(line)["total"] for line in out_path.read_text().splitlines()] == [7]
+    attempts = [
+        float(line.rsplit(" ", 1)[1])
+        for line in registry.render().splitlines()
+        if line.startswith("uwf_reconnect_attempts_total ")
+    ]
+    assert attempts and attempts[0] > 1  # Un solo reconector para el arranque y el lector
+
+
+@pytest.mark.skipif(not hasattr(os, "openpty"), reason="Requiere pty")
+def test_daemon_stops_while_waiting_for_port(tmp_path):
+    """Con el evento de parada activo antes de que aparezca el puerto, termina sin error."""
+    import daemon
+
+    stop_event = threading.Event()
+    stop_event.set()
+    code = daemon.run(
+        str(tmp_path / "COM4"), 19200, [make_output("stdout")], stop_event, state_dir=tmp_path / "state"
+    )
+    assert code == 0
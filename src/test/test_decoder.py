@@ -0,0 +1,92 @@
+"""
+Pruebas del decodificador de paquetes (protocol/decoder.py).
+Verifica:
+- Que los campos coinciden con el parse_payload original
+- Que se validan los checksums de las capturas reales y se rechazan los
+  paquetes editados a mano sin recalcularlo
+- Que los paquetes inválidos (incluido un monto con signo, espacios o "_")
+  se descartan y contabilizan
+- Que encode_frame produce paquetes idénticos a los de la contadora
+"""
+
+import sys
+from pathlib import Path
+
+# Agregar el directorio src al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from protocol.decoder import FrameDecoder, Reading, compute_checksum, frame_checksum_ok
+from protocol.encoder import encode_frame
+from protocol.framing import FRAME_LENGTH
+from simulator.simulator import parse_hex_line, read_log_file
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+PACKET = parse_hex_line(
+    "02 30 30 30 31 30 31 30 30 30 30 30 30 30 35 36 32 34 30 30 30 30 30 30 30 37 30 37 03 36"
+)
+
+
+def test_decode_fields():
+    """Mismos campos que extraía parse_payload sobre el payload en str."""
+    payload_str = PACKET[1:28].decode("ascii")
+    reading = FrameDecoder().decode(PACKET)
+    assert reading == Reading(
+        monto=int(payload_str[7:20]),
+        piezas=int(payload_str[23:27]),
+        status=payload_str[2] != "0",
+        rechazo_sensor=payload_str[5] == "1",
+    )
+
+
+def test_checksum_real_capture():
+    """La captura real sin editar tiene todos los checksums válidos."""
+    packets = read_log_file(DATA_DIR / "conteo_real_desbordamiento.txt")
+    frames = [p for p in packets if len(p) == FRAME_LENGTH]
+    assert frames
+    assert all(frame_checksum_ok(f) for f in frames)
+    assert all(compute_checksum(f[1:-1]) == f[-1] for f in frames)
+
+
+def test_hand_edited_logs_rejected():
+    """Paquetes editados a mano (checksum sin recalcular): se descartan."""
+    for name, rejected in [
+        ("conteo_real_solo_piezas.txt", 373),  # Monto puesto a 0
+        ("conteo_real_sin_desbordamiento.txt", 5),  # Paquetes en 0 agregados al final
+    ]:
+        decoder = FrameDecoder()
+        for packet in read_log_file(DATA_DIR / name, verbose=False):
+            decoder.decode(packet)
+        assert decoder.checksum_errors == rejected
+        assert decoder.malformed == 0
+
+
+def test_invalid_frames_dropped():
+    """Checksum incorrecto o longitud inesperada: None y contador."""
+    decoder = FrameDecoder()
+    corrupted = PACKET[:10] + b"9" + PACKET[11:]
+    assert decoder.decode(corrupted) is None
+    assert decoder.decode(PACKET[:-1]) is None
+    assert decoder.checksum_errors == 1
+    assert decoder.malformed == 1
+    assert decoder.decode(PACKET) is not None
+    assert decoder.decoded == 1
+
+
+def test_non_digit_monto_rejected():
+    """int() aceptaría estos montos; con checksum válido siguen siendo inválidos."""
+    decoder = FrameDecoder()
+    for monto in (b"+000000056240", b"      5624000", b"0000_00562400"):
+        frame = PACKET[:8] + monto + PACKET[21:-1]
+        frame += bytes([compute_checksum(frame[1:])])
+        assert frame_checksum_ok(frame)
+        assert decoder.decode(frame) is None
+    assert decoder.malformed == 3 and decoder.checksum_errors == 0
+
+
+def test_encode_roundtrip():
+    """encode_frame reproduce byte a byte el paquete real a partir de su lectura."""
+    reading = FrameDecoder().decode(PACKET)
+    assert encode_frame(*reading) == PACKET
+    assert FrameDecoder().decode(encode_frame(12345, 9999, True, False)) == Reading(
+        12345, 9999, True, False
+    )
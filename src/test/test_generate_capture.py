@@ -0,0 +1,92 @@
+"""
+Pruebas del generador de capturas sintéticas (tools/generate_capture.py).
+Verifica:
+- Que los paquetes generados son idénticos a los de protocol/encoder.py
+- Que texto, .uwfcap y bytes crudos dan los mismos paquetes y el total que
+  informa el generador coincide con el validador y con CumulativeCounter
+- Que el estado se arrastra bien entre bloques pequeños
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Agregar el directorio src al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+np = pytest.importorskip("numpy")
+
+from core.counter import CumulativeCounter
+from protocol.capture import CaptureReader
+from protocol.decoder import FrameDecoder
+from protocol.encoder import encode_frame
+from protocol.framing import FrameScanner
+from simulator.simulator import read_log_file
+from tools.generate_capture import GeneratorConfig, generate
+from tools.validate_corpus import validate_file
+
+CONFIG = GeneratorConfig(
+    frames=20_000,
+    rate=8.0,
+    resets=2,
+    status_flip_prob=0.01,
+    corrupt_prob=0.002,
+    noise_prob=0.002,
+    seed=7,
+)
+
+
+def test_frames_match_encoder(tmp_path):
+    path = tmp_path / "limpio.uwfcap"
+    generate(path, GeneratorConfig(frames=500, rate=3.0, status_flip_prob=0.1), block_frames=64)
+    decoder = FrameDecoder()
+    with CaptureReader(path) as reader:
+        for frame in reader:
+            reading = decoder.decode(bytes(frame))
+            assert reading is not None
+            assert bytes(frame) == encode_frame(reading.monto, reading.piezas, reading.status)
+
+
+def test_formats_agree(tmp_path):
+    text = generate(tmp_path / "soak.txt", CONFIG)
+    raw = generate(tmp_path / "soak.bin", CONFIG)
+    capture = generate(
+        tmp_path / "soak.uwfcap", GeneratorConfig(**{**CONFIG.__dict__, "noise_prob": 0.0})
+    )
+    assert text.overflows >= 10 and text.resets == 2 and text.corrupted and text.noise
+    assert text.final_total == raw.final_total == capture.final_total
+
+    for path, report in ((text.path, text), (capture.path, capture)):
+        validated = validate_file(path)
+        assert validated.frames == report.frames - report.corrupted
+        assert validated.checksum_errors == report.corrupted
+        assert validated.final_total == report.final_total
+    assert validate_file(text.path).parse_failures == text.noise
+
+    # Los bytes crudos por el camino del visor
+    decoder, counter = FrameDecoder(), CumulativeCounter()
+    for frame in FrameScanner().feed((tmp_path / "soak.bin").read_bytes()):
+        reading = decoder.decode(frame)
+        if reading is not None:
+            counter.update(reading)
+    assert counter.total_pieces == raw.final_total
+
+    packets = read_log_file(text.path, verbose=False)
+    assert len(packets) == text.frames
+    with CaptureReader(capture.path) as reader:
+        assert [bytes(f) for f in reader] == packets
+
+
+def test_small_blocks(tmp_path):
+    report = generate(tmp_path / "bloques.txt", CONFIG, block_frames=999)
+    assert report.overflows >= 10
+    validated = validate_file(report.path)
+    assert validated.final_total == report.final_total
+    assert validated.overflows == report.overflows
+    assert validated.resets == report.resets
+
+
+def test_rejects_noise_in_capture(tmp_path):
+    with pytest.raises(ValueError):
+        generate(tmp_path / "x.uwfcap", GeneratorConfig(frames=10, noise_prob=0.1))
@@ -0,0 +1,114 @@
+"""
+Pruebas de la persistencia del contador acumulativo (core/journal.py).
+Verifica:
+- Que el total acumulado sobrevive a un reinicio del visor
+- Que una línea cortada al final del journal se ignora y se descarta, así
+  que los eventos siguientes se recuperan en el próximo arranque
+- Que una entrada JSON válida pero sin ``seq``/``state`` se trata igual
+- Que el snapshot compacta el journal
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Agregar el directorio src al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.counter import CumulativeCounter
+from core.journal import CounterJournal
+from protocol.decoder import Reading
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def feed(counter, values):
+    for piezas, monto in values:
+        counter.update(Reading(monto, piezas, True, False))
+    return counter.total_pieces
+
+
+def test_total_survives_restart(tmp_path):
+    """Desbordamiento journalizado: el total se recupera sin snapshot."""
+    counter = CumulativeCounter(journal=CounterJournal(tmp_path))
+    assert feed(counter, [(9980, 500), (25, 500)]) == 10025
+    # Simula un corte de energía: sin close(), sin snapshot
+    counter.journal._journal.flush()
+
+    restored = CumulativeCounter(journal=CounterJournal(tmp_path))
+    assert restored.offset == 10000
+    assert restored.total_pieces == 10025
+    assert feed(restored, [(40, 500)]) == 10040
+
+
+def test_torn_journal_line_ignored(tmp_path):
+    """Una escritura a medias al final del journal no rompe la recuperación."""
+    counter = CumulativeCounter(journal=CounterJournal(tmp_path))
+    feed(counter, [(9980, 500), (25, 500)])
+    counter.journal._journal.write(b'{"seq": 2, "sta')
+    counter.journal._journal.flush()
+
+    restored = CumulativeCounter(journal=CounterJournal(tmp_path))
+    assert restored.total_pieces == 10025
+
+
+def test_events_after_torn_line_survive(tmp_path):
+    """El evento anotado tras recuperar un journal cortado no se pierde."""
+    counter = CumulativeCounter(journal=CounterJournal(tmp_path))
+    feed(counter, [(9980, 500), (25, 500)])
+    counter.journal._journal.write(b'{"seq": 2, "sta')
+    counter.journal._journal.flush()
+
+    restored = CumulativeCounter(journal=CounterJournal(tmp_path))
+    assert feed(restored, [(9990, 500), (5, 500)]) == 20005  # Otro desbordamiento
+    restored.journal._journal.flush()  # Otro corte, sin snapshot
+
+    again = CumulativeCounter(journal=CounterJournal(tmp_path))
+    assert again.offset == 20000
+    assert again.total_pieces == 20005
+    lines = again.journal.journal_path.read_bytes().splitlines()
+    assert [json.loads(line)["seq"] for line in lines] == [1, 2]
+
+
+@pytest.mark.parametrize(
+    "bad", [b'{"seq": 2}\n', b"[2, 3]\n", b'"texto"\n'], ids=["sin-state", "lista", "texto"]
+)
+def test_bad_entry_is_dropped(tmp_path, bad):
+    """Una entrada ajena al journal no impide arrancar y se descarta."""
+    counter = CumulativeCounter(journal=CounterJournal(tmp_path))
+    feed(counter, [(9980, 500), (25, 500)])
+    counter.journal._journal.write(bad)
+    counter.journal._journal.flush()
+
+    restored = CumulativeCounter(journal=CounterJournal(tmp_path))
+    assert restored.total_pieces == 10025
+    assert feed(restored, [(9990, 500), (5, 500)]) == 20005
+    restored.journal._journal.flush()
+
+    again = CumulativeCounter(journal=CounterJournal(tmp_path))
+    assert again.total_pieces == 20005
+    lines = again.journal.journal_path.read_bytes().splitlines()
+    assert [json.loads(line)["seq"] for line in lines] == [1, 2]
+
+
+def test_snapshot_compacts_journal(tmp_path):
+    """Tras el snapshot periódico el journal queda vacío y el estado intacto."""
+    clock = FakeClock()
+    journal = CounterJournal(tmp_path, snapshot_interval=30.0, clock=clock)
+    counter = CumulativeCounter(journal=journal)
+    feed(counter, [(9980, 500), (25, 500)])
+    clock.now = 31.0
+    feed(counter, [(30, 500)])
+    assert journal.snapshots == 1
+    assert journal.journal_path.stat().st_size == 0
+
+    restored = CumulativeCounter(journal=CounterJournal(tmp_path))
+    assert restored.total_pieces == 10030
@@ -0,0 +1,110 @@
+"""
+Pruebas de la instrumentación de latencia (core/latency.py).
+Verifica:
+- Que cada valor cae en un bucket cuyo límite lo acota con error <= 12,5 %
+- Que un paquete partido entre lecturas toma el STX de la primera lectura
+- Que la latencia hasta la GUI solo se mide para el último valor publicado
+"""
+
+import json
+import sys
+from pathlib import Path
+
+# Agregar el directorio src al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.latency import (
+    NUM_BUCKETS,
+    STAGE_COUNTER,
+    STAGE_DECODE,
+    STAGE_RENDER,
+    STAGE_TOTAL,
+    STAGE_WIRE,
+    LatencyHistogram,
+    LatencyTracer,
+    bucket_index,
+    bucket_upper_bound,
+)
+from protocol.framing import FrameScanner
+from simulator.simulator import parse_hex_line
+
+PACKET = parse_hex_line(
+    "02 30 30 30 31 30 31 30 30 30 30 30 30 30 35 36 32 34 30 30 30 30 30 30 30 37 30 37 03 36"
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000
+
+    def __call__(self):
+        return self.now
+
+
+def test_bucket_bounds():
+    """El límite superior del bucket acota el valor sin exceder 12,5 %."""
+    for ns in (2000, 12_345, 999_999, 3_000_000_000):
+        bound = bucket_upper_bound(bucket_index(ns))
+        assert ns < bound <= ns * 1.125 + 1
+    assert bucket_index(10) == 0
+    assert bucket_index(1 << 40) == NUM_BUCKETS - 1
+
+    histogram = LatencyHistogram()
+    for ns in range(1000, 101_000, 1000):
+        histogram.record(ns * 1000)  # 1 ms .. 100 ms
+    assert 50e6 <= histogram.percentile(50) <= 50e6 * 1.125
+    assert histogram.percentile(100) == histogram.max == 100e6
+
+
+def test_split_packet_uses_first_chunk(tmp_path):
+    """STX -> ETX cubre las dos lecturas y cada etapa recibe su intervalo."""
+    clock = FakeClock()
+    tracer = LatencyTracer(dump_path=tmp_path / "latency.json", clock=clock)
+    scanner = FrameScanner()
+
+    def feed(chunk):
+        tracer.chunk_read(bool(scanner.buffer))
+        frames = scanner.feed(chunk)
+        tracer.chunk_framed(bool(scanner.buffer), len(frames))
+        return frames
+
+    assert feed(PACKET[:10]) == []
+    clock.now += 5_000_000  # 5 ms hasta que llega el resto
+    frames = feed(PACKET[10:] + PACKET[:3])
+    t_stx = tracer.next_stx()
+    clock.now += 20_000
+    tracer.decoded()
+    clock.now += 10_000
+    value = ("lectura", 1)
+    tracer.counted(value, t_stx)
+    clock.now += 30_000_000
+    tracer.rendered(value)
+
+    assert frames == [PACKET]
+    h = tracer.histograms
+    assert h[STAGE_WIRE].max == 5_000_000
+    assert h[STAGE_DECODE].max == 20_000
+    assert h[STAGE_COUNTER].max == 10_000
+    assert h[STAGE_RENDER].max == 30_000_000
+    assert h[STAGE_TOTAL].max == 35_030_000
+
+    # El paquete que quedó pendiente empezó en la segunda lectura
+    clock.now += 1_000_000
+    feed(PACKET[3:])
+    assert tracer.next_stx() == clock.now - 1_000_000 - 30_000_000 - 30_000
+
+    report = json.loads((tmp_path / "latency.json").read_text()) if tracer.dump() else None
+    assert report["stages"][STAGE_WIRE]["count"] == 1
+
+
+def test_stale_render_is_not_sampled():
+    """Si se publicó otro valor antes de mostrar, la muestra se descarta."""
+    tracer = LatencyTracer(clock=FakeClock())
+    tracer.chunk_read(False)
+    first, second = ("a", 1), ("b", 2)
+    tracer.counted(first, tracer.next_stx())
+    tracer.counted(second, tracer.next_stx())
+    tracer.rendered(first)
+    assert tracer.histograms[STAGE_TOTAL].count == 0
+    tracer.rendered(second)
+    assert tracer.histograms[STAGE_TOTAL].count == 1
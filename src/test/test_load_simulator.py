@@ -0,0 +1,105 @@
+"""
+Pruebas del simulador de carga con asyncio (tools/load_simulator.py).
+Verifica:
+- Que varios dispositivos a su propio ritmo entregan todos sus paquetes a
+  un lector de varios puertos, con atraso bajo
+- Que las desconexiones reaparecen en la misma ruta y el ruido llega al
+  lector como bytes descartados
+- Que el atraso y los pendientes crecen cuando nadie lee el puerto
+"""
+
+import asyncio
+import os
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# Agregar el directorio src al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.multiport import MultiPortReader
+from tools.load_simulator import DATA_DIR, LoadSimulator, make_specs
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "openpty"), reason="Requiere pty")
+
+
+def run_with_reader(simulator, duration, reconnect_delay=1.0):
+    """
+    Corre ``simulator`` en un hilo con asyncio y lo lee con un
+    ``MultiPortReader`` en este hilo. Devuelve ``(informe, lector)``.
+    """
+    reader = MultiPortReader(reconnect_delay=reconnect_delay)
+    for device in simulator.devices:
+        reader.add_port(device.spec.name, str(device.link))
+    result = {}
+    thread = threading.Thread(
+        target=lambda: result.update(report=asyncio.run(simulator.run(duration)))
+    )
+    thread.start()
+    while thread.is_alive():
+        reader.poll(0.02)
+    for _ in range(10):  # Lo que quedó en los pty
+        reader.poll(0.01)
+    return result["report"], reader
+
+
+def test_devices_deliver_at_own_rates(tmp_path):
+    specs = make_specs(
+        4, [DATA_DIR / "conteo_real_desbordamiento.txt", "synthetic"], [50, 200], max_offset=0.2
+    )
+    simulator = LoadSimulator(specs, tmp_path).open()
+    try:
+        report, reader = run_with_reader(simulator, 1.0)
+    finally:
+        reader.close()
+        simulator.close()
+
+    for device, monitor in zip(report.devices, reader.monitors):
+        # Cada uno a su ritmo desde su propio inicio al azar
+        assert device.rate * 0.7 <= device.frames <= device.rate * 1.0 + 1
+        assert device.lag.count > 0
+        assert monitor.pipeline.stats()["frames"] == device.frames
+        assert device.backlog <= 1
+        assert device.lag.mean < 0.05
+    assert report.frames_per_s > 0.7 * (50 + 200) * 2 * 0.8
+
+
+def test_disconnects_and_noise(tmp_path):
+    specs = make_specs(
+        2,
+        ["synthetic"],
+        [200],
+        max_offset=0.0,
+        disconnect_every=0.3,
+        downtime=0.1,
+        noise_every=0.05,
+    )
+    simulator = LoadSimulator(specs, tmp_path).open()
+    try:
+        report, reader = run_with_reader(simulator, 1.5, reconnect_delay=0.02)
+    finally:
+        reader.close()
+        simulator.close()
+
+    for device, monitor in zip(report.devices, reader.monitors):
+        assert device.disconnects >= 1 and device.noise_bursts >= 1
+        assert monitor.losses >= 1  # El lector vio cada corte y volvió a abrir
+        assert monitor.pipeline.stats()["discarded_bytes"] > 0
+        assert monitor.total > 0
+
+
+def test_lag_grows_without_reader(tmp_path):
+    # 20000 paquetes/s y nadie lee: el buffer del pty se llena
+    simulator = LoadSimulator(make_specs(1, ["synthetic"], [20000], max_offset=0.0), tmp_path)
+    simulator.open()
+    try:
+        report = asyncio.run(simulator.run(1.0))
+    finally:
+        simulator.close()
+
+    device = report.devices[0]
+    assert device.backlog > 1000
+    assert device.lag.max > 0.1
+    assert not list(tmp_path.iterdir())  # close() retira los enlaces
@@ -0,0 +1,74 @@
+"""
+Pruebas del logging estructurado (core/log.py) y del anillo de paquetes
+(core/frame_ring.py).
+Verifica:
+- Que los eventos del contador llegan como registros JSON con sus campos
+- Que la depuración por paquete está desactivada por defecto
+- Que una cola llena descarta registros en lugar de bloquear
+- Que el anillo conserva los últimos N paquetes y sobrevive a reabrirlo
+"""
+
+import json
+import logging
+import sys
+from pathlib import Path
+
+# Agregar el directorio src al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.counter import CumulativeCounter
+from core.frame_ring import FrameRing, read_frame_ring
+from core.log import FRAMES_LOGGER, get_logger, log_event, setup_logging
+from protocol.decoder import Reading
+
+
+def test_counter_events_are_structured(tmp_path):
+    """Un desbordamiento se registra como evento con campos, no como texto."""
+    log_file = tmp_path / "visor.log"
+    handle = setup_logging(log_file=log_file, console=False)
+    try:
+        counter = CumulativeCounter()
+        counter.update(Reading(1000, 9990, True, False))
+        counter.update(Reading(1020, 5, True, False))
+        assert not logging.getLogger(FRAMES_LOGGER).isEnabledFor(logging.DEBUG)
+    finally:
+        handle.stop()
+
+    records = [json.loads(line) for line in log_file.read_text().splitlines()]
+    assert [r["event"] for r in records] == ["overflow"]
+    assert records[0]["level"] == "WARNING"
+    assert records[0]["piezas_anterior"] == 9990
+    assert records[0]["piezas"] == 5
+    assert records[0]["offset"] == 10000
+
+
+def test_full_queue_drops_instead_of_blocking(tmp_path):
+    """Con la cola llena los registros se cuentan como descartados."""
+    handle = setup_logging(log_file=tmp_path / "visor.log", console=False, queue_size=1)
+    handle.listener.stop()  # Nadie consume la cola
+    try:
+        log = get_logger("test")
+        for i in range(5):
+            log_event(log, logging.WARNING, "evento", n=i)
+        assert handle.dropped == 4
+    finally:
+        handle.listener.start()
+        handle.stop()
+
+
+def test_frame_ring_keeps_last_frames(tmp_path):
+    """Tras dar la vuelta quedan los últimos N, en orden, también tras reabrir."""
+    path = tmp_path / "frames.ring"
+    frames = [b"\x02%028d" % i + b"\x03" for i in range(7)]
+    with FrameRing(path, slots=4, frame_length=30) as ring:
+        for i, frame in enumerate(frames[:5]):
+            ring.record(frame, timestamp_ns=i)
+    with FrameRing(path, slots=4, frame_length=30) as ring:
+        assert ring.count == 5
+        for i, frame in enumerate(frames[5:], start=5):
+            ring.record(frame, timestamp_ns=i)
+        ring.record(b"\x02corto", timestamp_ns=7)
+
+    entries = read_frame_ring(path)
+    assert [t for t, _ in entries] == [4, 5, 6, 7]
+    assert [f for _, f in entries] == frames[4:] + [b"\x02corto"]
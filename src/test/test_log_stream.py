@@ -0,0 +1,80 @@
+"""
+Pruebas de la lectura perezosa de logs del simulador (simulator/simulator.py).
+Verifica:
+- Que iter_packets da los mismos paquetes que read_log_file, en texto y
+  en capturas .uwfcap
+- Que empieza en un paquete dado y vuelve al inicio en bucle, y que en
+  bucle termina si el log no tiene paquetes válidos
+- Que la memoria no crece con el tamaño del log
+"""
+
+import itertools
+import sys
+import tracemalloc
+from pathlib import Path
+
+# Agregar el directorio src al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from simulator.simulator import iter_packets, parse_hex_line, read_log_file
+from tools.convert_capture import convert
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+LOG = DATA_DIR / "conteo_real_desbordamiento.txt"
+
+
+def test_parse_hex_line():
+    assert parse_hex_line("02 30 41 03 7F. comentario\n") == b"\x02\x30\x41\x03\x7f"
+    assert parse_hex_line("02 30 ZZ 03 7F") is None
+    assert parse_hex_line("30 30 03 7F") is None  # Sin STX
+
+
+def test_stream_matches_list(tmp_path):
+    packets = read_log_file(LOG, verbose=False)
+    assert list(iter_packets(LOG, verbose=False)) == packets
+
+    capture = tmp_path / "captura.uwfcap"
+    convert(LOG, capture)
+    assert [bytes(p) for p in iter_packets(capture)] == packets
+
+
+def test_start_and_loop(tmp_path):
+    packets = read_log_file(LOG, verbose=False)
+    n = len(packets)
+    expected = packets[n - 4 :] + packets[:6]
+
+    stream = iter_packets(LOG, verbose=False, start=n - 4, loop=True)
+    assert list(itertools.islice(stream, 10)) == expected
+
+    capture = tmp_path / "captura.uwfcap"
+    convert(LOG, capture)
+    stream = iter_packets(capture, start=n - 4, loop=True)
+    assert [bytes(p) for p in itertools.islice(stream, 10)] == expected
+
+    assert list(iter_packets(LOG, verbose=False, start=n + 5)) == []
+    # Más allá del final en bucle: sigue desde el paquete 0
+    stream = iter_packets(LOG, verbose=False, start=n + 5, loop=True)
+    assert next(stream) == packets[0]
+
+
+def test_loop_without_packets_ends(tmp_path):
+    garbage = tmp_path / "basura.txt"
+    garbage.write_text("esto no es un paquete\n30 30 03\n")
+    assert list(iter_packets(garbage, verbose=False, loop=True)) == []
+    empty = tmp_path / "vacio.txt"
+    empty.write_text("")
+    assert next(iter_packets(empty, verbose=False, start=3, loop=True), None) is None
+
+
+def test_constant_memory(tmp_path):
+    big = tmp_path / "grande.txt"
+    big.write_bytes(LOG.read_bytes() * 100)  # ~38.000 paquetes
+
+    tracemalloc.start()
+    try:
+        count = sum(1 for _ in iter_packets(big, verbose=False))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert count == len(read_log_file(LOG, verbose=False)) * 100
+    assert peak < 200_000  # Una lista de todos los paquetes ocupa varios MB
@@ -0,0 +1,36 @@
+"""
+Pruebas del buzón de último valor (core/mailbox.py).
+"""
+
+import sys
+from pathlib import Path
+
+# Agregar el directorio src al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.mailbox import LatestValueMailbox
+
+
+def test_latest_value_wins():
+    """Solo se entrega la última publicación entre dos lecturas."""
+    mailbox = LatestValueMailbox()
+    assert mailbox.take() is None
+    for i in range(5):
+        mailbox.publish((i,))
+    assert mailbox.take() == (4,)
+    assert mailbox.take() is None
+    assert mailbox.published == 5
+    assert mailbox.taken == 1
+    assert mailbox.coalesced == 4
+
+
+def test_same_object_not_redelivered():
+    """Republicar el mismo objeto no genera un refresco extra."""
+    mailbox = LatestValueMailbox()
+    value = ("lectura", 10)
+    mailbox.publish(value)
+    assert mailbox.take() is value
+    mailbox.publish(value)
+    assert mailbox.take() is None
+    mailbox.publish(("lectura", 11))
+    assert mailbox.take() == ("lectura", 11)
@@ -0,0 +1,121 @@
+"""
+Pruebas de las métricas en formato Prometheus (core/metrics.py) y su
+registro en el pipeline del lector (core/reader.py).
+Verifica:
+- Que el texto expuesto sigue el formato de Prometheus (HELP/TYPE,
+  etiquetas escapadas, buckets acumulados con +Inf)
+- Que las métricas del pipeline coinciden con sus estadísticas tras un
+  flujo con ruido, desbordamientos y una pérdida de puerto
+- Que se exponen por HTTP local y en un archivo para el textfile collector
+"""
+
+import sys
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+# Agregar el directorio src al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bench.synthetic import synthetic_stream
+from core.counter import CumulativeCounter
+from core.journal import EVENT_OVERFLOW
+from core.metrics import MetricsRegistry, MetricsServer, TextfileExporter
+from core.reader import FramePipeline
+
+
+def parse(text):
+    """
+    ``{'nombre{etiquetas}': valor}`` de las líneas de muestra.
+    """
+    samples = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            samples[name] = float(value)
+    return samples
+
+
+def test_render_format():
+    registry = MetricsRegistry()
+    frames = registry.counter("frames_total", "Paquetes", {"port": 'a"b\\c'})
+    frames.inc(3)
+    depth = [7]
+    registry.gauge("depth", "Profundidad", function=lambda: depth[0])
+    histogram = registry.histogram("size", "Tamaño", (10, 1, 100))
+    for value in (0, 1, 5, 10, 50, 1000):
+        histogram.observe(value)
+    depth[0] = 9  # Se lee al exponer
+
+    text = registry.render()
+    assert "# HELP uwf_frames_total Paquetes\n# TYPE uwf_frames_total counter\n" in text
+    assert 'uwf_frames_total{port="a\\"b\\\\c"} 3\n' in text
+    assert "# TYPE uwf_depth gauge\nuwf_depth 9\n" in text
+    samples = parse(text)
+    # Buckets "le" acumulados: 1 incluye el 1, 10 incluye el 10
+    assert [samples[f'uwf_size_bucket{{le="{le}"}}'] for le in ("1", "10", "100", "+Inf")] == [
+        2,
+        4,
+        5,
+        6,
+    ]
+    assert samples["uwf_size_sum"] == 1066 and samples["uwf_size_count"] == 6
+
+    with pytest.raises(ValueError):
+        registry.counter("frames_total", "Paquetes", {"port": 'a"b\\c'})
+    with pytest.raises(ValueError):
+        registry.gauge("frames_total", "Paquetes")
+    registry.counter("frames_total", "Paquetes", {"port": "otro"})  # Otra etiqueta: vale
+
+
+def test_pipeline_metrics_match_stats():
+    stream, injected = synthetic_stream(3000, "ruido", seed=4)
+    registry = MetricsRegistry()
+    counter = CumulativeCounter()
+    pipeline = FramePipeline(counter, lambda value: None, metrics=registry, labels={"port": "A"})
+    chunks = [stream[i : i + 97] for i in range(0, len(stream), 97)]
+    for chunk in chunks:
+        pipeline.feed(chunk)
+    pipeline.reset()
+
+    samples = parse(registry.render())
+    stats = pipeline.stats()
+    label = '{port="A"}'
+    assert samples[f"uwf_frames_total{label}"] == stats["frames"]
+    assert samples[f"uwf_discarded_bytes_total{label}"] == stats["discarded_bytes"] > 0
+    assert samples[f"uwf_checksum_errors_total{label}"] == stats["checksum_errors"]
+    assert samples[f"uwf_malformed_total{label}"] == stats["malformed"]
+    assert samples[f"uwf_decoded_total{label}"] == stats["decoded"]
+    assert samples[f"uwf_repeats_total{label}"] == stats["skipped"]
+    assert samples[f"uwf_total_pieces{label}"] == counter.total_pieces
+    overflow = f'uwf_counter_events_total{{port="A",event="{EVENT_OVERFLOW}"}}'
+    assert samples[overflow] == injected["overflows"] == counter.events[EVENT_OVERFLOW]
+    assert samples[f"uwf_read_chunk_bytes_count{label}"] == len(chunks)
+    assert samples[f"uwf_read_chunk_bytes_sum{label}"] == len(stream)
+    assert samples[f"uwf_port_losses_total{label}"] == 1
+
+
+def test_http_and_textfile(tmp_path):
+    registry = MetricsRegistry()
+    registry.counter("frames_total", "Paquetes").inc(42)
+
+    server = MetricsServer(registry, port=0).start()
+    try:
+        url = "http://%s:%d" % server.address
+        with urllib.request.urlopen(url + "/metrics", timeout=5) as response:
+            assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+            assert parse(response.read().decode())["uwf_frames_total"] == 42
+        with pytest.raises(urllib.error.HTTPError):
+            urllib.request.urlopen(url + "/otra", timeout=5)
+    finally:
+        server.close()
+
+    path = tmp_path / "node" / "uwf.prom"
+    exporter = TextfileExporter(registry, path, interval=60).start()
+    registry.counter("port_losses_total", "Puerto perdido").inc()
+    exporter.close()  # Escribe una última vez al cerrar
+    samples = parse(path.read_text())
+    assert samples == {"uwf_frames_total": 42, "uwf_port_losses_total": 1}
+    assert [p.name for p in path.parent.iterdir()] == ["uwf.prom"]
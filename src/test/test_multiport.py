@@ -0,0 +1,119 @@
+"""
+Pruebas de la lectura de varias contadoras con un selector (core/multiport.py).
+Verifica:
+- Que cada puerto mantiene su propio total y el combinado es la suma, sin
+  crear hilos por puerto
+- Que un puerto perdido no afecta a los demás y se reabre por su misma ruta
+- Que ``changed()`` entrega solo las contadoras con algo nuevo
+"""
+
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Agregar el directorio src al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.multiport import MultiPortReader
+from protocol.encoder import encode_frame
+from tools.pty_harness import open_pty
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "openpty"), reason="Requiere pty")
+
+
+def poll_until(reader, condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        reader.poll(0.02)
+    return condition()
+
+
+@pytest.fixture
+def ptys():
+    opened = []
+
+    def make():
+        pair = open_pty()
+        opened.append(pair)
+        return pair
+
+    yield make
+    for master, slave in opened:
+        for fd in (master, slave):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+
+def test_independent_totals(ptys):
+    pairs = [ptys() for _ in range(4)]
+    reader = MultiPortReader()
+    threads = threading.active_count()
+    for i, (_, slave) in enumerate(pairs):
+        reader.add_port(f"M{i}", os.ttyname(slave))
+    assert threading.active_count() == threads
+
+    # La máquina i cuenta hasta 9990 y luego desborda a i + 1
+    for i, (master, _) in enumerate(pairs):
+        os.write(master, encode_frame(1000, 9990, True) + encode_frame(2000, i + 1, True))
+    expected = [10001 + i for i in range(4)]
+    try:
+        assert poll_until(reader, lambda: [m.total for m in reader.monitors] == expected)
+        assert reader.total == sum(expected)
+        assert reader.monitors[2].value[0].piezas == 3
+    finally:
+        reader.close()
+
+
+def test_lost_port_reopens_by_path(ptys, tmp_path):
+    first, other = ptys(), ptys()
+    link = tmp_path / "COM1"
+    os.symlink(os.ttyname(first[1]), link)
+    reader = MultiPortReader(reconnect_delay=0.02)
+    lost = reader.add_port("L1", str(link))
+    kept = reader.add_port("L2", os.ttyname(other[1]))
+    try:
+        os.write(first[0], encode_frame(1000, 9990, True))
+        assert poll_until(reader, lambda: lost.total == 9990)
+
+        os.close(first[0])  # Se desconecta el adaptador de L1
+        os.close(first[1])
+        assert poll_until(reader, lambda: not lost.connected)
+        os.write(other[0], encode_frame(1000, 7, True))
+        assert poll_until(reader, lambda: kept.total == 7)  # L2 sigue leyendo
+
+        # Reaparece en la misma ruta estable
+        second = ptys()
+        link.unlink()
+        os.symlink(os.ttyname(second[1]), link)
+        assert poll_until(reader, lambda: lost.connected)
+        os.write(second[0], encode_frame(2000, 5, True))
+        assert poll_until(reader, lambda: lost.total == 10005)
+    finally:
+        reader.close()
+
+    assert lost.losses == 1 and kept.losses == 0
+    assert reader.total == 10005 + 7
+
+
+def test_changed_reports_only_new(ptys):
+    pairs = [ptys() for _ in range(3)]
+    published = []
+    reader = MultiPortReader(publish=lambda name, value: published.append(name))
+    for i, (_, slave) in enumerate(pairs):
+        reader.add_port(f"M{i}", os.ttyname(slave))
+    try:
+        assert len(reader.changed()) == 3  # Recién conectadas
+        assert reader.changed() == []
+
+        os.write(pairs[1][0], encode_frame(1000, 4, True))
+        assert poll_until(reader, lambda: reader.monitors[1].total == 4)
+        assert [m.name for m in reader.changed()] == ["M1"]
+        assert published == ["M1"]
+    finally:
+        reader.close()
@@ -0,0 +1,75 @@
+"""
+Pruebas del envío a ritmo controlado (core/pacing.py y simulator.stream_packets).
+"""
+
+import sys
+from pathlib import Path
+
+# Agregar el directorio src al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.pacing import DeadlineScheduler, line_capacity_fps
+from simulator.simulator import stream_packets
+
+
+class FakeClock:
+    """Reloj simulado: sleep() avanza el tiempo exactamente más un retraso fijo."""
+
+    def __init__(self, oversleep=0.0):
+        self.now = 0.0
+        self.oversleep = oversleep
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds + self.oversleep
+
+
+class FakeSerial:
+    def __init__(self):
+        self.writes = []
+
+    def write(self, data):
+        self.writes.append(bytes(data))
+
+
+def test_no_cumulative_drift():
+    """Con retraso en cada sleep, el plazo del paquete N sigue siendo N / rate."""
+    clock = FakeClock(oversleep=0.002)
+    scheduler = DeadlineScheduler(100, clock=clock, sleep=clock.sleep)
+    for n in range(1000):
+        scheduler.wait(n)
+    # Un delay fijo acumularía 1000 * 2 ms = 2 s de deriva
+    assert abs(clock.now - 999 / 100) < 0.01
+    assert scheduler.jitter.max <= 0.0021
+
+
+def test_burst_groups_frames_per_write(capsys):
+    """En ráfaga se escriben varios paquetes por llamada, sin perder ninguno."""
+    packets = [bytes([0x02]) + bytes([0x30 + i % 10]) * 28 + bytes([0x03]) for i in range(100)]
+    ser = FakeSerial()
+    report = stream_packets(ser, packets, rate=0, burst=True, quiet=True)
+    assert b"".join(ser.writes) == b"".join(packets)
+    assert len(ser.writes) < len(packets)
+    assert report["frames"] == 100
+
+
+def test_burst_at_line_capacity(capsys):
+    """Ráfaga al ritmo por defecto (capacidad de la línea): varios paquetes por escritura."""
+    packets = [bytes([0x02]) + bytes([0x30 + i % 10]) * 28 + bytes([0x03]) for i in range(640)]
+    clock = FakeClock()
+    ser = FakeSerial()
+    rate = line_capacity_fps(19200)
+    report = stream_packets(
+        ser, packets, rate=rate, burst=True, quiet=True, clock=clock, sleep=clock.sleep
+    )
+    assert b"".join(ser.writes) == b"".join(packets)
+    assert len(ser.writes[0]) // 30 == 16  # 0,25 s de línea por escritura
+    assert report["writes"] == 40
+    assert abs(clock.now - (640 - 16) / rate) < 1e-9  # El ritmo medio se mantiene
+
+
+def test_line_capacity():
+    """19200 baud 8N1 con paquetes de 30 bytes: 64 paquetes/s."""
+    assert line_capacity_fps(19200) == 64
@@ -0,0 +1,87 @@
+"""
+Pruebas de punta a punta con el arnés pty en proceso (tools/pty_harness.py).
+Verifica:
+- Que los logs con paquetes de 30 bytes pasan por un pty y run_reader con
+  el número de paquetes y el total final conocidos de cada captura (los
+  logs generados de 29 bytes no son del protocolo y se omiten)
+- Que repetidos varias veces dan lo mismo que procesar los bytes sin pty
+  (diferencias solo del transporte o del bucle del lector)
+- Que en las capturas reales el total coincide además con el análisis
+  vectorizado independiente (tools/replay_analyzer.py)
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Agregar el directorio src al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tools.pty_harness import DATA_DIR, replay
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "openpty"), reason="Requiere pty")
+
+# Paquetes y total final de cada log, leídos de los propios datos (última
+# lectura de piezas + 10000 por desbordamiento), no del código que se prueba
+KNOWN = {
+    "contadora en 0 enviando datos.txt": (6, 0),
+    "conteo hasta 10000.txt": (255, 3422),  # Sin desbordamiento: 707 -> 3422
+    "conteo_real_desbordamiento.txt": (384, 10018),  # 5023 -> 18 con el monto subiendo
+    # Los 5 paquetes en 0 del final tienen checksum inválido (editados a mano)
+    "conteo_real_sin_desbordamiento.txt": (386, 5023),
+    # Solo 15 paquetes con checksum válido; el último marca 3638 piezas
+    "conteo_real_solo_piezas.txt": (388, 3638),
+}
+# Generados con paquetes de 29 bytes (sin checksum): el visor no los acepta
+# y sus "paquetes" de 30 bytes son ventanas entre dos paquetes, sin sentido
+LEGACY_29_BYTES = {
+    "conteo_20mil_piezas.txt",
+    "conteo_50mil_piezas.txt",
+    "conteo_desbordamiento_multiple.txt",
+    "conteo_desbordamiento_rapido.txt",
+    "conteo_desbordamiento_simple.txt",
+    "conteo_realista.txt",
+}
+
+
+def corpus_params():
+    return [
+        pytest.param(
+            path,
+            marks=pytest.mark.skip(reason="Paquetes de 29 bytes, fuera del protocolo")
+            if path.name in LEGACY_29_BYTES
+            else (),
+            id=path.stem,
+        )
+        for path in sorted(DATA_DIR.glob("*.txt"))
+    ]
+
+
+def test_corpus_is_classified():
+    names = {path.name for path in DATA_DIR.glob("*.txt")}
+    assert names == set(KNOWN) | LEGACY_29_BYTES  # Un log nuevo necesita su total conocido
+
+
+@pytest.mark.parametrize("path", corpus_params())
+def test_corpus_known_totals(path):
+    result = replay(path)
+    assert (result.frames, result.total) == KNOWN[path.name]
+
+
+@pytest.mark.parametrize("path", corpus_params())
+def test_corpus_repeated_matches_reference(path):
+    result = replay(path, repeat=3)
+    assert result.frames == result.expected_frames == 3 * KNOWN[path.name][0]
+    assert result.total == result.expected_total
+
+
+def test_real_captures_match_analyzer():
+    pytest.importorskip("numpy")
+    from tools.replay_analyzer import analyze_file
+
+    for path in DATA_DIR.glob("conteo_real_*.txt"):
+        result = replay(path)
+        assert result.ok
+        assert result.total == analyze_file(path)[1].final_total
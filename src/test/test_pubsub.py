@@ -0,0 +1,44 @@
+"""
+Pruebas de la difusión de lecturas (core/pubsub.py).
+Verifica:
+- Que un suscriptor binario recibe las lecturas en orden
+- Que 100 clientes locales reciben hasta la última lectura y un cliente que
+  no lee solo pierde las más antiguas
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+# Agregar el directorio src al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bench.load_pubsub import run_load
+from core.pubsub import FORMAT_BINARY, ReadingPublisher
+from protocol.decoder import Reading
+from tools.subscriber import connect, iter_readings
+
+
+def test_binary_subscriber_roundtrip(tmp_path):
+    """Los registros binarios llegan completos y en orden."""
+    address = str(tmp_path / "pubsub.sock")
+    with ReadingPublisher(address, fmt=FORMAT_BINARY) as publisher:
+        with connect(address) as sock:
+            while publisher.subscribers < 1:
+                time.sleep(0.01)
+            for n in range(3):
+                publisher.publish((Reading(n * 100, n, n % 2 == 0, False), 10000 + n))
+            readings = iter_readings(sock, FORMAT_BINARY)
+            received = [next(readings) for _ in range(3)]
+    assert [r["total"] for r in received] == [10000, 10001, 10002]
+    assert received[1]["monto"] == 100 and received[1]["status"] is False
+    assert not os.path.exists(address)
+
+
+def test_load_100_clients_with_stalled_one():
+    """Con un cliente bloqueado los demás reciben todo y él descarta lo más antiguo."""
+    result = run_load(clients=100, messages=3000, rate=0, stalled=1, queue_size=16)
+    assert result["connected"] == 101
+    assert result["all_got_last"]
+    assert result["dropped"] > 0
@@ -0,0 +1,77 @@
+"""
+Pruebas del ritmo de producción incremental (core/rates.py).
+Verifica:
+- Que las ventanas deslizantes y el EWMA siguen un ritmo constante
+- Que las lecturas descartadas por el buzón no cambian el resultado
+- Que un reinicio del contador no produce ritmos negativos
+- Que tras una parada el ritmo cae a cero y el historial lo refleja
+"""
+
+import sys
+from pathlib import Path
+
+# Agregar el directorio src al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.rates import RateEngine
+from gui.sparkline import fill_coords
+
+
+def run(engine, seconds, pieces_per_s, monto_per_piece=1000, start_total=0, t0=0.0, step=0.1):
+    """
+    Alimenta lecturas cada ``step`` segundos (a mitad de paso, lejos de los
+    bordes de los intervalos); devuelve el total final.
+    """
+    total = start_total
+    n = int(round(seconds / step))
+    for i in range(1, n + 1):
+        total = start_total + int(i * step * pieces_per_s)
+        engine.observe(total, total * monto_per_piece, now=t0 + (i - 0.5) * step)
+    return total
+
+
+def test_constant_rate():
+    engine = RateEngine(windows=(10, 60), ewma_tau=5.0)
+    engine.observe(0, 0, now=0.0)
+    run(engine, 90, pieces_per_s=20)
+    engine.advance(90.0)
+    assert engine.pieces_per_second(10) == 20
+    assert engine.pieces_per_second(60) == 20
+    assert engine.monto_per_minute(60) == 20 * 1000 * 60
+    assert abs(engine.ewma - 20) < 0.1
+
+    # Solo una lectura por segundo (las demás descartadas): mismo ritmo
+    sparse = RateEngine(windows=(10,))
+    sparse.observe(0, 0, now=0.0)
+    run(sparse, 30, pieces_per_s=20, step=1.0)
+    sparse.advance(30.0)
+    assert sparse.pieces_per_second(10) == engine.pieces_per_second(10)
+
+
+def test_reset_and_stop():
+    engine = RateEngine(windows=(10,), history=30)
+    engine.observe(0, 0, now=0.0)
+    total = run(engine, 20, pieces_per_s=10, start_total=5000)
+    # Reinicio manual de la contadora: el total vuelve a empezar
+    run(engine, 10, pieces_per_s=10, t0=20.0)
+    engine.advance(30.0)
+    assert total > 5000
+    assert engine.pieces_per_second(10) == 10
+
+    history = engine.history([0.0] * 20)
+    assert min(history) >= 0
+
+    # Parada de 5 s y luego una parada larga (más que el anillo)
+    engine.advance(35.0)
+    assert engine.pieces_per_second(10) == 5
+    assert engine.history([0.0] * 5) == [0.0] * 5
+    engine.advance(1000.0)
+    assert engine.pieces_per_second(10) == 0
+    assert engine.ewma < 0.01
+
+
+def test_fill_coords_reuses_buffers():
+    values = [0.0, 5.0, 10.0]
+    coords = [0.0] * 6
+    assert fill_coords(values, coords, width=24, height=14, pad=2) is coords
+    assert coords == [2.0, 12.0, 12.0, 7.0, 22.0, 2.0]
@@ -0,0 +1,140 @@
+"""
+Pruebas de la captura cruda con tiempos (protocol/raw_capture.py) y su
+reproducción en el simulador (simulator.stream_chunks).
+Verifica:
+- Que cada bloque vuelve con su instante (µs), incluidos huecos largos,
+  bloques grandes y un último registro incompleto
+- Que el pipeline del lector guarda exactamente los bytes que le llegan y
+  que la captura da los mismos paquetes y el mismo total
+- Que la reproducción respeta los tiempos originales, a Nx y sin pausas
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Agregar el directorio src al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bench.synthetic import synthetic_stream
+from core.counter import CumulativeCounter
+from core.reader import FramePipeline
+from protocol.raw_capture import (
+    MAX_DELTA_US,
+    RawCaptureReader,
+    RawCaptureWriter,
+    open_session,
+)
+from simulator.simulator import iter_packets, stream_chunks
+from tools.pty_harness import reference
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000_000
+
+    def __call__(self):
+        return self.now
+
+
+class SleepClock:
+    """Reloj en segundos que solo avanza con sleep() (más un retraso fijo)."""
+
+    def __init__(self, oversleep=0.0):
+        self.now = 0.0
+        self.oversleep = oversleep
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds + self.oversleep
+
+
+class RecordingPort:
+    def __init__(self, clock):
+        self.clock = clock
+        self.writes = []
+
+    def write(self, data):
+        self.writes.append((self.clock(), bytes(data)))
+
+
+def test_roundtrip_with_gaps_and_large_chunks(tmp_path):
+    clock = FakeClock()
+    path = tmp_path / "a.uwfraw"
+    chunks = [b"\x02abc", b"", b"x" * 70000, b"def\x03"]
+    steps_ns = [1_500, 2_000_000, (MAX_DELTA_US + 10) * 1000, 7_000]
+    expected = []
+    with RawCaptureWriter(path, clock=clock) as writer:
+        for step, chunk in zip(steps_ns, chunks):
+            clock.now += step
+            writer.write(chunk)
+            expected.append(clock.now - 1_000_000_000)
+    assert writer.chunks == 4 and writer.bytes == sum(map(len, chunks))
+
+    with RawCaptureReader(path) as reader:
+        records = list(reader)
+    # Resolución de µs; el bloque vacío no se devuelve y el grande llega en dos
+    times = [t for t, _ in records]
+    late = 2001 + MAX_DELTA_US + 10
+    assert [t // 1000 for t in times] == [1, late, late, late + 7]
+    assert b"".join(c for _, c in records) == b"".join(chunks)
+    assert abs(times[-1] - expected[-1]) < 1000
+
+    # Proceso interrumpido a mitad de un registro
+    data = path.read_bytes()
+    path.write_bytes(data[:-2])
+    with RawCaptureReader(path) as reader:
+        assert b"".join(c for _, c in reader) == b"".join(chunks[:3])
+        assert reader.truncated
+
+    with pytest.raises(FileExistsError):
+        RawCaptureWriter(path)  # Nunca pisa una captura
+
+
+def test_pipeline_tee_matches_stream(tmp_path):
+    stream, _ = synthetic_stream(3000, "ruido", seed=4)
+    counter = CumulativeCounter()
+    capture = open_session(tmp_path)
+    pipeline = FramePipeline(counter, lambda value: None, capture=capture)
+    # Bloques de tamaño irregular: paquetes partidos entre lecturas
+    pos = 0
+    for size in [7, 64, 1, 300, 29, 4096] * 200:
+        if pos >= len(stream):
+            break
+        pipeline.feed(stream[pos : pos + size])
+        pos += size
+    capture.close()
+
+    path = next(tmp_path.glob("*.uwfraw"))
+    with RawCaptureReader(path) as reader:
+        assert reader.stream() == stream[:pos]
+    frames, total = reference(stream[:pos])
+    assert len(list(iter_packets(path, verbose=False))) == frames
+    assert counter.total_pieces == total
+
+
+@pytest.mark.parametrize("speed, expected", [(1.0, 0.2), (4.0, 0.05), (0.0, 0.0)])
+def test_replay_timing(tmp_path, speed, expected):
+    clock = FakeClock()
+    path = tmp_path / "t.uwfraw"
+    with RawCaptureWriter(path, clock=clock) as writer:
+        for i in range(5):
+            writer.write(bytes([i]) * 30)
+            clock.now += 50_000_000  # 50 ms entre bloques
+
+    # Cada sleep se pasa 1 ms: los plazos son absolutos, no se acumula
+    replay_clock = SleepClock(oversleep=0.001)
+    port = RecordingPort(replay_clock)
+    report = stream_chunks(
+        port, path, speed=speed, quiet=True, clock=replay_clock, sleep=replay_clock.sleep
+    )
+    elapsed = port.writes[-1][0] - port.writes[0][0]
+    assert report["chunks"] == 5
+    assert [data for _, data in port.writes] == [bytes([i]) * 30 for i in range(5)]
+    assert expected <= elapsed <= expected + 0.0011
+    if speed:
+        gaps = [b[0] - a[0] for a, b in zip(port.writes, port.writes[1:])]
+        assert min(gaps) >= 0.05 / speed - 0.0011
@@ -0,0 +1,188 @@
+"""
+Pruebas de la reconexión rápida (core/reconnect.py, core/reader.py).
+Verifica:
+- Que la espera exponencial crece, respeta el máximo y se reinicia
+- Que al desconectar el puerto el lector encuentra el dispositivo que
+  reaparece con otro nombre, ignora los puertos mudos y mide la recuperación
+  (solo con la búsqueda activada)
+- Que sin búsqueda solo se reabre el puerto propio, aunque otra contadora
+  transmita al lado
+- Que la prueba de puertos no abre los que ya usa otro proceso y devuelve
+  lo que leyó
+"""
+
+import os
+import sys
+import threading
+import time
+import tty
+from pathlib import Path
+
+import pytest
+
+# Agregar el directorio src al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.counter import CumulativeCounter
+from core.reader import run_reader
+from core.reconnect import Backoff, PortProbe, ReconnectManager, open_exclusive
+from protocol.encoder import encode_frame
+
+
+def test_backoff_grows_with_jitter():
+    backoff = Backoff(initial=0.05, maximum=0.4, jitter=0.5, rng=lambda: 1.0)
+    assert [backoff.next() for _ in range(5)] == [0.025, 0.05, 0.1, 0.2, 0.2]
+    backoff.reset()
+    backoff.rng = lambda: 0.0
+    assert backoff.next() == 0.05
+
+
+class FakeDevice:
+    """Par pty con un enlace en ``path`` que escribe paquetes mientras vive."""
+
+    def __init__(self, path, frames=None):
+        self.master, self.slave = os.openpty()
+        tty.setraw(self.slave)
+        self.path = path
+        os.symlink(os.ttyname(self.slave), path)
+        self.frames = frames or []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._feed, daemon=True)
+        self._thread.start()
+
+    def _feed(self):
+        i = 0
+        while self.frames and not self._stop.wait(0.01):
+            os.write(self.master, self.frames[min(i, len(self.frames) - 1)])
+            i += 1
+
+    def unplug(self):
+        self._stop.set()
+        self._thread.join()
+        os.unlink(self.path)
+        os.close(self.master)
+        os.close(self.slave)
+
+
+@pytest.mark.skipif(not hasattr(os, "openpty"), reason="Requiere pty")
+def test_replug_under_new_name(tmp_path):
+    first = FakeDevice(tmp_path / "COM4", [encode_frame(1000 * i, 9995 + i, True) for i in range(5)])
+    mute = FakeDevice(tmp_path / "COM3")  # Extremo del simulador: sin tráfico
+    manager = ReconnectManager(
+        patterns=(str(tmp_path / "COM*"),),
+        preferred=lambda: str(tmp_path / "COM3"),
+        backoff=Backoff(initial=0.02, maximum=0.2),
+        probe_timeout=0.2,
+        search=True,
+    )
+
+    import serial
+
+    ser = serial.Serial(str(first.path), timeout=0.05)
+    counter = CumulativeCounter()
+    readings = []
+    stop_event = threading.Event()
+    result = {}
+    thread = threading.Thread(
+        target=lambda: result.update(
+            run_reader(ser, counter, readings.append, stop_event=stop_event, reconnector=manager)
+        )
+    )
+    thread.start()
+    second = None
+    try:
+        deadline = time.monotonic() + 5
+        while counter.total_pieces != 9999 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert counter.total_pieces == 9999
+
+        first.unplug()
+        time.sleep(0.1)  # El adaptador vuelve con otro nombre
+        second = FakeDevice(tmp_path / "COM5", [encode_frame(9000, 3 + i, True) for i in range(5)])
+
+        deadline = time.monotonic() + 5
+        while counter.total_pieces != 10007 and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        stop_event.set()
+        thread.join(timeout=5)
+        ser.close()
+        mute.unplug()
+        if second is not None:
+            second.unplug()
+
+    assert counter.total_pieces == 10007  # Desbordamiento 9999 -> 3 ... 7
+    assert result["recoveries"] == 1
+    assert result["last_downtime_s"] < 1.0
+
+
+@pytest.mark.skipif(not hasattr(os, "openpty"), reason="Requiere pty")
+def test_reopens_only_own_port(tmp_path):
+    own = FakeDevice(tmp_path / "COM4", [encode_frame(1000, 10 + i, True) for i in range(3)])
+    neighbour = FakeDevice(tmp_path / "COM5", [encode_frame(7000, 8000 + i, True) for i in range(3)])
+    manager = ReconnectManager(
+        patterns=(str(tmp_path / "COM*"),),
+        preferred=lambda: str(tmp_path / "COM4"),
+        backoff=Backoff(initial=0.02, maximum=0.05),
+        probe_timeout=0.05,
+    )
+    found = manager.attempt()  # Arranque: el puerto configurado
+    assert found is not None
+    ser, _ = found
+    counter = CumulativeCounter()
+    readings = []
+    stop_event = threading.Event()
+    thread = threading.Thread(
+        target=run_reader,
+        args=(ser, counter, readings.append),
+        kwargs={"stop_event": stop_event, "reconnector": manager},
+    )
+    thread.start()
+    replugged = None
+    try:
+        deadline = time.monotonic() + 5
+        while counter.total_pieces != 12 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        own.unplug()
+        time.sleep(0.3)  # Varios intentos con la vecina transmitiendo
+        assert manager.attempts > 1 and manager.recoveries == 0
+        replugged = FakeDevice(tmp_path / "COM4", [encode_frame(1000, 20 + i, True) for i in range(3)])
+        deadline = time.monotonic() + 5
+        while counter.total_pieces != 22 and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        stop_event.set()
+        thread.join(timeout=5)
+        ser.close()
+        neighbour.unplug()
+        if replugged is not None:
+            replugged.unplug()
+
+    assert counter.total_pieces == 22
+    assert all(reading.monto == 1000 for reading, _ in readings)
+    assert manager.recoveries == 1
+
+
+@pytest.mark.skipif(not hasattr(os, "openpty"), reason="Requiere pty")
+def test_probe_skips_busy_ports_and_keeps_bytes(tmp_path):
+    busy = FakeDevice(tmp_path / "COM3")
+    device = FakeDevice(tmp_path / "COM4")
+    holder = open_exclusive(str(busy.path))  # Otro visor ya lo tiene abierto
+    probe = PortProbe([str(busy.path), str(device.path)], timeout=2.0)
+    try:
+        assert len(probe.opened) == 1
+        frames = b"".join(encode_frame(1000, i, True) for i in range(3))
+        os.write(device.master, b"\x00ruido" + frames)
+        found = None
+        while found is None and not probe.expired:
+            found = probe.poll(0.1)
+    finally:
+        probe.close()
+        holder.close()
+        busy.unplug()
+        device.unplug()
+
+    port, ser, data = found
+    ser.close()
+    assert port == str(device.path)
+    assert data == b"\x00ruido" + frames  # Todo lo leído vuelve para procesarse
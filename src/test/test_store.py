@@ -0,0 +1,83 @@
+"""
+Pruebas del histórico de lecturas en SQLite (core/store.py).
+Verifica:
+- Que los agregados por minuto y por hora suman las piezas del total acumulado
+- Que un reinicio del contador se cuenta y no resta piezas
+- Que la consulta por intervalo usa los agregados y sobrevive a reabrir la base
+- Que el escritor en lotes sostiene más de 10x el ritmo de la línea
+"""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+# Agregar el directorio src al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bench.bench_store import run_store
+from core.store import HOUR, MINUTE, ReadingStore
+from protocol.decoder import Reading
+
+T0 = 1_700_000_000 // HOUR * HOUR  # Inicio de una hora exacta
+
+
+def publish_all(store, samples):
+    """``samples``: lista de ``(t, total)``; piezas = total % 10000."""
+    for t, total in samples:
+        store.now = t
+        store.publish((Reading(total * 10, total % 10000, True, False), total))
+
+
+def make_store(path, **kwargs):
+    store = ReadingStore(path, clock=lambda: store.now, **kwargs)
+    store.now = T0
+    return store
+
+
+def test_rollups_and_shift_query(tmp_path):
+    db = tmp_path / "lecturas.sqlite3"
+    store = make_store(db, batch_size=7).start()
+    # Dos horas y media, una lectura cada 10 s, 3 piezas por lectura
+    samples = [(T0 + i * 10, 100 + i * 3) for i in range(900)]
+    publish_all(store, samples)
+    store.close()
+
+    conn = sqlite3.connect(db)
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert conn.execute("SELECT COUNT(*) FROM readings").fetchone()[0] == 900
+    assert conn.execute("SELECT COUNT(*) FROM rollup_hour").fetchone()[0] == 3
+    conn.close()
+
+    store = ReadingStore(db)
+    total = samples[-1][1] - samples[0][1]
+    assert store.pieces_between(T0, T0 + 3 * HOUR) == total
+    # Turno que no coincide con horas exactas: minutos + horas + minutos
+    start, end = T0 + 20 * MINUTE, T0 + 2 * HOUR + 10 * MINUTE
+    expected = sum(3 for t, _ in samples[1:] if start <= t < end)
+    assert store.pieces_between(start, end) == expected
+    minutes = store.rollups(T0, T0 + HOUR)
+    assert len(minutes) == 60 and minutes[1]["pieces"] == 18
+    store.close()
+
+
+def test_reset_counts_pieces_since_reset(tmp_path):
+    db = tmp_path / "lecturas.sqlite3"
+    store = make_store(db).start()
+    publish_all(store, [(T0, 5000), (T0 + 1, 5010), (T0 + 2, 0), (T0 + 3, 7)])
+    store.close()
+
+    # Reabrir continúa desde el último total guardado
+    store = make_store(db).start()
+    publish_all(store, [(T0 + 4, 9)])
+    store.close()
+
+    (row,) = ReadingStore(db).rollups(T0, T0 + MINUTE)
+    assert row["pieces"] == 10 + 0 + 7 + 2
+    assert row["resets"] == 1
+    assert row["last_total"] == 9
+
+
+def test_sustains_ten_times_line_rate(tmp_path):
+    result = run_store(tmp_path / "bench.sqlite3", 20_000)
+    assert result["pieces"] == 19_999
+    assert result["line_multiple"] >= 10
@@ -0,0 +1,171 @@
+"""
+Pruebas del lector sin hilo integrado en el bucle de eventos (gui/tk_reader.py).
+Verifica:
+- Que con createfilehandler y con consulta periódica se procesan todos los
+  paquetes de un pty y la pantalla termina en el total correcto
+- Que al desconectar se avisa en pantalla y se retoma en el puerto que
+  reaparece, sin bloquear el bucle entre intentos, y que los intentos y
+  el tiempo sin puerto se publican en las métricas
+- Que probar un puerto mudo no bloquea el bucle durante ``probe_timeout``
+"""
+
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Agregar el directorio src al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import serial
+
+from bench.bench_tk_modes import HeadlessRoot
+from core.counter import CumulativeCounter
+from core.metrics import MetricsRegistry
+from core.reconnect import Backoff, ReconnectManager
+from gui.tk_reader import TkSerialReader
+from protocol.encoder import encode_frame
+from simulator.simulator import read_log_file
+from tools.pty_harness import _write_all, open_pty, reference
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "openpty"), reason="Requiere pty")
+
+LOG = Path(__file__).parent.parent / "data" / "conteo_real_desbordamiento.txt"
+
+
+def run_until(root, condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        root.mainloop(0.02)
+    return condition()
+
+
+@pytest.mark.parametrize("use_filehandler", [True, False], ids=["filehandler", "poll"])
+def test_drains_pty_on_event_loop(use_filehandler):
+    stream = b"".join(read_log_file(LOG, verbose=False)) * 3
+    _, expected_total = reference(stream)
+
+    master, slave = open_pty()
+    ser = serial.Serial(os.ttyname(slave), timeout=1)
+    root = HeadlessRoot()
+    counter = CumulativeCounter()
+    outputs = []
+
+    class Collect:
+        publish = staticmethod(outputs.append)
+
+    reader = TkSerialReader(
+        root, ser, counter, outputs=[Collect], use_filehandler=use_filehandler
+    ).start()
+    writer = threading.Thread(target=_write_all, args=(master, stream, 512))
+    writer.start()
+    try:
+        assert run_until(
+            root,
+            lambda: root.rendered and root.rendered[-1][1] == expected_total,
+        )
+    finally:
+        writer.join()
+        reader.stop()
+        ser.close()
+        os.close(master)
+        os.close(slave)
+
+    stats = reader.stats()
+    assert counter.total_pieces == expected_total
+    assert stats["published"] == len(outputs)  # Las salidas reciben todas las lecturas
+    assert stats["renders"] == len(root.rendered) <= stats["published"]
+    assert ser.timeout == 0
+
+
+def test_reconnects_without_blocking(tmp_path):
+    master, slave = open_pty()
+    ser = serial.Serial(os.ttyname(slave), timeout=1)
+    root = HeadlessRoot()
+    counter = CumulativeCounter()
+    manager = ReconnectManager(
+        patterns=(str(tmp_path / "COM*"),),
+        preferred=lambda: None,
+        backoff=Backoff(initial=0.02, maximum=0.05),
+        probe_timeout=0.05,
+        search=True,
+    )
+    registry = MetricsRegistry()
+    reader = TkSerialReader(root, ser, counter, reconnector=manager, metrics=registry).start()
+    ticks = []
+    root.after(10, lambda: ticks.append(1))
+
+    second = None
+    try:
+        os.write(master, encode_frame(5000, 9990, True))
+        assert run_until(root, lambda: counter.total_pieces == 9990)
+
+        os.close(master)  # El adaptador desaparece
+        os.close(slave)
+        assert run_until(root, lambda: root.connection_lost == 1)
+        root.mainloop(0.2)  # Varios intentos fallidos: el bucle sigue atendiendo
+        assert ticks and manager.attempts > 1
+
+        # Reaparece con otro nombre y vuelve a enviar
+        second = open_pty()
+        os.symlink(os.ttyname(second[1]), tmp_path / "COM5")
+        feeder = threading.Event()
+
+        def feed():
+            while not feeder.wait(0.02):
+                os.write(second[0], encode_frame(6000, 5, True))
+
+        threading.Thread(target=feed, daemon=True).start()
+        assert run_until(root, lambda: counter.total_pieces == 10005)
+        feeder.set()
+    finally:
+        reader.stop()
+        if second is not None:
+            os.close(second[0])
+            os.close(second[1])
+
+    assert manager.recoveries == 1
+    assert root.rendered[-1][1] == 10005
+    samples = dict(line.rsplit(" ", 1) for line in registry.render().splitlines() if line[0] != "#")
+    assert float(samples["uwf_reconnect_attempts_total"]) == manager.attempts
+    assert float(samples["uwf_reconnect_recoveries_total"]) == 1
+    downtime = float(samples["uwf_reconnect_last_downtime_seconds"])
+    assert downtime == float(samples["uwf_reconnect_max_downtime_seconds"]) > 0
+
+
+def test_probing_mute_port_keeps_loop_responsive(tmp_path):
+    master, slave = open_pty()
+    mute = open_pty()  # Otro equipo que no transmite
+    os.symlink(os.ttyname(mute[1]), tmp_path / "COM7")
+    ser = serial.Serial(os.ttyname(slave), timeout=1)
+    root = HeadlessRoot()
+    manager = ReconnectManager(
+        patterns=(str(tmp_path / "COM*"),),
+        preferred=lambda: None,
+        backoff=Backoff(initial=0.02, maximum=0.05),
+        probe_timeout=0.5,
+        search=True,
+    )
+    reader = TkSerialReader(root, ser, CumulativeCounter(), reconnector=manager).start()
+    ticks = []
+
+    def tick():
+        ticks.append(time.monotonic())
+        root.after(10, tick)
+
+    try:
+        os.close(master)
+        os.close(slave)
+        assert run_until(root, lambda: root.connection_lost == 1)
+        root.after(0, tick)
+        root.mainloop(0.8)  # Más que un probe_timeout completo
+    finally:
+        reader.stop()
+        os.close(mute[0])
+        os.close(mute[1])
+
+    assert manager.attempts >= 1 and manager.recoveries == 0
+    assert max(b - a for a, b in zip(ticks, ticks[1:])) < 0.1
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Convierte logs de texto (hex + ASCII, formato de ``src/data``) al formato
+binario ``.uwfcap`` (ver ``protocol/capture.py``).
+
+Los logs de texto no guardan tiempos; con ``--interval`` se generan
+timestamps sintéticos a intervalo fijo (ej. el delay del simulador).
+
+Uso:
+    python tools/convert_capture.py data/*.txt --out-dir capturas/ [--interval 0.1]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Agregar el directorio src al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from protocol.capture import CAPTURE_SUFFIX, CaptureWriter
+from simulator.simulator import parse_hex_line
+
+
+def convert(text_path, out_path, interval=None):
+    """
+    Convierte un log de texto. Devuelve el ``CaptureWriter`` cerrado
+    (``count``/``skipped``) y el número de líneas no parseables.
+    """
+    parse_failures = 0
+    writer = None
+    with open(text_path, "r") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            packet = parse_hex_line(line)
+            if packet is None:
+                parse_failures += 1
+                continue
+            if writer is None:
+                # El tamaño de paquete del archivo lo fija el primer paquete
+                writer = CaptureWriter(
+                    out_path,
+                    frame_length=len(packet),
+                    with_timestamps=interval is not None,
+                    base_time_ns=time.time_ns() if interval is not None else 0,
+                )
+            timestamp = None
+            if interval is not None:
+                timestamp = round(writer.count * interval * 1e9)
+            writer.write(packet, timestamp)
+
+    if writer is None:
+        writer = CaptureWriter(out_path, with_timestamps=interval is not None)
+    writer.close()
+    return writer, parse_failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convierte logs de texto a .uwfcap")
+    parser.add_argument("logs", nargs="+", type=Path)
+    parser.add_argument("--out-dir", type=Path, default=None)
+    parser.add_argument(
+        "--interval", type=float, default=None, help="Segundos entre paquetes (timestamps)"
+    )
+    args = parser.parse_args()
+
+    for text_path in args.logs:
+        out_dir = args.out_dir or text_path.parent
+        out_dir.mkdir(parents=True, exist_ok=True)
+        out_path = out_dir / (text_path.stem + CAPTURE_SUFFIX)
+        writer, parse_failures = convert(text_path, out_path, args.interval)
+
+        text_size = text_path.stat().st_size
+        bin_size = out_path.stat().st_size
+        print(
+            f"✅ {text_path.name} → {out_path.name}: {writer.count} paquetes, "
+            f"{text_size:,} B → {bin_size:,} B ({text_size / max(bin_size, 1):.1f}x)"
+        )
+        if writer.skipped or parse_failures:
+            print(
+                f"   ⚠️  Omitidos: {parse_failures} líneas no parseables, "
+                f"{writer.skipped} paquetes de longitud distinta"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+Generador de capturas sintéticas grandes para pruebas de larga duración.
+
+Escribe los paquetes directo a disco por bloques, con memoria constante,
+en uno de tres formatos (según la extensión o ``--format``):
+
+- ``hex``: log de texto como los de ``src/data`` (hex + ASCII, CRLF)
+- ``uwfcap``: captura binaria (``protocol/capture.py``), con timestamps
+  si se indica ``--interval``
+- ``raw``: los bytes tal como llegan por la línea serie
+
+Cada bloque se calcula con NumPy: piezas con paso de Poisson (``--rate``
+piezas por paquete mientras cuenta), monto proporcional
+(``--monto-per-piece``), desbordamientos 9999 -> 0, reinicios manuales a
+0/0, repeticiones en reposo, cambios de status y ruido (paquetes con un
+dígito alterado y, en ``hex``/``raw``, basura entre paquetes). El checksum
+es el XOR de la parte constante del paquete, precalculado, con el de las
+columnas de dígitos.
+
+Al terminar informa lo inyectado y el total que debe mostrar el visor
+(lógica de ``CumulativeCounter`` reproducida con ``replay_counter``).
+
+Uso:
+    python tools/generate_capture.py soak.txt --frames 1000000 --overflows 50
+    python tools/generate_capture.py soak.uwfcap --frames 100000000 --interval 0.1
+"""
+
+import argparse
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+# Agregar el directorio src al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from protocol.capture import CAPTURE_SUFFIX, CaptureWriter
+from protocol.encoder import encode_frame
+from protocol.framing import FRAME_LENGTH
+from tools.replay_analyzer import replay_counter
+
+FORMATS = ("hex", "uwfcap", "raw")
+BLOCK_FRAMES = 1 << 18
+MAX_PIEZAS = 10000
+MAX_MONTO = 10**13  # 13 dígitos: el monto da la vuelta como un contador físico
+
+# Columnas variables del paquete (ver protocol/encoder.py)
+_STATUS_COL = 3
+_MONTO_COLS = range(8, 21)
+_PIEZAS_COLS = range(24, 28)
+_CHECKSUM_COL = FRAME_LENGTH - 1
+
+# Plantilla de paquete (los campos variables se sobrescriben)
+_TEMPLATE = np.frombuffer(encode_frame(0, 0, status=False), dtype=np.uint8)
+# XOR de las columnas fijas de los bytes 1..28: el checksum de un paquete es
+# este valor con el XOR de las columnas variables
+_FIXED_COLS = sorted(
+    set(range(1, _CHECKSUM_COL)) - {_STATUS_COL, *_MONTO_COLS, *_PIEZAS_COLS}
+)
+_FIXED_XOR = int(np.bitwise_xor.reduce(_TEMPLATE[_FIXED_COLS]))
+
+# Línea de log: 30 tokens "hh " + 7 espacios + ASCII (30) + 2 espacios + CRLF
+_HEX_COLS = np.arange(FRAME_LENGTH) * 3
+_ASCII_START = FRAME_LENGTH * 3 + 7
+LINE_WIDTH = _ASCII_START + FRAME_LENGTH + 4
+_LINE_TEMPLATE = np.frombuffer(
+    b" " * _ASCII_START + b" " * FRAME_LENGTH + b"  \r\n", dtype=np.uint8
+)
+_HEX_HI = np.frombuffer(b"0123456789abcdef", dtype=np.uint8).repeat(16)
+_HEX_LO = np.tile(np.frombuffer(b"0123456789abcdef", dtype=np.uint8), 16)
+_PRINTABLE = np.where(
+    (np.arange(256) >= 0x20) & (np.arange(256) < 0x7F), np.arange(256), 0x2E
+).astype(np.uint8)
+
+
+@dataclass(frozen=True)
+class GeneratorConfig:
+    frames: int = 1_000_000
+    rate: float = 5.0  # Piezas por paquete (media, Poisson) mientras cuenta
+    monto_per_piece: int = 1000
+    resets: int = 0  # Reinicios manuales (piezas y monto a 0), en posiciones al azar
+    idle_prob: float = 0.3  # Paquete repetido (máquina en reposo)
+    status_flip_prob: float = 0.0  # Cambio de status por paquete
+    corrupt_prob: float = 0.0  # Paquete con un dígito alterado (checksum inválido)
+    noise_prob: float = 0.0  # Basura antes del paquete (hex/raw)
+    interval: float = None  # Segundos entre paquetes (timestamps .uwfcap)
+    seed: int = 0  # Misma semilla y tamaño de bloque -> mismos paquetes
+
+
+@dataclass
+class GenerationReport:
+    path: str
+    format: str
+    frames: int = 0  # Paquetes escritos, incluidos los alterados
+    bytes: int = 0
+    overflows: int = 0
+    resets: int = 0
+    corrupted: int = 0
+    noise: int = 0  # Bloques de basura insertados
+    final_total: int = 0  # Total que debe mostrar el visor
+    elapsed: float = 0.0
+
+
+def rate_for_overflows(overflows, frames, idle_prob=0.3):
+    """
+    Piezas por paquete para obtener ~``overflows`` desbordamientos en
+    ``frames`` paquetes (sin reinicios; con reinicios quedan menos).
+    """
+    active = frames * (1 - idle_prob)
+    return (overflows + 0.5) * MAX_PIEZAS / max(active, 1)
+
+
+def format_for(path, fmt=None):
+    if fmt is not None:
+        return fmt
+    suffix = Path(path).suffix
+    if suffix == CAPTURE_SUFFIX:
+        return "uwfcap"
+    return "hex" if suffix in (".txt", ".log") else "raw"
+
+
+class _State:
+    """Estado que cruza los bloques."""
+
+    def __init__(self):
+        self.pieces = 0  # Piezas desde el último reinicio
+        self.status = 1
+        self.index = 0  # Número del primer paquete del bloque
+        # replay_counter: offset y última lectura válida
+        self.offset = 0
+        self.piezas = 0
+        self.monto = 0
+
+
+def _fill_digits(frames, cols, values):
+    """
+    Escribe ``values`` en ASCII en las columnas ``cols`` (más significativo
+    primero) y devuelve el XOR de esas columnas por paquete.
+    """
+    values = values.copy()
+    acc = np.zeros(len(values), dtype=np.uint8)
+    for col in reversed(cols):
+        values, digit = np.divmod(values, 10)
+        digit = digit.astype(np.uint8)
+        digit += 0x30
+        frames[:, col] = digit
+        acc ^= digit
+    return acc
+
+
+def _generate_block(config, rng, state, n, reset_at, frames):
+    """
+    Llena ``frames[:n]`` y devuelve ``(piezas, monto, corrupt, overflows)``.
+    """
+    frames = frames[:n]
+    step = rng.poisson(config.rate, n)
+    step[rng.random(n) < config.idle_prob] = 0
+    reset = np.zeros(n, dtype=bool)
+    reset[reset_at] = True
+    step[reset] = 0
+
+    counted = state.pieces + np.cumsum(step)
+    counted -= np.maximum.accumulate(np.where(reset, counted, 0))
+    cycles = counted // MAX_PIEZAS
+    prev_cycles = np.concatenate(([state.pieces // MAX_PIEZAS], cycles[:-1]))
+    overflows = int(np.count_nonzero((cycles > prev_cycles) & ~reset))
+    state.pieces = int(counted[-1])
+    piezas = counted % MAX_PIEZAS
+    monto = counted * config.monto_per_piece % MAX_MONTO
+
+    if config.status_flip_prob:
+        flips = np.cumsum(rng.random(n) < config.status_flip_prob)
+        status = ((state.status + flips) & 1).astype(np.uint8)
+        state.status = int(status[-1])
+    else:
+        status = np.full(n, state.status, dtype=np.uint8)
+    status += 0x30
+
+    frames[:, _STATUS_COL] = status
+    checksum = status ^ np.uint8(_FIXED_XOR)
+    checksum ^= _fill_digits(frames, _MONTO_COLS, monto)
+    checksum ^= _fill_digits(frames, _PIEZAS_COLS, piezas)
+    frames[:, _CHECKSUM_COL] = checksum
+
+    corrupt = np.flatnonzero(rng.random(n) < config.corrupt_prob) if config.corrupt_prob else []
+    if len(corrupt):
+        # Dígito -> otro dígito: el paquete parece válido salvo por el checksum
+        cols = rng.choice(np.array([*_MONTO_COLS, *_PIEZAS_COLS]), len(corrupt))
+        frames[corrupt, cols] ^= 1
+    return piezas, monto, corrupt, overflows
+
+
+def _noise(rng, fmt):
+    """
+    Bloque de basura: bytes al azar (``raw``) o una línea de tokens hex que
+    no forma un paquete (``hex``).
+    """
+    garbage = rng.integers(0, 256, int(rng.integers(1, 29)), dtype=np.uint8)
+    # Sin STX: la basura no arrastra al paquete siguiente ni forma una línea válida
+    garbage[garbage == 0x02] = 0x00
+    if fmt == "raw":
+        return garbage.tobytes()
+    return " ".join(f"{b:02x}" for b in garbage.tobytes()).encode() + b"\r\n"
+
+
+def generate(path, config=GeneratorConfig(), fmt=None, block_frames=BLOCK_FRAMES):
+    """
+    Genera la captura en ``path`` y devuelve un ``GenerationReport``.
+    """
+    start = time.perf_counter()
+    fmt = format_for(path, fmt)
+    if fmt not in FORMATS:
+        raise ValueError(f"Formato desconocido: {fmt}")
+    if config.noise_prob and fmt == "uwfcap":
+        raise ValueError("Las capturas .uwfcap solo guardan paquetes: use corrupt_prob")
+    if config.rate >= MAX_PIEZAS / 2:
+        # Con pasos tan grandes CumulativeCounter no distingue un desbordamiento
+        raise ValueError(f"rate debe ser menor que {MAX_PIEZAS // 2} piezas por paquete")
+
+    report = GenerationReport(path=str(path), format=fmt)
+    # La basura usa su propio generador: los paquetes no dependen del formato
+    rng, noise_rng = (np.random.default_rng(s) for s in np.random.SeedSequence(config.seed).spawn(2))
+    reset_positions = np.unique(rng.integers(1, max(config.frames, 2), config.resets))
+    state = _State()
+
+    frames = np.empty((min(block_frames, config.frames), FRAME_LENGTH), dtype=np.uint8)
+    frames[:] = _TEMPLATE
+    lines = None
+    if fmt == "hex":
+        lines = np.empty((len(frames), LINE_WIDTH), dtype=np.uint8)
+        lines[:] = _LINE_TEMPLATE
+
+    if fmt == "uwfcap":
+        out = CaptureWriter(
+            path,
+            with_timestamps=config.interval is not None,
+            base_time_ns=time.time_ns() if config.interval is not None else 0,
+        )
+    else:
+        out = open(path, "wb")
+    try:
+        while state.index < config.frames:
+            n = min(len(frames), config.frames - state.index)
+            lo, hi = np.searchsorted(reset_positions, (state.index, state.index + n))
+            piezas, monto, corrupt, overflows = _generate_block(
+                config, rng, state, n, reset_positions[lo:hi] - state.index, frames
+            )
+            report.overflows += overflows
+            report.resets += int(hi - lo)
+            report.corrupted += len(corrupt)
+
+            if fmt == "uwfcap":
+                timestamps = None
+                if config.interval is not None:
+                    timestamps = np.arange(state.index, state.index + n) * config.interval * 1e9
+                    timestamps = timestamps.round().astype(np.int64)
+                out.write_many(frames[:n], timestamps)
+            else:
+                rows = frames[:n]
+                if fmt == "hex":
+                    rows = lines[:n]
+                    rows[:, _HEX_COLS] = _HEX_HI[frames[:n]]
+                    rows[:, _HEX_COLS + 1] = _HEX_LO[frames[:n]]
+                    rows[:, _ASCII_START : _ASCII_START + FRAME_LENGTH] = _PRINTABLE[frames[:n]]
+                noisy = (
+                    np.flatnonzero(noise_rng.random(n) < config.noise_prob)
+                    if config.noise_prob
+                    else []
+                )
+                last = 0
+                for i in noisy:
+                    out.write(rows[last:i])
+                    out.write(_noise(noise_rng, fmt))
+                    last = i
+                out.write(rows[last:])
+                report.noise += len(noisy)
+
+            # Lo que verá el visor: los paquetes alterados se descartan
+            keep = np.ones(n, dtype=bool)
+            keep[corrupt] = False
+            if keep.any():
+                result = replay_counter(
+                    piezas[keep], monto[keep], state.offset, state.piezas, state.monto
+                )
+                state.offset = result.final_offset
+                state.piezas, state.monto = int(piezas[keep][-1]), int(monto[keep][-1])
+            state.index += n
+    finally:
+        out.close()
+
+    report.frames = state.index
+    report.final_total = state.offset + state.piezas
+    report.bytes = Path(path).stat().st_size
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("output", type=Path)
+    parser.add_argument("--format", choices=FORMATS, default=None, help="Por defecto, según extensión")
+    parser.add_argument("--frames", type=int, default=1_000_000)
+    rate = parser.add_mutually_exclusive_group()
+    rate.add_argument("--rate", type=float, default=None, help="Piezas por paquete mientras cuenta")
+    rate.add_argument("--overflows", type=int, default=None, help="Desbordamientos aproximados")
+    parser.add_argument("--monto-per-piece", type=int, default=1000)
+    parser.add_argument("--resets", type=int, default=0, help="Reinicios manuales")
+    parser.add_argument("--idle", type=float, default=0.3, help="Fracción de paquetes repetidos")
+    parser.add_argument("--status-flips", type=float, default=0.0, help="Probabilidad por paquete")
+    parser.add_argument("--corrupt", type=float, default=0.0, help="Fracción de checksum inválido")
+    parser.add_argument("--noise", type=float, default=0.0, help="Fracción con basura delante")
+    parser.add_argument("--interval", type=float, default=None, help="Segundos entre paquetes")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.overflows is not None:
+        rate = rate_for_overflows(args.overflows, args.frames, args.idle)
+    else:
+        rate = 5.0 if args.rate is None else args.rate
+    config = GeneratorConfig(
+        frames=args.frames,
+        rate=rate,
+        monto_per_piece=args.monto_per_piece,
+        resets=args.resets,
+        idle_prob=args.idle,
+        status_flip_prob=args.status_flips,
+        corrupt_prob=args.corrupt,
+        noise_prob=args.noise,
+        interval=args.interval,
+        seed=args.seed,
+    )
+    try:
+        report = generate(args.output, config, args.format)
+    except ValueError as e:
+        parser.error(str(e))
+
+    print(
+        f"✅ {report.path} ({report.format}): {report.frames:,} paquetes, "
+        f"{report.bytes / 1e6:,.1f} MB en {report.elapsed:.1f} s "
+        f"({report.frames / report.elapsed:,.0f} paquetes/s)"
+    )
+    print(
+        f"   Desbordamientos: {report.overflows:,}  Reinicios: {report.resets:,}  "
+        f"Alterados: {report.corrupted:,}  Basura: {report.noise:,}"
+    )
+    print(f"   Total esperado en el visor: {report.final_total:,}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
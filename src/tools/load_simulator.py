@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""
+Simulador de carga: muchas contadoras a la vez desde un solo proceso.
+
+Cada dispositivo es un par pty (o un puerto serie real con ``--serial``)
+atendido por una corrutina de ``asyncio``: reproduce un log de ``src/data``
+(en bucle) o un flujo sintético (``synthetic[:escenario]``, ver
+``bench/synthetic.py``) a su propio ritmo, empieza con un retraso al azar y
+puede desconectarse (el pty se cierra y reaparece en la misma ruta tras
+``--downtime``) e insertar ráfagas de ruido. Los pty se publican como
+enlaces ``<link-dir>/<nombre>`` para apuntar el visor a rutas estables:
+
+    python tools/load_simulator.py --devices 16 --rates 10 30 60
+    python monitor.py --port M1=/tmp/uwf-load/M1 --port M2=/tmp/uwf-load/M2 ...
+
+Los envíos se programan contra plazos absolutos; con ritmos altos se
+agrupan los paquetes vencidos en una sola escritura. El atraso de un
+puerto es cuánto después de su plazo terminó de escribirse el paquete más
+antiguo de cada escritura: crece cuando el lector no vacía el puerto (el
+buffer del pty se llena y la escritura espera). Cada segundo se informan
+los paquetes/s entregados y el peor atraso del momento; al terminar, el
+detalle por puerto.
+"""
+
+import argparse
+import asyncio
+import itertools
+import math
+import os
+import random
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import serial
+
+# Agregar el directorio src al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bench.synthetic import SCENARIOS, synthetic_frames
+from core.pacing import JitterStats
+from protocol.framing import FRAME_LENGTH
+from simulator.simulator import iter_packets
+from tools.pty_harness import open_pty
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+LINK_DIR = Path("/tmp/uwf-load")
+SYNTHETIC = "synthetic"
+MAX_BATCH = 256  # Paquetes por escritura como máximo
+MIN_SLEEP = 0.002  # Espera mínima entre escrituras de un dispositivo
+NOISE_LENGTH = (8, 64)  # Bytes por ráfaga de ruido (mín, máx)
+
+
+@dataclass(frozen=True)
+class DeviceSpec:
+    name: str
+    source: str  # Ruta de log/captura o "synthetic[:escenario]"
+    rate: float  # Paquetes/s (0: lo más rápido posible)
+    offset: float = 0.0  # Segundos antes del primer paquete
+    disconnect_every: float = 0.0  # Media de segundos entre desconexiones (0: nunca)
+    downtime: float = 1.0  # Segundos desconectado
+    noise_every: float = 0.0  # Media de segundos entre ráfagas de ruido (0: nunca)
+    seed: int = 0
+
+
+@dataclass
+class DeviceReport:
+    name: str
+    path: str
+    source: str
+    rate: float
+    frames: int = 0
+    bytes: int = 0
+    noise_bursts: int = 0
+    disconnects: int = 0
+    backlog: int = 0  # Paquetes vencidos sin enviar al terminar
+    lag: JitterStats = field(default_factory=JitterStats)
+
+
+@dataclass
+class LoadReport:
+    elapsed: float
+    devices: list
+
+    @property
+    def frames(self):
+        return sum(d.frames for d in self.devices)
+
+    @property
+    def frames_per_s(self):
+        return self.frames / self.elapsed if self.elapsed else 0.0
+
+
+def frame_source(source, seed=0):
+    """
+    Iterador infinito de paquetes de ``source`` (log en bucle o sintético).
+    """
+    name, _, scenario = source.partition(":")
+    if name == SYNTHETIC:
+        return synthetic_frames(SCENARIOS[scenario or "conteo"], seed=seed)
+    return iter_packets(source, verbose=False, loop=True)
+
+
+def default_sources():
+    """
+    Logs de ``src/data`` con paquetes completos (los generados con 29 bytes
+    el visor los descarta) y un flujo sintético.
+    """
+    logs = [
+        str(path)
+        for path in sorted(DATA_DIR.glob("*.txt"))
+        if len(next(iter_packets(path, verbose=False), b"")) == FRAME_LENGTH
+    ]
+    return logs + [SYNTHETIC]
+
+
+def make_specs(count, sources, rates, max_offset=1.0, seed=0, **options):
+    """
+    ``count`` dispositivos ``M1..Mn`` repartiendo fuentes y ritmos en
+    rueda, con retrasos de inicio al azar en ``[0, max_offset)``.
+    """
+    rng = random.Random(seed)
+    return [
+        DeviceSpec(
+            name=f"M{i + 1}",
+            source=str(source),
+            rate=rate,
+            offset=rng.uniform(0, max_offset),
+            seed=seed + i,
+            **options,
+        )
+        for i, source, rate in zip(range(count), itertools.cycle(sources), itertools.cycle(rates))
+    ]
+
+
+class Device:
+    """
+    Un dispositivo simulado: su puerto, su fuente y su corrutina de envío.
+    """
+
+    def __init__(self, spec, link_dir=None, serial_port=None, baudrate=19200):
+        self.spec = spec
+        self.link = Path(link_dir) / spec.name if link_dir is not None else None
+        self.serial_port = serial_port
+        self.baudrate = baudrate
+        self.fd = None
+        self._slave = None
+        self._ser = None
+        self._start = None  # Plan de envíos vigente: inicio y paquetes enviados
+        self._sent = 0
+        self.report = DeviceReport(
+            spec.name, str(serial_port or self.link), spec.source, spec.rate
+        )
+
+    def open(self):
+        if self.serial_port is not None:
+            # pyserial abre el descriptor en modo no bloqueante
+            self._ser = serial.Serial(self.serial_port, baudrate=self.baudrate, timeout=0)
+            self.fd = self._ser.fileno()
+            return
+        master, self._slave = open_pty()
+        os.set_blocking(master, False)
+        self.fd = master
+        # Reemplazo atómico: el lector nunca ve la ruta a medio crear
+        tmp = self.link.with_name(self.link.name + ".tmp")
+        tmp.unlink(missing_ok=True)
+        os.symlink(os.ttyname(self._slave), tmp)
+        os.replace(tmp, self.link)
+
+    def close(self):
+        if self._ser is not None:
+            self._ser.close()
+            self._ser = None
+        elif self.fd is not None:
+            self.link.unlink(missing_ok=True)
+            os.close(self.fd)
+            os.close(self._slave)
+        self.fd = None
+
+    async def _writable(self):
+        loop = asyncio.get_running_loop()
+        ready = loop.create_future()
+        loop.add_writer(self.fd, lambda: ready.done() or ready.set_result(None))
+        try:
+            await ready
+        finally:
+            loop.remove_writer(self.fd)
+
+    async def _write(self, data):
+        view = memoryview(data)
+        while view:
+            try:
+                view = view[os.write(self.fd, view) :]
+            except BlockingIOError:
+                await self._writable()
+
+    async def _disconnect(self):
+        self.report.disconnects += 1
+        if self._ser is not None:
+            # Un puerto real no se puede desenchufar: la línea queda en silencio
+            await asyncio.sleep(self.spec.downtime)
+        else:
+            self.close()
+            await asyncio.sleep(self.spec.downtime)
+            self.open()
+        # El equipo apagado no acumula paquetes: el plan empieza de nuevo
+        self._start = asyncio.get_running_loop().time()
+        self._sent = 0
+
+    async def run(self):
+        spec = self.spec
+        report = self.report
+        loop = asyncio.get_running_loop()
+        rng = random.Random(spec.seed)
+
+        def next_event(mean):
+            return loop.time() + rng.expovariate(1 / mean) if mean else math.inf
+
+        # Abrir la fuente antes del plan: la primera lectura no cuenta como atraso
+        frames = frame_source(spec.source, spec.seed)
+        frames = itertools.chain([next(frames)], frames)
+        await asyncio.sleep(spec.offset)
+        self._start = loop.time()
+        self._sent = 0
+        disconnect_at = next_event(spec.disconnect_every)
+        noise_at = next_event(spec.noise_every)
+        while True:
+            now = loop.time()
+            if now >= disconnect_at:
+                self._start = None
+                await self._disconnect()
+                disconnect_at = next_event(spec.disconnect_every)
+                continue
+            if spec.rate > 0:
+                due = min(int((now - self._start) * spec.rate) + 1 - self._sent, MAX_BATCH)
+                if due <= 0:
+                    await asyncio.sleep(max(self._start + self._sent / spec.rate - now, MIN_SLEEP))
+                    continue
+            else:
+                due = MAX_BATCH
+            batch = list(itertools.islice(frames, due))
+            if not batch:
+                return
+            chunk = b"".join(batch)
+            if now >= noise_at:
+                noise = rng.randbytes(rng.randint(*NOISE_LENGTH)).translate(None, b"\x02")
+                chunk = noise + chunk
+                report.noise_bursts += 1
+                noise_at = next_event(spec.noise_every)
+            await self._write(chunk)
+            if spec.rate > 0:
+                report.lag.add(max(loop.time() - (self._start + self._sent / spec.rate), 0.0))
+            else:
+                await asyncio.sleep(0)  # Sin ritmo: ceder a los demás dispositivos
+            self._sent += len(batch)
+            report.frames += len(batch)
+            report.bytes += len(chunk)
+
+    def current_lag(self, now):
+        """
+        Atraso del próximo paquete en ``now`` (0 si va al día o está desconectado).
+        """
+        if self._start is None or self.spec.rate <= 0:
+            return 0.0
+        return max(now - (self._start + self._sent / self.spec.rate), 0.0)
+
+    def finish(self, now):
+        """
+        Anota los plazos vencidos en ``now`` que no llegaron a escribirse
+        (una escritura bloqueada cuenta con su atraso al terminar).
+        """
+        if self._start is not None and self.spec.rate > 0:
+            due = int((now - self._start) * self.spec.rate)
+            self.report.backlog = max(due - self._sent, 0)
+            if self.report.backlog:
+                self.report.lag.add(self.current_lag(now))
+
+
+class LoadSimulator:
+    """
+    Corre varios ``Device`` en un bucle de ``asyncio``. ``open()`` crea los
+    puertos (antes de apuntar el lector a ellos); ``run()`` envía durante
+    ``duration`` segundos y devuelve un ``LoadReport``.
+    """
+
+    def __init__(self, specs, link_dir=LINK_DIR, serial_ports=None, baudrate=19200):
+        serial_ports = serial_ports or [None] * len(specs)
+        self.link_dir = Path(link_dir)
+        self.devices = [
+            Device(spec, self.link_dir, port, baudrate) for spec, port in zip(specs, serial_ports)
+        ]
+
+    def open(self):
+        self.link_dir.mkdir(parents=True, exist_ok=True)
+        for device in self.devices:
+            device.open()
+        return self
+
+    def close(self):
+        for device in self.devices:
+            device.close()
+
+    async def run(self, duration, report_interval=None, on_report=None):
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        tasks = [asyncio.create_task(device.run()) for device in self.devices]
+        reporter = None
+        if report_interval and on_report is not None:
+            reporter = asyncio.create_task(self._report_every(report_interval, on_report))
+        try:
+            await asyncio.wait(tasks, timeout=duration)
+        finally:
+            for task in tasks + [reporter]:
+                if task is not None:
+                    task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        now = loop.time()
+        for device in self.devices:
+            device.finish(now)
+        return LoadReport(now - start, [device.report for device in self.devices])
+
+    async def _report_every(self, interval, on_report):
+        last = 0
+        while True:
+            await asyncio.sleep(interval)
+            now = asyncio.get_running_loop().time()
+            frames = sum(d.report.frames for d in self.devices)
+            worst = max(d.current_lag(now) for d in self.devices)
+            on_report((frames - last) / interval, worst)
+            last = frames
+
+
+def print_report(report):
+    print(
+        f"\n{'puerto':<6} {'fuente':<28} {'paq/s':>6} {'enviados':>9} {'atraso ms':>10} "
+        f"{'máx ms':>8} {'pend.':>6} {'desc.':>5} {'ruido':>5}"
+    )
+    for d in report.devices:
+        print(
+            f"{d.name:<6} {Path(d.source).name[:28]:<28} {d.rate:>6.0f} {d.frames:>9} "
+            f"{d.lag.mean * 1000:>10.2f} {d.lag.max * 1000:>8.2f} {d.backlog:>6} "
+            f"{d.disconnects:>5} {d.noise_bursts:>5}"
+        )
+    print(f"\nTotal: {report.frames} paquetes en {report.elapsed:.1f} s = {report.frames_per_s:.0f} paq/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--devices", type=int, default=8)
+    parser.add_argument(
+        "--source",
+        action="append",
+        dest="sources",
+        help=f"Log, captura o {SYNTHETIC}[:{'|'.join(SCENARIOS)}] (repetible; en rueda)",
+    )
+    parser.add_argument("--rates", type=float, nargs="+", default=[10, 30, 60])
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--max-offset", type=float, default=1.0)
+    parser.add_argument("--disconnect-every", type=float, default=0.0)
+    parser.add_argument("--downtime", type=float, default=1.0)
+    parser.add_argument("--noise-every", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--link-dir", type=Path, default=LINK_DIR)
+    parser.add_argument(
+        "--serial", action="append", help="Puerto serie real en lugar de pty (repetible)"
+    )
+    parser.add_argument("--baudrate", type=int, default=19200)
+    args = parser.parse_args()
+
+    sources = args.sources or default_sources()
+    count = len(args.serial) if args.serial else args.devices
+    specs = make_specs(
+        count,
+        sources,
+        args.rates,
+        max_offset=args.max_offset,
+        seed=args.seed,
+        disconnect_every=args.disconnect_every,
+        downtime=args.downtime,
+        noise_every=args.noise_every,
+    )
+    simulator = LoadSimulator(specs, args.link_dir, args.serial, args.baudrate).open()
+    if not args.serial:
+        ports = " ".join(f"--port {d.spec.name}={d.link}" for d in simulator.devices)
+        print(f"Visor: python src/monitor.py {ports}\n")
+
+    def on_report(fps, worst):
+        print(f"{time.strftime('%H:%M:%S')}  {fps:>9.0f} paq/s  atraso máx {worst * 1000:7.2f} ms")
+
+    try:
+        report = asyncio.run(simulator.run(args.duration, 1.0, on_report))
+    except KeyboardInterrupt:
+        return
+    finally:
+        simulator.close()
+    print_report(report)
+
+
+if __name__ == "__main__":
+    main()
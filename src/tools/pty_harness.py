@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Arnés de punta a punta sin procesos externos.
+
+Crea un par pty con ``os.openpty()`` dentro del proceso, corre el pipeline
+de lectura del visor (``core.reader.run_reader``, sin GUI) sobre el extremo
+esclavo y escribe un log de ``src/data`` en el maestro tan rápido como el
+lector lo acepta (``os.write`` bloquea cuando el buffer del pty se llena).
+Al terminar compara paquetes y total acumulado con los de procesar los
+mismos bytes sin pty (``FrameScanner`` + ``FrameDecoder`` +
+``CumulativeCounter`` en una sola pasada): cualquier diferencia viene del
+transporte, de los bloques de lectura o del bucle del lector.
+
+Reemplaza a ``socat`` + ``simulator.py`` + ``main.py`` para pruebas: sin
+esperas fijas ni subprocesos.
+
+Uso:
+    python tools/pty_harness.py [archivo ...]   (por defecto, todo src/data)
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+import tty
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import serial
+
+# Agregar el directorio src al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.counter import CumulativeCounter
+from core.mailbox import LatestValueMailbox
+from core.reader import run_reader
+from protocol.decoder import FrameDecoder
+from protocol.framing import FrameScanner, RepeatFilter
+from simulator.simulator import read_log_file
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+
+
+@dataclass
+class HarnessResult:
+    path: Path
+    frames: int  # Paquetes que el lector recibió
+    expected_frames: int
+    total: int  # Total acumulado del lector
+    expected_total: int
+    elapsed: float
+    stats: dict = field(default_factory=dict)  # Estadísticas de run_reader
+
+    @property
+    def ok(self):
+        return self.frames == self.expected_frames and self.total == self.expected_total
+
+
+def reference(stream):
+    """
+    ``(paquetes, total)`` de procesar ``stream`` de una vez, sin pty.
+    """
+    decoder = FrameDecoder()
+    counter = CumulativeCounter()
+    frames = FrameScanner().feed(stream)
+    for frame in frames:
+        reading = decoder.decode(frame)
+        if reading is not None:
+            counter.update(reading)
+    return len(frames), counter.total_pieces
+
+
+def open_pty():
+    """
+    Par ``(maestro, esclavo)`` en modo crudo: sin modo canónico ETX (0x03)
+    sería Ctrl+C y los paquetes llegarían alterados.
+    """
+    master, slave = os.openpty()
+    tty.setraw(slave)
+    return master, slave
+
+
+def _write_all(fd, data, chunk_size):
+    view = memoryview(data)
+    while view:
+        written = os.write(fd, view[:chunk_size])
+        view = view[written:]
+
+
+def replay(path, chunk_size=4096, repeat=1, timeout=60.0):
+    """
+    Reproduce ``path`` (``repeat`` veces seguidas) por un pty a través de
+    ``run_reader`` y devuelve un ``HarnessResult``.
+    """
+    stream = b"".join(read_log_file(path, verbose=False) or []) * repeat
+    expected_frames, expected_total = reference(stream)
+
+    master, slave = open_pty()
+    # pyserial vacía la entrada al abrir: abrir antes de escribir
+    ser = serial.Serial(os.ttyname(slave), baudrate=19200, timeout=0.05)
+    counter = CumulativeCounter()
+    mailbox = LatestValueMailbox()
+    repeat_filter = RepeatFilter()
+    stop_event = threading.Event()
+    stats = {}
+    reader = threading.Thread(
+        target=lambda: stats.update(
+            run_reader(
+                ser,
+                counter,
+                mailbox.publish,
+                repeat_filter=repeat_filter,
+                stop_event=stop_event,
+            )
+        ),
+        daemon=True,
+    )
+
+    start = time.perf_counter()
+    reader.start()
+    try:
+        _write_all(master, stream, chunk_size)
+        # Cada paquete recibido pasa por RepeatFilter.is_new exactamente una vez
+        deadline = time.monotonic() + timeout
+        while repeat_filter.processed + repeat_filter.skipped < expected_frames:
+            if time.monotonic() > deadline:
+                break
+            time.sleep(0.001)
+        elapsed = time.perf_counter() - start
+    finally:
+        stop_event.set()
+        reader.join(timeout=5)
+        ser.close()
+        os.close(master)
+        os.close(slave)
+
+    return HarnessResult(
+        path=Path(path),
+        frames=stats.get("frames", 0),
+        expected_frames=expected_frames,
+        total=counter.total_pieces,
+        expected_total=expected_total,
+        elapsed=elapsed,
+        stats=stats,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("files", nargs="*", type=Path)
+    parser.add_argument("--chunk", type=int, default=4096, help="Bytes por escritura al pty")
+    parser.add_argument("--repeat", type=int, default=1, help="Veces que se repite cada log")
+    args = parser.parse_args()
+
+    files = args.files or sorted(DATA_DIR.glob("*.txt"))
+    start = time.perf_counter()
+    failed = frames = 0
+    for path in files:
+        result = replay(path, args.chunk, args.repeat)
+        failed += not result.ok
+        frames += result.frames
+        print(
+            f"{'✅' if result.ok else '❌'} {path.name:<40} "
+            f"{result.frames:>6}/{result.expected_frames} paquetes  "
+            f"total {result.total:>7}/{result.expected_total}  {result.elapsed:6.2f} s"
+        )
+    elapsed = time.perf_counter() - start
+    print(
+        f"\n{len(files) - failed}/{len(files)} archivos correctos en {elapsed:.2f} s "
+        f"({frames / elapsed:,.0f} paquetes/s)"
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Análisis offline de capturas con NumPy.
+
+Decodifica un log hexadecimal completo (formato de ``src/data/*.txt``) en
+arreglos de monto/piezas/status y reproduce la lógica de desbordamiento de
+``CumulativeCounter.update`` con operaciones vectorizadas, sin pasar por el
+simulador ni por un puerto serie.
+
+Uso:
+    python tools/replay_analyzer.py data/conteo_real_desbordamiento.txt [...]
+"""
+
+import argparse
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Agregar el directorio src al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.counter import CumulativeCounter
+from protocol.capture import CaptureReader, is_capture_file
+from protocol.framing import FRAME_LENGTH
+
+# Una línea de log con un paquete de 30 bytes: "02 30 ... 03 XX" (30 tokens)
+HEX_LINE_WIDTH = FRAME_LENGTH * 3 - 1
+
+# Tabla de pares de caracteres: (alto << 8 | bajo) -> byte, 0x100 si no es hex
+_HEX_DIGITS = {c: int(chr(c), 16) for c in b"0123456789abcdefABCDEF"}
+_HEX_PAIR_LUT = np.full(1 << 16, 0x100, dtype=np.uint16)
+for _hi, _hv in _HEX_DIGITS.items():
+    for _lo, _lv in _HEX_DIGITS.items():
+        _HEX_PAIR_LUT[(_hi << 8) | _lo] = (_hv << 4) | _lv
+
+# Bytes inspeccionados tras los 30 tokens para detectar tokens de más
+_TAIL_WIDTH = 16
+
+
+@dataclass
+class DecodedLog:
+    """
+    Paquetes válidos de un log como columnas NumPy.
+    """
+
+    monto: np.ndarray  # int64
+    piezas: np.ndarray  # int64
+    status: np.ndarray  # bool
+    rechazo_sensor: np.ndarray  # bool
+    lines: int  # Líneas no vacías en el archivo
+    parse_failures: int  # Líneas que no son un paquete STX ... ETX XX de 30 bytes
+    checksum_errors: int
+    malformed: int  # Estructura correcta pero dígitos inválidos
+
+
+@dataclass
+class ReplayResult:
+    """
+    Resultado de reproducir la lógica de ``CumulativeCounter`` sobre un log.
+    """
+
+    totals: np.ndarray  # Total acumulado tras cada paquete
+    overflow_points: np.ndarray  # Índices de paquete con desbordamiento
+    reset_points: np.ndarray  # Índices con reinicio manual o suave
+    final_total: int
+    final_offset: int
+
+
+def hex_lines_to_frames(raw):
+    """
+    Convierte el texto de un log (``bytes``) en una matriz ``(N, 30)`` de
+    paquetes. Devuelve ``(frames, lineas_no_vacias)``; las líneas que no
+    contienen exactamente 30 bytes hexadecimales se omiten.
+    """
+    padded = np.empty(len(raw) + _TAIL_WIDTH, dtype=np.uint8)
+    padded[: len(raw)] = np.frombuffer(raw, dtype=np.uint8)
+    return _padded_text_to_frames(padded, len(raw))
+
+
+def _padded_text_to_frames(padded, size):
+    """
+    Igual que ``hex_lines_to_frames`` sobre un buffer con ``_TAIL_WIDTH``
+    bytes de relleno al final (evita copiar el archivo para rellenarlo).
+    """
+    padded[size:] = 0x0A
+    text = padded[:size]
+    newlines = np.flatnonzero(text == 0x0A)
+    starts = np.concatenate(([0], newlines + 1))
+    ends = np.concatenate((newlines, [len(text)]))
+    non_empty = int(np.count_nonzero(ends - starts > 0))
+
+    # Solo las líneas con espacio suficiente para 30 tokens hexadecimales
+    long_enough = ends - starts >= HEX_LINE_WIDTH
+    starts, ends = starts[long_enough], ends[long_enough]
+    # Ventana de ancho fijo por línea: copia N x (89 + cola) bytes, sin índices por byte
+    window = sliding_window_view(padded, HEX_LINE_WIDTH + _TAIL_WIDTH)[starts]
+
+    # Estructura "HH HH ... HH"
+    spaces_ok = np.all(window[:, 2:HEX_LINE_WIDTH:3] == 0x20, axis=1)
+    pairs = window[:, 0:HEX_LINE_WIDTH:3].astype(np.uint16) << 8
+    pairs |= window[:, 1:HEX_LINE_WIDTH:3]
+    values = _HEX_PAIR_LUT[pairs]
+    hex_ok = values.max(axis=1) < 0x100
+
+    # Como parse_hex_line: tras el token 30 solo puede venir espacio y luego
+    # el "." del texto ASCII o el fin de línea (descarta líneas con más tokens,
+    # ej. paquetes partidos en la captura). Se inspecciona una cola acotada.
+    tail = window[:, HEX_LINE_WIDTH:]
+    is_space = (tail == 0x20) | (tail == 0x09) | (tail == 0x0D)
+    first_other = np.argmin(is_space, axis=1)
+    first_char = tail[np.arange(len(tail)), first_other]
+    tail_ok = np.all(is_space, axis=1) | (first_char == 0x2E) | (first_char == 0x0A)
+
+    frames = values.astype(np.uint8)
+    valid = spaces_ok & tail_ok & hex_ok & (frames[:, 0] == 0x02) & (frames[:, -2] == 0x03)
+    return frames[valid], non_empty
+
+
+def decode_frames(frames, lines=None, verify_checksum=True):
+    """
+    Decodifica una matriz ``(N, 30)`` de paquetes con las mismas reglas que
+    ``FrameDecoder.decode``.
+    """
+    frames = np.asarray(frames, dtype=np.uint8).reshape(-1, FRAME_LENGTH)
+    total = len(frames)
+    keep = np.ones(total, dtype=bool)
+    checksum_errors = 0
+    if verify_checksum:
+        keep = np.bitwise_xor.reduce(frames, axis=1) == 0x02
+        checksum_errors = int(total - np.count_nonzero(keep))
+
+    # Dígitos ASCII -> valor; cualquier byte fuera de "0".."9" queda > 9
+    digits = frames[:, 8:28] - np.uint8(0x30)
+    digits_ok = np.all(digits[:, 0:13] <= 9, axis=1) & np.all(digits[:, 16:20] <= 9, axis=1)
+    malformed = int(np.count_nonzero(keep & ~digits_ok))
+    keep &= digits_ok
+
+    kept = frames[keep]
+    digits = digits[keep]
+    return DecodedLog(
+        monto=_digits_to_int(digits[:, 0:13]),
+        piezas=_digits_to_int(digits[:, 16:20]),
+        status=kept[:, 3] != 0x30,
+        rechazo_sensor=kept[:, 6] == 0x31,
+        lines=total if lines is None else lines,
+        parse_failures=0 if lines is None else lines - total,
+        checksum_errors=checksum_errors,
+        malformed=malformed,
+    )
+
+
+def _digits_to_int(digits):
+    """
+    Columnas de dígitos (más significativo primero) -> int64, por Horner.
+    """
+    value = digits[:, 0].astype(np.int64)
+    for col in range(1, digits.shape[1]):
+        value *= 10
+        value += digits[:, col]
+    return value
+
+
+def load_hex_log(path, verify_checksum=True):
+    """
+    Lee y decodifica un log hexadecimal completo.
+    """
+    path = Path(path)
+    size = path.stat().st_size
+    padded = np.empty(size + _TAIL_WIDTH, dtype=np.uint8)
+    with open(path, "rb") as f:
+        f.readinto(padded[:size])
+    frames, lines = _padded_text_to_frames(padded, size)
+    return decode_frames(frames, lines=lines, verify_checksum=verify_checksum)
+
+
+def replay_counter(piezas, monto, initial_offset=0, initial_piezas=0, initial_monto=0):
+    """
+    Equivalente vectorizado de llamar ``CumulativeCounter.update`` paquete a
+    paquete. Cada decisión solo depende de la lectura anterior, así que se
+    calcula para todos los paquetes a la vez; el offset es
+    ``max_counter_value`` por cada desbordamiento desde el último reinicio.
+    """
+    reference = CumulativeCounter()
+    max_value = reference.max_counter_value
+    threshold = reference.overflow_threshold
+
+    piezas = np.asarray(piezas, dtype=np.int64)
+    monto = np.asarray(monto, dtype=np.int64)
+    prev_piezas = np.concatenate(([initial_piezas], piezas[:-1]))
+    prev_monto = np.concatenate(([initial_monto], monto[:-1]))
+
+    big_drop = (piezas < prev_piezas) & (prev_piezas - piezas > threshold)
+    manual_reset = big_drop & (
+        ((monto < prev_monto) & (prev_monto - monto > 0)) | ((piezas == 0) & (monto == 0))
+    )
+    overflow = big_drop & ~manual_reset
+    soft_reset = ~big_drop & (piezas < 100) & (prev_piezas > 100)
+    reset = manual_reset | soft_reset
+
+    overflows_so_far = np.cumsum(overflow, dtype=np.int64)
+    # Desbordamientos acumulados en el último reinicio (0 si aún no hubo)
+    at_last_reset = np.maximum.accumulate(np.where(reset, overflows_so_far, 0))
+    seen_reset = np.maximum.accumulate(reset)
+    offset = (overflows_so_far - at_last_reset) * max_value + np.where(
+        seen_reset, 0, initial_offset
+    )
+    totals = offset + piezas
+
+    return ReplayResult(
+        totals=totals,
+        overflow_points=np.flatnonzero(overflow),
+        reset_points=np.flatnonzero(reset),
+        final_total=int(totals[-1]) if len(totals) else initial_offset + initial_piezas,
+        final_offset=int(offset[-1]) if len(offset) else initial_offset,
+    )
+
+
+def analyze_file(path, verify_checksum=True):
+    """
+    Decodifica y reproduce un log completo (texto o ``.uwfcap``).
+    Devuelve ``(DecodedLog, ReplayResult)``.
+    """
+    if is_capture_file(path):
+        with CaptureReader(path) as reader:
+            if reader.frame_length == FRAME_LENGTH:
+                decoded = decode_frames(reader.as_array(), verify_checksum=verify_checksum)
+            else:
+                # Paquetes de otro tamaño: el decodificador los descartaría todos
+                decoded = decode_frames(np.empty((0, FRAME_LENGTH), dtype=np.uint8))
+                decoded.malformed = decoded.lines = len(reader)
+    else:
+        decoded = load_hex_log(path, verify_checksum=verify_checksum)
+    return decoded, replay_counter(decoded.piezas, decoded.monto)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Análisis offline de capturas con NumPy")
+    parser.add_argument("logs", nargs="+", type=Path)
+    parser.add_argument(
+        "--no-checksum", action="store_true", help="No descartar paquetes por checksum"
+    )
+    args = parser.parse_args()
+
+    for path in args.logs:
+        start = time.perf_counter()
+        decoded, result = analyze_file(path, verify_checksum=not args.no_checksum)
+        elapsed = time.perf_counter() - start
+        print(f"📁 {path.name}")
+        print(
+            f"   Paquetes: {len(decoded.piezas)}  Líneas sin paquete: {decoded.parse_failures}  "
+            f"Checksum inválido: {decoded.checksum_errors}  Malformados: {decoded.malformed}"
+        )
+        print(
+            f"   Desbordamientos: {len(result.overflow_points)}  "
+            f"Reinicios: {len(result.reset_points)}  Total final: {result.final_total:,}"
+        )
+        print(f"   ⏱️  {elapsed * 1000:.1f} ms\n")
+
+
+if __name__ == "__main__":
+    main()
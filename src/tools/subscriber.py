@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Suscriptor de ejemplo para la difusión de lecturas (``core/pubsub.py``).
+
+Se conecta al publicador del visor o del modo sin pantalla y muestra cada
+lectura con su latencia (reloj local menos el ``t`` del mensaje).
+
+Uso:
+    python tools/subscriber.py /tmp/uwf-visor.sock [--format json|binary]
+    python tools/subscriber.py 127.0.0.1:9751 --format binary
+"""
+
+import argparse
+import json
+import socket
+import sys
+import time
+from pathlib import Path
+
+# Agregar el directorio src al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.pubsub import FORMAT_BINARY, FORMAT_JSON, RECORD, decode_record, parse_address
+
+
+def connect(target):
+    address = parse_address(target)
+    family = socket.AF_UNIX if isinstance(address, str) else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.connect(address)
+    return sock
+
+
+def iter_readings(sock, fmt=FORMAT_JSON):
+    """
+    Genera dicts de lectura a medida que llegan, hasta que se cierra la conexión.
+    """
+    buffer = bytearray()
+    while True:
+        data = sock.recv(65536)
+        if not data:
+            return
+        buffer += data
+        if fmt == FORMAT_BINARY:
+            usable = len(buffer) - len(buffer) % RECORD.size
+            for offset in range(0, usable, RECORD.size):
+                yield decode_record(buffer, offset)
+            del buffer[:usable]
+        else:
+            *lines, rest = buffer.split(b"\n")
+            for line in lines:
+                yield json.loads(line)
+            buffer = bytearray(rest)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Suscriptor de lecturas del visor")
+    parser.add_argument("address", help="Ruta del socket Unix o host:puerto")
+    parser.add_argument("--format", choices=(FORMAT_JSON, FORMAT_BINARY), default=FORMAT_JSON)
+    args = parser.parse_args()
+
+    with connect(args.address) as sock:
+        print(f"📡 Conectado a {args.address} ({args.format})")
+        try:
+            for reading in iter_readings(sock, args.format):
+                latency_ms = (time.time() - reading["t"]) * 1000
+                print(
+                    f"Total: {reading['total']:>8,}  Piezas: {reading['piezas']:>4}  "
+                    f"Monto: {reading['monto']:>12,}  ({latency_ms:.1f} ms)"
+                )
+        except KeyboardInterrupt:
+            pass
+    print("🔌 Desconectado")
+
+
+if __name__ == "__main__":
+    main()
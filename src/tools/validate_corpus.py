@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Validación en paralelo de un directorio de capturas.
+
+Cada archivo (log de texto o ``.uwfcap``) se procesa en un proceso del
+pool, leyéndolo por bloques de tamaño fijo: el buffer de lectura se
+reutiliza y solo se arrastra la línea incompleta al bloque siguiente, así
+que la memoria por proceso no depende del tamaño del archivo. Cada bloque
+se decodifica con las funciones vectorizadas de ``tools/replay_analyzer.py``
+y la lógica de ``CumulativeCounter`` continúa desde el estado del bloque
+anterior.
+
+Por archivo informa paquetes, líneas no parseables, checksum inválido,
+malformados, desbordamientos, reinicios y total final; al final, un
+resumen combinado.
+
+Uso:
+    python tools/validate_corpus.py [directorio|archivo ...] [--workers N]
+        [--json informe.json] [--strict]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import numpy as np
+
+# Agregar el directorio src al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from protocol.capture import CAPTURE_SUFFIX, CaptureReader, is_capture_file
+from protocol.framing import FRAME_LENGTH
+from tools.replay_analyzer import _TAIL_WIDTH, _padded_text_to_frames, decode_frames, replay_counter
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+BLOCK_SIZE = 1 << 20  # Bytes de texto por bloque
+LOG_PATTERNS = ("*.txt", "*" + CAPTURE_SUFFIX)
+
+_COUNT_FIELDS = (
+    "bytes",
+    "lines",
+    "frames",
+    "parse_failures",
+    "checksum_errors",
+    "malformed",
+    "overflows",
+    "resets",
+)
+
+
+@dataclass
+class FileReport:
+    path: str
+    bytes: int = 0
+    lines: int = 0  # Líneas no vacías (paquetes, en .uwfcap)
+    frames: int = 0  # Paquetes válidos
+    parse_failures: int = 0
+    checksum_errors: int = 0
+    malformed: int = 0
+    overflows: int = 0
+    resets: int = 0
+    final_total: int = 0
+    elapsed: float = 0.0
+    error: str = None  # Archivo ilegible
+
+    @property
+    def clean(self):
+        return self.error is None and not (self.parse_failures or self.checksum_errors or self.malformed)
+
+
+def _text_blocks(path, block_size):
+    """
+    Recorre un log de texto en bloques de líneas completas. Devuelve
+    ``(padded, size)`` listos para ``_padded_text_to_frames``; ``padded`` es
+    el mismo buffer en cada iteración.
+    """
+    padded = np.empty(block_size + _TAIL_WIDTH, dtype=np.uint8)
+    view = memoryview(padded)
+    carry = 0
+    with open(path, "rb", buffering=0) as f:
+        while True:
+            n = f.readinto(view[carry:block_size])
+            size = carry + n
+            if n == 0:
+                if size:
+                    yield padded, size  # Última línea sin salto final
+                return
+            newlines = np.flatnonzero(padded[:size] == 0x0A)
+            # Sin salto de línea en todo el bloque: se procesa tal cual
+            cut = int(newlines[-1]) + 1 if len(newlines) else size
+            rest = padded[cut:size].copy()  # _padded_text_to_frames rellena tras "size"
+            yield padded, cut
+            carry = len(rest)
+            padded[:carry] = rest
+
+
+def _capture_blocks(reader, block_frames):
+    frames = reader.as_array()
+    for start in range(0, len(frames), block_frames):
+        yield frames[start : start + block_frames]
+
+
+def validate_file(path, block_size=BLOCK_SIZE, verify_checksum=True):
+    """
+    Valida un archivo por bloques y devuelve su ``FileReport``.
+    """
+    start = time.perf_counter()
+    report = FileReport(path=str(path))
+    offset, piezas, monto = 0, 0, 0  # Estado inicial de CumulativeCounter
+
+    def add(decoded):
+        nonlocal offset, piezas, monto
+        report.lines += decoded.lines
+        report.frames += len(decoded.piezas)
+        report.parse_failures += decoded.parse_failures
+        report.checksum_errors += decoded.checksum_errors
+        report.malformed += decoded.malformed
+        if len(decoded.piezas):
+            result = replay_counter(decoded.piezas, decoded.monto, offset, piezas, monto)
+            report.overflows += len(result.overflow_points)
+            report.resets += len(result.reset_points)
+            offset = result.final_offset
+            piezas, monto = int(decoded.piezas[-1]), int(decoded.monto[-1])
+        report.final_total = offset + piezas
+
+    try:
+        report.bytes = os.path.getsize(path)
+        if is_capture_file(path):
+            with CaptureReader(path) as reader:
+                if reader.frame_length != FRAME_LENGTH:
+                    report.lines = report.malformed = len(reader)
+                else:
+                    block_frames = max(1, block_size // FRAME_LENGTH)
+                    for frames in _capture_blocks(reader, block_frames):
+                        add(decode_frames(frames, verify_checksum=verify_checksum))
+        else:
+            for padded, size in _text_blocks(path, block_size):
+                frames, lines = _padded_text_to_frames(padded, size)
+                add(decode_frames(frames, lines=lines, verify_checksum=verify_checksum))
+    except (OSError, ValueError) as e:
+        report.error = str(e)
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+def find_logs(targets, patterns=LOG_PATTERNS):
+    """
+    Archivos de log en ``targets`` (archivos o directorios, recursivo).
+    """
+    found = []
+    for target in map(Path, targets):
+        if target.is_dir():
+            for pattern in patterns:
+                found.extend(target.rglob(pattern))
+        else:
+            found.append(target)
+    return sorted(set(found))
+
+
+def validate_corpus(paths, workers=None, block_size=BLOCK_SIZE, verify_checksum=True):
+    """
+    Valida ``paths`` en un pool de ``workers`` procesos (por defecto, uno por
+    núcleo). Devuelve los ``FileReport`` en el orden de ``paths``.
+    """
+    workers = workers or os.cpu_count() or 1
+    args = [(path, block_size, verify_checksum) for path in paths]
+    if workers == 1 or len(paths) <= 1:
+        return [validate_file(*a) for a in args]
+    with ProcessPoolExecutor(max_workers=min(workers, len(paths))) as pool:
+        return list(pool.map(validate_file, *zip(*args)))
+
+
+def summarize(reports):
+    """
+    Resumen combinado: suma de contadores y archivos con problemas.
+    """
+    summary = {name: sum(getattr(r, name) for r in reports) for name in _COUNT_FIELDS}
+    summary["files"] = len(reports)
+    summary["final_total"] = sum(r.final_total for r in reports)
+    summary["unclean_files"] = [r.path for r in reports if not r.clean]
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("targets", nargs="*", type=Path, default=[DATA_DIR])
+    parser.add_argument("--workers", type=int, default=None, help="Procesos (por defecto, núcleos)")
+    parser.add_argument("--block-size", type=int, default=BLOCK_SIZE, help="Bytes por bloque")
+    parser.add_argument("--no-checksum", action="store_true", help="No descartar por checksum")
+    parser.add_argument("--json", type=Path, default=None, help="Guardar el informe en JSON")
+    parser.add_argument(
+        "--strict", action="store_true", help="Salir con 1 si algún archivo tiene errores"
+    )
+    args = parser.parse_args()
+
+    paths = find_logs(args.targets)
+    start = time.perf_counter()
+    reports = validate_corpus(paths, args.workers, args.block_size, not args.no_checksum)
+    elapsed = time.perf_counter() - start
+    summary = summarize(reports)
+
+    header = ("Archivo", "Paquetes", "No parse.", "Checksum", "Malform.", "Desb.", "Reinic.", "Total")
+    print(f"{header[0]:<40} " + " ".join(f"{h:>9}" for h in header[1:]))
+    for r in reports:
+        name = Path(r.path).name
+        if r.error:
+            print(f"❌ {name:<38} {r.error}")
+            continue
+        values = (r.frames, r.parse_failures, r.checksum_errors, r.malformed, r.overflows, r.resets)
+        print(f"{name:<40} " + " ".join(f"{v:>9,}" for v in values) + f" {r.final_total:>9,}")
+
+    print(
+        f"\n📊 {summary['files']} archivos, {summary['bytes'] / 1e6:.1f} MB en {elapsed:.2f} s "
+        f"({summary['bytes'] / 1e6 / elapsed:.1f} MB/s)"
+    )
+    print(
+        f"   Paquetes: {summary['frames']:,}  Líneas no parseables: {summary['parse_failures']:,}  "
+        f"Checksum: {summary['checksum_errors']:,}  Malformados: {summary['malformed']:,}"
+    )
+    print(
+        f"   Desbordamientos: {summary['overflows']:,}  Reinicios: {summary['resets']:,}  "
+        f"Suma de totales: {summary['final_total']:,}"
+    )
+    if summary["unclean_files"]:
+        print(f"⚠️  {len(summary['unclean_files'])} archivos con errores")
+
+    if args.json is not None:
+        report = {
+            "files": [asdict(r) for r in reports],
+            "summary": summary,
+        }
+        args.json.write_text(json.dumps(report, indent=2))
+    return 1 if args.strict and summary["unclean_files"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())